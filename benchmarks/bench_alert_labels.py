@@ -0,0 +1,56 @@
+"""
+Dashboard alarm etiketleme benchmark'ı.
+
+Eski satır satır yol (df.apply + detect_alert_labels) ile vektörize
+label_alerts, sentetik bir DataFrame üzerinde karşılaştırılır ve
+etiketlerin birebir aynı olduğu doğrulanır.
+
+Kullanım:
+    python benchmarks/bench_alert_labels.py [satir_sayisi]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+
+import sei_news_analyzer as sna  # noqa: E402
+from corpus import make_corpus  # noqa: E402
+from dashboard import label_alerts  # noqa: E402
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    # Benzersiz 50k haber üretip tekrarla, üretim süresi ölçümü boğmasın
+    base = make_corpus(min(n, 50_000))
+    df = pd.DataFrame(
+        {
+            "title": [base[i % len(base)].title for i in range(n)],
+            "summary": [base[i % len(base)].summary for i in range(n)],
+        }
+    )
+
+    start = time.perf_counter()
+    legacy = df.apply(lambda row: sna.detect_alert_labels(row["title"], row["summary"]), axis=1)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = label_alerts(df)
+    vectorized_elapsed = time.perf_counter() - start
+
+    mismatches = int((legacy != vectorized).sum())
+
+    print(f"{n} satır")
+    print(f"  df.apply     : {legacy_elapsed:7.3f}s")
+    print(f"  label_alerts : {vectorized_elapsed:7.3f}s")
+    print(f"  hızlanma     : {legacy_elapsed / vectorized_elapsed:.2f}x")
+    print(f"  farklı etiket: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
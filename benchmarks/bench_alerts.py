@@ -0,0 +1,126 @@
+"""
+Alarm gönderimi için benchmark ve davranış testi.
+
+Yerel bir HTTP sunucusu (corpus.TelegramStandIn) Telegram'ın sendMessage
+uç noktasını taklit eder (yapay gecikme, istenirse 429 retry_after ve 500
+yanıtları); alarm metinleri corpus.make_corpus haberlerinden. Ölçülenler:
+  - eski yol: her alarm için bloklayan send_telegram_alert (poll döngüsü bekler)
+  - AlertDispatcher: submit süresi (döngünün beklediği) ve tüm alarmların
+    sunucuya ulaşma süresi, birleştirilen mesaj sayısı
+  - rate limit: 429 / 500 yanıtlarına rağmen tüm alarmlar teslim edilmeli
+  - taşma: küçük kuyrukta fazla alarm düşürülmeli ve sayılmalı
+Beklenen davranış sağlanmazsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_alerts.py [alarm_sayisi] [gecikme_sn]
+"""
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from corpus import TelegramStandIn, make_corpus  # noqa: E402
+
+
+def alerts(n: int) -> list[str]:
+    return [f"Deprem / Earthquake: {a.title} ({a.source})" for a in make_corpus(n)]
+
+
+def run_legacy(n: int, latency: float) -> float:
+    stand_in = TelegramStandIn(latency)
+    sna.TELEGRAM_API_URL = stand_in.url
+    start = time.perf_counter()
+    for text in alerts(n):
+        sna.send_telegram_alert(text)
+    elapsed = time.perf_counter() - start
+    stand_in.close()
+    return elapsed
+
+
+def run_dispatcher(n: int, latency: float, **stand_in_args) -> tuple[float, float, dict, int]:
+    stand_in = TelegramStandIn(latency, **stand_in_args)
+    dispatcher = sna.AlertDispatcher(
+        api_url=stand_in.url, telegram=True, notifications=False, batch_wait=0.2, retry_base=0.05
+    )
+    start = time.perf_counter()
+    for text in alerts(n):
+        dispatcher.submit(text)
+    submit_time = time.perf_counter() - start
+    stand_in.wait_for(n, timeout=60)
+    delivery_time = time.perf_counter() - start
+    dispatcher.close()
+    stats = dispatcher.stats()
+    delivered = stand_in.delivered()
+    stand_in.close()
+    return submit_time, delivery_time, stats, delivered
+
+
+def run_overflow(n: int, max_queue: int) -> dict:
+    stand_in = TelegramStandIn(latency=0.5)
+    dispatcher = sna.AlertDispatcher(
+        max_queue=max_queue, workers=1, batch_max=1, api_url=stand_in.url, telegram=True, notifications=False
+    )
+    for text in alerts(n):
+        dispatcher.submit(text)
+    dispatcher.close(timeout=0)
+    stand_in.close()
+    return dispatcher.stats()
+
+
+def check(name: str, ok: bool, failures: list) -> None:
+    print(f"  [{'OK' if ok else 'HATA'}] {name}")
+    if not ok:
+        failures.append(name)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    sna.USE_TELEGRAM_ALERTS = True
+    sna.TELEGRAM_BOT_TOKEN = "bench"
+    sna.TELEGRAM_CHAT_ID = "bench"
+    failures: list = []
+
+    # [WARN] çıktıları sonucu boğmasın
+    with contextlib.redirect_stdout(io.StringIO()):
+        legacy = run_legacy(n, latency)
+        submit_time, delivery_time, stats, delivered = run_dispatcher(n, latency)
+        rl_submit, rl_delivery, rl_stats, rl_delivered = run_dispatcher(
+            n, latency, rate_limit_every=3, error_every=5
+        )
+        overflow = run_overflow(100, max_queue=10)
+
+    print(f"{n} alarm, istek başına {latency}s gecikme")
+    print(f"  eski (bloklayan)    : döngü {legacy:7.3f}s bekledi")
+    print(
+        f"  dispatcher          : döngü {submit_time * 1000:7.2f}ms bekledi, "
+        f"teslim {delivery_time:.3f}s, {stats['sent_messages']} mesaj"
+    )
+    print(
+        f"  429 / 500 ile       : teslim {rl_delivery:.3f}s, tekrar {rl_stats['retries']}, "
+        f"429 {rl_stats['rate_limited']}"
+    )
+    print(f"  taşma (kuyruk=10)   : kuyruğa giren {overflow['queued']}, düşürülen {overflow['dropped']}")
+
+    check("tüm alarmlar teslim edildi", delivered == n and stats["sent_alerts"] == n, failures)
+    check("alarmlar birleştirildi (mesaj < alarm)", stats["sent_messages"] < n, failures)
+    check("submit döngüyü bekletmedi", submit_time < legacy / 10, failures)
+    check("429 / 500 sonrası tümü teslim edildi", rl_delivered == n and rl_stats["failed_alerts"] == 0, failures)
+    check("429 retry_after ile tekrar denendi", rl_stats["rate_limited"] > 0 and rl_stats["retries"] > 0, failures)
+    check(
+        "taşan alarmlar düşürüldü ve sayıldı",
+        overflow["dropped"] > 0 and overflow["queued"] + overflow["dropped"] == 100,
+        failures,
+    )
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Toplama sorguları benchmark'ı: SQLite ve DuckDB aynası.
+
+Geçici bir veritabanına n haber yazılır (son bir yıla ve altı kategoriye
+yayılmış). Gün / kategori başına sayı ve ortalama duygu şu yollarla
+hesaplanır:
+  - pandas     : satırları okuyup pandas groupby (eski dashboard yolu)
+  - sqlite ham : articles üzerinde GROUP BY
+  - sqlite özet: saatlik / günlük özet tabloları (SQLiteAnalytics)
+  - duckdb     : DuckDB aynasında GROUP BY (DuckDBAnalytics), duygu
+                 filtresiyle de (özet tabloları bunu yapamaz)
+Rapor özeti (COUNT DISTINCT kaynak, ilk / son kayıt) ve aynanın ilk /
+artımlı eşitleme süresi de ölçülür. duckdb kurulu değilse o satırlar atlanır.
+
+Kullanım:
+    python benchmarks/bench_analytics.py [boyut1 boyut2 ...]
+"""
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from bench_db import make_articles  # noqa: E402
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+CATEGORIES = ["conflict/crisis", "economy", "politics", "technology", "society", "other"]
+INSERT_BATCH = 50_000
+
+
+def build_db(n: int) -> None:
+    conn = sna.init_db(profile="wal")
+    for start in range(0, n, INSERT_BATCH):
+        sna.save_articles(conn, make_articles(min(INSERT_BATCH, n - start), offset=start))
+    # Zamanı bir yıla, kategorileri altıya yay; özet tabloları ve rapor istatistikleri yeniden kurulur
+    cases = " ".join(f"WHEN {i} THEN '{c}'" for i, c in enumerate(CATEGORIES))
+    with conn:
+        conn.execute(
+            f"""
+            UPDATE articles SET
+                created_at = datetime('now', printf('-%d minutes', (id * 7919) % 525600)),
+                category = CASE id % {len(CATEGORIES)} {cases} END
+            """
+        )
+        sna.rebuild_rollups(conn)
+        sna.rebuild_summary_stats(conn)
+    conn.close()
+
+
+def timed(fn, repeat: int = 3):
+    """En iyi süre (saniye) ve son sonuç."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def pandas_groupby():
+    import pandas as pd
+
+    conn = sqlite3.connect(sna.DB_PATH)
+    df = pd.read_sql_query("SELECT created_at, category, sentiment FROM articles", conn)
+    conn.close()
+    df["day"] = pd.to_datetime(df["created_at"]).dt.date
+    return df.groupby(["day", "category"])["sentiment"].agg(["count", "mean"])
+
+
+def sqlite_groupby():
+    conn = sqlite3.connect(sna.DB_PATH)
+    rows = conn.execute(
+        """
+        SELECT date(created_at) AS day, category, COUNT(*), AVG(sentiment)
+        FROM articles GROUP BY day, category
+        """
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def main() -> None:
+    sizes = [int(x) for x in sys.argv[1:]] or DEFAULT_SIZES
+    original_db, original_duckdb = sna.DB_PATH, sna.DUCKDB_PATH
+
+    print(f"{'boyut':>9} {'yöntem':30s} {'süre (ms)':>10} {'satır':>7}")
+    try:
+        for n in sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                sna.DB_PATH = Path(tmp) / "bench.db"
+                sna.DUCKDB_PATH = Path(tmp) / "bench.duckdb"
+                build_db(n)
+
+                def row(name: str, seconds: float, rows) -> None:
+                    print(f"{n:>9} {name:30s} {seconds * 1000:>10.1f} {len(rows) if rows is not None else '':>7}")
+
+                row("pandas groupby", *timed(pandas_groupby, repeat=1))
+                row("sqlite ham GROUP BY", *timed(sqlite_groupby))
+
+                storage = sna.ArticleStorage(engine="sqlite")
+                row("sqlite özet tablosu", *timed(lambda: storage.aggregate("all", None, "day")[1]))
+                row("sqlite rapor özeti", *timed(lambda: [storage.summary()]))
+                storage.close()
+
+                storage = sna.ArticleStorage(engine="duckdb")
+                if not isinstance(storage.analytics, sna.DuckDBAnalytics):
+                    storage.close()
+                    continue
+                mirror = storage.analytics
+                seconds, copied = timed(mirror.sync, repeat=1)
+                print(f"{n:>9} {'duckdb ilk eşitleme':30s} {seconds * 1000:>10.1f} {copied:>7}")
+                storage.save_articles(make_articles(1_000, offset=n))
+                seconds, copied = timed(mirror.sync, repeat=1)
+                print(f"{n:>9} {'duckdb artımlı eşitleme':30s} {seconds * 1000:>10.1f} {copied:>7}")
+                row("duckdb GROUP BY", *timed(lambda: storage.aggregate("all", None, "day")[1]))
+                row(
+                    "duckdb GROUP BY + duygu filtresi",
+                    *timed(lambda: storage.aggregate("all", None, "day", max_sentiment=-0.2)[1]),
+                )
+                row("duckdb rapor özeti", *timed(lambda: [storage.summary()]))
+                storage.close()
+    finally:
+        sna.DB_PATH, sna.DUCKDB_PATH = original_db, original_duckdb
+
+
+if __name__ == "__main__":
+    main()
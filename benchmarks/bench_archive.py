@@ -0,0 +1,175 @@
+"""
+Zaman bölümlü arşiv (archive modu / ArchiveCompactor) benchmark'ı ve davranış testi.
+
+Geçici bir veritabanına n haber yazılır (son bir yıla yayılmış, bkz.
+bench_analytics.build_db). Arşivlemeden önce ve sonra ölçülenler:
+  - rapor özeti, en negatif 10 haber, son 24 saat (recent), dashboard
+    sorgusu ve news.db VACUUM süresi
+  - compact_storage süresi, news.db ve arşiv boyutları
+Kontroller: arşivden sonra rapor özeti, en negatifler, özet tablosu
+serileri, export satır sayısı, 'tüm kayıtlar' dashboard sorgusu ve tam
+metin araması aynı kalır; arşive taşınan linkler tekrar kontrolünde
+kayıtlı sayılır; saklama süresi uygulanınca sadece süresi dolan aylar düşer.
+Beklenen davranış sağlanmazsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_archive.py [boyut] [sicak_ay]
+"""
+import contextlib
+import io
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from bench_analytics import build_db  # noqa: E402
+
+DEFAULT_SIZE = 200_000
+RETENTION_MONTHS = 6
+SEARCH_TEXT = "haber 7"
+SEARCH_LIMIT = 100_000
+
+
+def timed(fn, repeat: int = 3):
+    """En iyi süre (saniye) ve son sonuç."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def check(name: str, ok: bool, failures: list) -> None:
+    print(f"  [{'OK' if ok else 'HATA'}] {name}")
+    if not ok:
+        failures.append(name)
+
+
+def measure(label: str, tmp: Path) -> dict:
+    """Rapor / dashboard yollarını ölçer, karşılaştırma için sonuçları döner."""
+    storage = sna.ArticleStorage(engine="sqlite")
+    conn = sqlite3.connect(sna.DB_PATH)
+    recent_query, recent_params = sna.build_recent_query("all", 24, 20)
+    load_query, load_params = sna.build_load_data_query("all", None, 500)
+
+    def recent():
+        rows = conn.execute(recent_query, recent_params).fetchall()
+        return rows + sna.query_archives(conn, recent_query, recent_params, 24)
+
+    def load_all():
+        rows = conn.execute(load_query, load_params).fetchall()
+        for _, archive_conn in sna.iter_archives(conn):
+            if len(rows) >= 500:
+                break
+            rows += archive_conn.execute(load_query, load_params).fetchall()
+        return sorted(rows, key=lambda row: row[8], reverse=True)[:500]
+
+    results = {}
+    for name, fn in [
+        ("rapor özeti", storage.summary),
+        ("en negatif 10", lambda: storage.most_negative(10)),
+        ("recent 24 saat", recent),
+        ("dashboard tüm kayıtlar", load_all),
+        ("günlük seri", lambda: storage.aggregate("all", None, "day")[1]),
+        # Bölümler arası bm25 sırası değişebilir: eşleşen kümeyi karşılaştır
+        ("arama", lambda: sorted(row[0] for row in sna.search_articles(conn, SEARCH_TEXT, limit=SEARCH_LIMIT))),
+    ]:
+        seconds, results[name] = timed(fn)
+        print(f"  {label:8s} {name:28s} {seconds * 1000:>9.1f} ms")
+    with contextlib.redirect_stdout(io.StringIO()):
+        results["export"] = sna.export_to_csv(str(tmp / "export.csv"))
+    conn.close()
+    storage.close()
+
+    copy = tmp / "vacuum.db"
+    copy.write_bytes(sna.DB_PATH.read_bytes())
+    vacuum_conn = sqlite3.connect(copy)
+    start = time.perf_counter()
+    vacuum_conn.execute("VACUUM")
+    print(f"  {label:8s} {'news.db VACUUM':28s} {(time.perf_counter() - start) * 1000:>9.1f} ms")
+    vacuum_conn.close()
+    copy.unlink()
+    print(f"  {label:8s} {'news.db boyutu':28s} {sna.DB_PATH.stat().st_size / 1024 / 1024:>9.1f} MB")
+    return results
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    hot_months = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    failures: list[str] = []
+    original_db = sna.DB_PATH
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            sna.DB_PATH = tmp / "bench.db"
+            with contextlib.redirect_stdout(io.StringIO()):
+                build_db(n)
+            print(f"{n} haber, son {hot_months} ay news.db'de kalır")
+
+            before = measure("önce", tmp)
+
+            conn = sna.init_db()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = sna.compact_storage(conn, hot_months=hot_months, retention_months=0)
+            seconds = time.perf_counter() - start
+            archived = sum(result["archived"].values())
+            archive_bytes = sum(p.stat().st_size for p in sna.archive_dir().glob("*.db"))
+            print(
+                f"  compact_storage: {seconds:.2f}s, {len(result['archived'])} ay / {archived} haber arşive, "
+                f"arşiv {archive_bytes / 1024 / 1024:.1f} MB"
+            )
+            hot = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            month = sna.list_archive_partitions(conn)[-1][0]
+            archive_conn = sna.open_archive(month)
+            archived_link = archive_conn.execute("SELECT link FROM articles LIMIT 1").fetchone()[0]
+            archive_conn.close()
+            known = sna.known_links_in_db(conn, [archived_link, "http://bench.local/yeni"])
+            check(f"arşivdeki link ({month}) kayıtlı sayılır", known == {archived_link}, failures)
+            conn.close()
+
+            after = measure("sonra", tmp)
+            for name in before:
+                same = before[name] == after[name]
+                if name == "en negatif 10":
+                    # Eşit duygulu satırların sırası bölümlere göre değişebilir
+                    same = [row[3] for row in before[name]] == [row[3] for row in after[name]]
+                check(f"{name} arşivden sonra aynı", same, failures)
+            check("news.db + arşiv = toplam", hot + archived == n, failures)
+            check("eski aylar arşive taşındı", bool(result["archived"]) and hot < n, failures)
+
+            conn = sna.init_db()
+            with contextlib.redirect_stdout(io.StringIO()):
+                again = sna.compact_storage(conn, hot_months=hot_months, retention_months=0)
+            check("ikinci tur bir şey taşımaz", not again["archived"], failures)
+
+            oldest = sna.shift_month(sna.current_month(), -(RETENTION_MONTHS - 1))
+            expected = hot + sum(rows for month, rows, *_ in sna.list_archive_partitions(conn) if month >= oldest)
+            with contextlib.redirect_stdout(io.StringIO()):
+                dropped = sna.apply_retention(conn, retention_months=RETENTION_MONTHS)
+            stale = conn.execute("SELECT COUNT(*) FROM archived_links WHERE month < ?", (oldest,)).fetchone()[0]
+            conn.close()
+            storage = sna.ArticleStorage(engine="sqlite")
+            total = storage.summary()[0]
+            series = storage.aggregate("all", None, "day")[1]
+            storage.close()
+            check(f"saklama ({RETENTION_MONTHS} ay): {len(dropped)} ay silindi, toplam {total}", total == expected, failures)
+            check("silinen ayların dosyaları da silindi", all(not sna.archive_path(m).exists() for m in dropped), failures)
+            check("silinen aylar grafiklerden düştü", all(row[0] >= f"{oldest}-01" for row in series), failures)
+            check("silinen ayların linkleri archived_links'ten düştü", stale == 0, failures)
+    finally:
+        sna.DB_PATH = original_db
+
+    if failures:
+        print(f"\n{len(failures)} kontrol başarısız")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+save_articles için yazma hızı benchmark'ı.
+
+Eski yöntem (her haber için ayrı cur.execute) ile toplu executemany yolu,
+"default" ve "wal" pragma profillerinde 1k / 10k / 100k haber ile
+geçici bir veritabanında karşılaştırılır.
+
+Kullanım:
+    python benchmarks/bench_db.py [boyut1 boyut2 ...]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def make_articles(n: int, offset: int = 0) -> list[sna.Article]:
+    return [
+        sna.Article(
+            title=f"Bench haber {i}",
+            summary=f"Sentetik özet metni {i} " * 5,
+            link=f"http://bench.local/{offset + i}",
+            published="Sat, 22 Nov 2025 22:25:44 GMT",
+            source=f"Bench {i % 20}",
+            sentiment=((i % 200) - 100) / 100,
+            category="other",
+            alerts=[],  # process_articles'ta hesaplanmış gibi; sadece yazma ölçülsün
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_save_articles(conn, articles) -> None:
+    cur = conn.cursor()
+    for a in articles:
+        try:
+            cur.execute(sna.ARTICLE_INSERT_SQL, sna.article_row(a))
+        except Exception as e:
+            print(f"[DB] Kaydetme hatası ({a.link}): {e}")
+    conn.commit()
+
+
+def measure(save, profile: str, articles) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        sna.DB_PATH = Path(tmp) / "bench.db"
+        conn = sna.init_db(profile=profile)
+        start = time.perf_counter()
+        save(conn, articles)
+        elapsed = time.perf_counter() - start
+        conn.close()
+    return elapsed
+
+
+def main() -> None:
+    sizes = [int(x) for x in sys.argv[1:]] or DEFAULT_SIZES
+    original_db = sna.DB_PATH
+
+    print(f"{'boyut':>8} {'profil':>8} {'eski (haber/s)':>16} {'toplu (haber/s)':>16} {'hızlanma':>9}")
+    try:
+        for n in sizes:
+            articles = make_articles(n)
+            for profile in ("default", "wal"):
+                legacy = measure(legacy_save_articles, profile, articles)
+                bulk = measure(sna.save_articles, profile, articles)
+                print(
+                    f"{n:>8} {profile:>8} {n / legacy:>16,.0f} {n / bulk:>16,.0f} {legacy / bulk:>8.2f}x"
+                )
+    finally:
+        sna.DB_PATH = original_db
+
+
+if __name__ == "__main__":
+    main()
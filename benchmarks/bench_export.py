@@ -0,0 +1,76 @@
+"""
+export benchmark'ı: süre ve en yüksek bellek kullanımı.
+
+Eski export_to_csv (fetchall ile tüm tabloyu belleğe alır) ile parça parça
+yazan yeni CSV ve Parquet export'u geçici bir veritabanında karşılaştırılır.
+Bellek tracemalloc ile ölçülür; yeni yolların tepe değeri satır sayısından
+bağımsız kalmalıdır.
+
+Kullanım:
+    python benchmarks/bench_export.py [boyut1 boyut2 ...]
+"""
+import csv
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from bench_db import make_articles  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000, 500_000]
+
+
+def legacy_export_to_csv(filename: str) -> None:
+    conn = sna.init_db()
+    cur = conn.cursor()
+    cur.execute(*sna.build_export_query())
+    rows = cur.fetchall()
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(sna.EXPORT_COLUMNS)
+        writer.writerows(row[1:] for row in rows)
+    conn.close()
+
+
+def measure(export, filename: str) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    export(filename)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    sizes = [int(x) for x in sys.argv[1:]] or DEFAULT_SIZES
+    original_db = sna.DB_PATH
+
+    exports = [
+        ("eski csv", legacy_export_to_csv, "legacy.csv"),
+        ("csv", sna.export_to_csv, "stream.csv"),
+        ("parquet", sna.export_to_columnar, "stream.parquet"),
+    ]
+
+    print(f"{'boyut':>8} {'yöntem':>10} {'süre (s)':>9} {'satır/s':>10} {'tepe bellek (MB)':>17}")
+    try:
+        for n in sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                sna.DB_PATH = Path(tmp) / "bench.db"
+                conn = sna.init_db()
+                sna.save_articles(conn, make_articles(n))
+                conn.close()
+
+                for name, export, filename in exports:
+                    elapsed, peak = measure(export, str(Path(tmp) / filename))
+                    print(f"{n:>8} {name:>10} {elapsed:>9.2f} {n / elapsed:>10,.0f} {peak:>17.1f}")
+    finally:
+        sna.DB_PATH = original_db
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+fetch_latest_articles için benchmark.
+
+Yerel bir HTTP sunucusu (corpus.FeedStandIn), her istekte yapay gecikme
+ekleyerek corpus.make_feeds ile üretilen çok sayıda RSS / Atom kaynağı
+sunar. Aynı kaynak listesi önce tek işçiyle (sıralı), sonra thread
+havuzuyla çekilir ve döngü süreleri karşılaştırılır.
+Son olarak ETag ile ikinci bir döngü yapılarak 304 yolunun süresi ölçülür.
+Kontrol: döngü süresini aşan kaynak FETCH_STATUS_TIMEOUT durumuyla döner,
+indirmenin doğrulayıcıları önbelleğe yazılmaz; sonraki döngü 304 almaz,
+haberleri okur.
+Beklenen davranış sağlanmazsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_fetch.py [kaynak_sayisi] [gecikme_sn] [isci_sayisi]
+"""
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from corpus import FeedStandIn, make_feeds  # noqa: E402
+
+ITEMS_PER_FEED = 20
+
+
+def run(n_feeds: int, max_workers: int, keep_cache: bool = False) -> tuple[float, int]:
+    sna.seen_links.clear()
+    if not keep_cache:
+        sna.feed_cache.clear()
+    start = time.perf_counter()
+    articles = sna.fetch_latest_articles(max_workers=max_workers, deadline=600)
+    return time.perf_counter() - start, len(articles)
+
+
+def check(name: str, ok: bool, failures: list) -> None:
+    print(f"  [{'OK' if ok else 'HATA'}] {name}")
+    if not ok:
+        failures.append(name)
+
+
+def check_timeout_then_refetch(latency: float, failures: list) -> None:
+    """Süre sınırını aşan indirme arka planda bitse de sonraki döngü haberleri okumalı."""
+    stand_in = FeedStandIn(make_feeds(1, ITEMS_PER_FEED), latency=latency)
+    sna.RSS_FEEDS = stand_in.rss_feeds()
+    sna.seen_links.clear()
+    sna.feed_cache.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetches: dict = {}
+        late = sna.fetch_latest_articles(deadline=latency / 3, fetches=fetches)
+        # Atılan indirmenin arka planda bitmesini bekle
+        while stand_in.requests < 1:
+            time.sleep(0.01)
+        time.sleep(latency)
+        stand_in.latency = 0.0
+        retried = sna.fetch_latest_articles(deadline=5)
+    stand_in.close()
+    cache = sna.feed_cache[next(iter(sna.RSS_FEEDS.values()))]
+    status = next(iter(fetches.values())).status
+    check(f"süreyi aşan kaynak atlandı (durum {status})", late == [] and status == sna.FETCH_STATUS_TIMEOUT, failures)
+    check(
+        f"sonraki döngü baştan indirdi (durum {cache.last_status}, {len(retried)} haber)",
+        cache.last_status == 200 and len(retried) == ITEMS_PER_FEED,
+        failures,
+    )
+
+
+def main() -> None:
+    n_feeds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else sna.FETCH_MAX_WORKERS
+
+    stand_in = FeedStandIn(make_feeds(n_feeds, ITEMS_PER_FEED), latency=latency)
+    sna.RSS_FEEDS = stand_in.rss_feeds()
+
+    results = []
+    for label, w, keep_cache in (
+        ("sıralı", 1, False),
+        ("paralel", workers, False),
+        ("304", workers, True),
+    ):
+        # [DEBUG] çıktıları benchmark sonucunu boğmasın
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed, count = run(n_feeds, w, keep_cache)
+        results.append((label, w, elapsed, count))
+
+    stand_in.close()
+
+    print(f"{n_feeds} kaynak, kaynak başına {latency}s gecikme")
+    for label, w, elapsed, count in results:
+        print(f"  {label:8s} (işçi={w:3d}): {elapsed:7.3f}s, {count} haber")
+    print(f"  hızlanma: {results[0][2] / results[1][2]:.1f}x")
+    saved = sum(e.bytes_saved for e in sna.feed_cache.values())
+    print(f"  304 ile indirilmeyen veri: {saved / 1024:.1f} KB")
+
+    failures: list[str] = []
+    check_timeout_then_refetch(max(latency, 0.3), failures)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+categorize_article + check_alerts için mikro benchmark.
+
+Eski yöntem (her keyword listesi için `any(k in text ...)`) ile tek geçişli
+KeywordMatcher, sentetik İngilizce/Türkçe haberler (corpus.make_corpus)
+üzerinde karşılaştırılır.
+Önce iki yöntemin sonuçlarının birebir aynı olduğu doğrulanır.
+
+Kullanım:
+    python benchmarks/bench_keywords.py [haber_sayisi]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from corpus import make_corpus  # noqa: E402
+
+def legacy_categorize(article: sna.Article) -> str:
+    text = (article.title + " " + article.summary).lower()
+    for name, keywords in sna.CATEGORY_KEYWORDS.items():
+        if any(k in text for k in keywords):
+            return name
+    return "other"
+
+
+def legacy_check_alerts(article: sna.Article) -> list[str]:
+    text = (article.title + " " + article.summary).lower()
+    return [
+        label
+        for label, keywords in sna.ALERT_KEYWORDS.items()
+        if any(k.lower() in text for k in keywords)
+    ]
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    articles = make_corpus(n)
+
+    start = time.perf_counter()
+    legacy = [(legacy_categorize(a), legacy_check_alerts(a)) for a in articles]
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [sna.match_article_text(a.title, a.summary) for a in articles]
+    compiled_elapsed = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+
+    print(f"{n} sentetik haber")
+    print(f"  eski (any/in)     : {legacy_elapsed:7.3f}s ({legacy_elapsed / n * 1e6:6.1f} µs/haber)")
+    print(f"  KeywordMatcher    : {compiled_elapsed:7.3f}s ({compiled_elapsed / n * 1e6:6.1f} µs/haber)")
+    print(f"  hızlanma          : {legacy_elapsed / compiled_elapsed:.2f}x")
+    print(f"  farklı sonuç      : {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
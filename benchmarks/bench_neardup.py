@@ -0,0 +1,66 @@
+"""
+Yakın kopya kümeleme (MinHash + LSH) benchmark'ı.
+
+Geçici bir veritabanındaki indekse sentetik haberler eklenir ve indeks
+büyüdükçe haber başına atama süresi ölçülür. Her 10 haberden biri,
+daha önce eklenmiş bir haberin ufak değiştirilmiş kopyasıdır; bunların
+kaçının doğru kümeye düştüğü de raporlanır.
+
+Kullanım:
+    python benchmarks/bench_neardup.py [toplam_haber] [rapor_araligi]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from corpus import make_corpus  # noqa: E402
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    step = int(sys.argv[2]) if len(sys.argv) > 2 else max(1, total // 5)
+    rng = random.Random(7)
+
+    originals = make_corpus(total)
+    original_db = sna.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        sna.DB_PATH = Path(tmp) / "bench.db"
+        conn = sna.init_db()
+        index = sna.NearDupIndex()
+        clusters: list[int] = []
+        copies = found = 0
+
+        start = time.perf_counter()
+        with conn:
+            for i, a in enumerate(originals):
+                text = a.title + " " + a.summary
+                source = None
+                if i and i % 10 == 0:
+                    # Önceki bir haberin kopyası: bir kelimesi değişmiş
+                    source = rng.randrange(i)
+                    words = (originals[source].title + " " + originals[source].summary).split()
+                    words[rng.randrange(len(words))] = "güncellendi"
+                    text = " ".join(words)
+                cluster_id, _ = index.assign(conn, f"http://bench.local/{i}", text)
+                clusters.append(cluster_id)
+                if source is not None and clusters[source] is not None:
+                    copies += 1
+                    found += cluster_id == clusters[source]
+
+                if (i + 1) % step == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"  indeks {i + 1:>9,}: {elapsed / step * 1e6:8.1f} µs/haber")
+                    start = time.perf_counter()
+
+        conn.close()
+    sna.DB_PATH = original_db
+    print(f"kopyaların doğru kümeye düşme oranı: {found}/{copies}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+report modu benchmark'ı ve özet istatistikleri davranış testi.
+
+Geçici bir veritabanına n haber yazılır (son bir yıla yayılmış, bkz.
+bench_analytics.build_db). Ölçülenler:
+  - ham tarama (scan_summary_stats: COUNT, DISTINCT kaynak, MIN / MAX,
+    en negatifler) ile özet istatistiklerinden okunan rapor
+  - tetikleyicinin save_articles'a maliyeti (aynı veritabanının
+    tetikleyicisiz kopyasıyla karşılaştırma)
+Kontroller: yeni / tekrar eden / duygusuz haberler, arşive taşıma ve
+saklama süresinden sonra --verify fark bulmaz; istatistikler elle
+bozulunca farkı bulur, rebuild_summary_stats düzeltir.
+Beklenen davranış sağlanmazsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_report.py [boyut1 boyut2 ...]
+"""
+import contextlib
+import io
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from bench_analytics import build_db  # noqa: E402
+from bench_db import make_articles  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 100_000]
+SAVE_BATCH = 5_000
+
+
+def timed(fn, repeat: int = 3):
+    """En iyi süre (saniye) ve son sonuç."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def check(name: str, ok: bool, failures: list) -> None:
+    print(f"  [{'OK' if ok else 'HATA'}] {name}")
+    if not ok:
+        failures.append(name)
+
+
+def no_drift(name: str, failures: list) -> None:
+    conn = sna.init_db()
+    drift = sna.verify_summary_stats(conn)
+    conn.close()
+    check(f"{name}: --verify fark bulmadı", not drift, failures)
+    for field in drift:
+        print(f"         {field[0]}: özet {field[1]!r:.60}, ham {field[2]!r:.60}")
+
+
+def report() -> tuple:
+    storage = sna.ArticleStorage(engine="sqlite")
+    result = storage.summary(), storage.most_negative(10)
+    storage.close()
+    return result
+
+
+def timed_save(db_path: Path, articles) -> float:
+    original = sna.DB_PATH
+    sna.DB_PATH = db_path
+    try:
+        conn = sna.init_db()
+        start = time.perf_counter()
+        sna.save_articles(conn, articles)
+        seconds = time.perf_counter() - start
+        conn.close()
+    finally:
+        sna.DB_PATH = original
+    return seconds
+
+
+def bench_size(n: int, tmp: Path, failures: list) -> None:
+    sna.DB_PATH = tmp / "bench.db"
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_db(n)
+
+    def row(name: str, seconds: float) -> None:
+        print(f"{n:>9} {name:36s} {seconds * 1000:>10.2f}")
+
+    conn = sqlite3.connect(sna.DB_PATH)
+    row("report: ham tarama", timed(lambda: sna.scan_summary_stats(conn, 10))[0])
+    conn.close()
+    storage = sna.ArticleStorage(engine="sqlite")
+    row("report: özet istatistikleri", timed(lambda: (storage.summary(), storage.most_negative(10)))[0])
+    storage.close()
+
+    # Tetikleyicinin yazma maliyeti: aynı veritabanının tetikleyicisiz kopyası
+    plain = tmp / "plain.db"
+    shutil.copy(sna.DB_PATH, plain)
+    plain_conn = sqlite3.connect(plain)
+    plain_conn.execute("DROP TRIGGER articles_summary_insert")
+    plain_conn.execute("DROP TRIGGER articles_summary_negative")
+    plain_conn.commit()
+    plain_conn.close()
+    batch = make_articles(SAVE_BATCH, offset=n)
+    row(f"save_articles {SAVE_BATCH} (tetikleyicisiz)", timed_save(plain, batch))
+    row(f"save_articles {SAVE_BATCH} (istatistiklerle)", timed_save(sna.DB_PATH, batch))
+    plain.unlink()
+
+    # Tekrar eden linkler (INSERT OR IGNORE) ve duygusuz haberler sayılmaz / sayılır
+    extra = make_articles(50, offset=n + SAVE_BATCH)
+    for article in extra[:10]:
+        article.sentiment = None
+    extra[10].sentiment = -5.0
+    extra[11].source = None
+    conn = sna.init_db()
+    sna.save_articles(conn, batch[:100] + extra)
+    conn.close()
+    summary, negative = report()
+    check("tekrar eden haberler sayılmadı", summary[0] == n + SAVE_BATCH + len(extra), failures)
+    check("yeni en negatif haber listenin başında", negative[0][5] == extra[10].link, failures)
+    no_drift("yeni haberler", failures)
+
+    conn = sna.init_db()
+    with contextlib.redirect_stdout(io.StringIO()):
+        archived = sna.compact_storage(conn, hot_months=3, retention_months=0)["archived"]
+    conn.close()
+    check(f"arşive taşıma ({len(archived)} ay) rapor özetini değiştirmedi", report() == (summary, negative), failures)
+    no_drift("arşive taşıma", failures)
+
+    conn = sna.init_db()
+    with contextlib.redirect_stdout(io.StringIO()):
+        dropped = sna.apply_retention(conn, retention_months=6)
+    conn.close()
+    check(f"saklama süresi ({len(dropped)} ay silindi) toplamı düşürdü", report()[0][0] < summary[0], failures)
+    no_drift("saklama süresi", failures)
+
+    conn = sna.init_db()
+    with conn:
+        conn.execute("UPDATE summary_stats SET total = total + 5")
+        conn.execute("DELETE FROM summary_most_negative WHERE article_id = (SELECT MIN(article_id) FROM summary_most_negative)")
+    drift = [field[0] for field in sna.verify_summary_stats(conn)]
+    check(f"bozulan istatistikler bulundu ({len(drift)} alan)", len(drift) == 2, failures)
+    with conn:
+        sna.rebuild_summary_stats(conn)
+    conn.close()
+    no_drift("rebuild_summary_stats", failures)
+
+
+def main() -> None:
+    sizes = [int(x) for x in sys.argv[1:]] or DEFAULT_SIZES
+    failures: list[str] = []
+    original_db = sna.DB_PATH
+
+    print(f"{'boyut':>9} {'yöntem':36s} {'süre (ms)':>10}")
+    try:
+        for n in sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                bench_size(n, Path(tmp), failures)
+    finally:
+        sna.DB_PATH = original_db
+
+    if failures:
+        print(f"\n{len(failures)} kontrol başarısız")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+FeedScheduler simülasyonu: sabit aralık ile uyarlanan aralık karşılaştırması.
+
+Gerçek ağ kullanılmaz; saat sahte bir sayaçtır. Her kaynak için Poisson
+süreciyle haber yayın zamanları üretilir, sonra aynı zaman çizelgesi
+  - sabit: tüm kaynaklar her poll_interval saniyede birlikte,
+  - uyarlanan: FeedScheduler'ın kaynak başına aralığıyla
+kontrol edilir. Kaynak başına istek sayısı, ortalama tespit gecikmesi
+(yayın -> kontrol) ve başlangıç turundan sonra aynı saniyeye düşen en
+fazla istek (patlama) raporlanır.
+Kontrol: süre sınırını aşan (FETCH_STATUS_TIMEOUT) kaynak geri çekilir,
+yeni haber hızı "0 yeni" ile düşürülmez; toparlanınca biriken haberler
+son başarılı kontrolden beri geçen süreye sayılır.
+Beklenen davranış sağlanmazsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_scheduler.py [saat] [poll_interval]
+"""
+import bisect
+import contextlib
+import io
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+
+# kaynak -> ortalama yayın aralığı (saniye)
+FEEDS = {
+    "Hızlı (TRT Manşet gibi)": 45,
+    "Orta (BBC World gibi)": 300,
+    "Yavaş (DW gibi)": 1200,
+    "Çok yavaş (AA Teyit gibi)": 3 * 3600,
+    **{f"Orta {i}": 600 for i in range(6)},
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_arrivals(duration: float, seed: int = 42) -> dict[str, list[float]]:
+    rng = random.Random(seed)
+    arrivals = {}
+    for name, mean_gap in FEEDS.items():
+        t, times = 0.0, []
+        while True:
+            t += rng.expovariate(1 / mean_gap)
+            if t >= duration:
+                break
+            times.append(t)
+        arrivals[name] = times
+    return arrivals
+
+
+def poll(name: str, now: float, last: dict, arrivals: dict, stats: dict) -> int:
+    times = arrivals[name]
+    lo = bisect.bisect_right(times, last.get(name, 0.0))
+    hi = bisect.bisect_right(times, now)
+    last[name] = now
+    s = stats.setdefault(name, {"requests": 0, "items": 0, "latency": 0.0})
+    s["requests"] += 1
+    s["items"] += hi - lo
+    s["latency"] += sum(now - t for t in times[lo:hi])
+    return hi - lo
+
+
+def run_fixed(arrivals: dict, duration: float, interval: float) -> tuple[dict, int]:
+    stats: dict = {}
+    last: dict = {}
+    per_second: Counter = Counter()
+    t = 0.0
+    while t < duration:
+        for name in FEEDS:
+            poll(name, t, last, arrivals, stats)
+            if t > 0:
+                per_second[int(t)] += 1
+        t += interval
+    return stats, max(per_second.values())
+
+
+def run_adaptive(arrivals: dict, duration: float, interval: float) -> tuple[dict, int]:
+    clock = FakeClock()
+    scheduler = sna.FeedScheduler({name: name for name in FEEDS}, initial_interval=interval, clock=clock)
+    stats: dict = {}
+    last: dict = {}
+    per_second: Counter = Counter()
+    while clock.now < duration:
+        due = scheduler.pop_due(coalesce=0)
+        if not due:
+            clock.now += scheduler.seconds_until_next()
+            continue
+        for name in due:
+            new_items = poll(name, clock.now, last, arrivals, stats)
+            if clock.now > 0:
+                per_second[int(clock.now)] += 1
+            scheduler.record(name, new_items)
+    return stats, max(per_second.values())
+
+
+def check(name: str, ok: bool, failures: list) -> None:
+    print(f"  [{'OK' if ok else 'HATA'}] {name}")
+    if not ok:
+        failures.append(name)
+
+
+def check_timeouts(interval: float, failures: list) -> None:
+    clock = FakeClock()
+    scheduler = sna.FeedScheduler({"A": "a"}, initial_interval=interval, clock=clock)
+    state = scheduler.feeds["A"]
+    ok, timeout = sna.FeedFetch(status=200), sna.FeedFetch(status=sna.FETCH_STATUS_TIMEOUT)
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Her 120 saniyede bir haber
+        for _ in range(6):
+            clock.now += 120
+            scheduler.record_feed("A", 1, ok)
+        rate, steady = state.rate, state.interval
+        last_poll = state.last_poll
+        clock.now += steady
+        scheduler.record_cycle({"A": "a"}, [], {"A": timeout})
+    check(
+        f"zaman aşımında geri çekildi ({steady:.0f}s -> {state.interval:.0f}s)",
+        state.interval == scheduler._clamp(steady * 2),
+        failures,
+    )
+    check("zaman aşımı hızı düşürmedi", state.rate == rate and state.last_poll == last_poll, failures)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        clock.now += state.interval
+        gap = clock.now - last_poll
+        scheduler.record_feed("A", round(gap / 120), ok)
+    check(
+        f"toparlanınca hız korundu ({rate * 3600:.1f} -> {state.rate * 3600:.1f} haber/saat)",
+        abs(state.rate - rate) / rate < 0.2,
+        failures,
+    )
+
+
+def main() -> None:
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 24
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 60
+    duration = hours * 3600
+    random.seed(0)  # jitter tekrarlanabilir olsun
+    arrivals = make_arrivals(duration)
+
+    fixed, fixed_burst = run_fixed(arrivals, duration, interval)
+    adaptive, adaptive_burst = run_adaptive(arrivals, duration, interval)
+
+    print(f"{hours:g} saat, sabit aralık {interval:g}s, {len(FEEDS)} kaynak")
+    print(f"{'kaynak':28s} {'haber':>6} {'istek sabit':>12} {'istek uyarl.':>13} {'gecikme sabit':>14} {'gecikme uyarl.':>15}")
+    for name in FEEDS:
+        f, a = fixed[name], adaptive[name]
+        items = max(f["items"], 1)
+        print(
+            f"{name:28s} {f['items']:>6} {f['requests']:>12} {a['requests']:>13} "
+            f"{f['latency'] / items:>13.1f}s {a['latency'] / max(a['items'], 1):>14.1f}s"
+        )
+
+    def totals(stats: dict) -> tuple[int, float]:
+        requests = sum(s["requests"] for s in stats.values())
+        items = sum(s["items"] for s in stats.values())
+        return requests, sum(s["latency"] for s in stats.values()) / max(items, 1)
+
+    (fr, fl), (ar, al) = totals(fixed), totals(adaptive)
+    print(f"{'TOPLAM':28s} {'':>6} {fr:>12} {ar:>13} {fl:>13.1f}s {al:>14.1f}s")
+    print(f"ilk turdan sonra aynı saniyedeki en fazla istek: sabit {fixed_burst}, uyarlanan {adaptive_burst}")
+
+    failures: list[str] = []
+    check_timeouts(interval, failures)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
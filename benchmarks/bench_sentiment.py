@@ -0,0 +1,73 @@
+"""
+Duygu analizi backend'leri için benchmark.
+
+TextBlob ve sözlük tabanlı (lexicon) backend'in sentetik İngilizce/Türkçe
+haberlerdeki hızı ölçülür; lexicon backend için parti boyutu ayarlanır.
+Kontroller: kök eşleşmesi çekimli kelimeleri bulur ama başka kelimelerin
+başına yapışmaz ("kaza" -> "kazanmak", "dead" -> "deadline").
+Beklenen davranış sağlanmazsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_sentiment.py [haber_sayisi]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from corpus import make_corpus  # noqa: E402
+
+# (metin, beklenen işaret: -1 negatif, 0 nötr, +1 pozitif)
+LEXICON_CASES = [
+    ("Takım kupayı kazanmak için sahaya çıkıyor", 0),
+    ("Deadline for applications extended", 0),
+    ("Kazanan takım kupayı kaldırdı", 0),
+    ("Otoyoldaki kazada iki kişi yaralandı", -1),
+    ("Saldırıda üç kişi öldürüldü", -1),
+    ("Depremde 10 kişi hayatını kaybetti", -1),
+    ("Gunman killing three people arrested", -1),
+    ("Deadly storm hits the coast", -1),
+    ("Fans celebrated the championship victory", 1),
+    ("Takım kupayı kazandı", 1),
+]
+
+
+def check(name: str, ok: bool, failures: list) -> None:
+    print(f"  [{'OK' if ok else 'HATA'}] {name}")
+    if not ok:
+        failures.append(name)
+
+
+def sign(score: float) -> int:
+    return (score > 0) - (score < 0)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    texts = [a.title + " " + a.summary for a in make_corpus(n)]
+
+    lexicon = sna.LexiconBackend()
+    best = lexicon.tune_batch_size(texts[: min(len(texts), 5_000)])
+    print(f"lexicon parti boyutu: {best} (numpy: {'var' if sna.np is not None else 'yok'})")
+
+    for backend in (sna.TextBlobBackend(), lexicon):
+        start = time.perf_counter()
+        backend.score_batch(texts)
+        elapsed = time.perf_counter() - start
+        print(f"  {backend.name:9s}: {elapsed:7.3f}s ({n / elapsed:>10,.0f} metin/s)")
+
+    failures: list[str] = []
+    print("lexicon kök eşleşmesi:")
+    scores = lexicon.score_batch([text for text, _ in LEXICON_CASES])
+    for (text, expected), score in zip(LEXICON_CASES, scores):
+        check(f"{text!r}: {score:+.2f}", sign(score) == expected, failures)
+
+    if failures:
+        print(f"\n{len(failures)} kontrol başarısız")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
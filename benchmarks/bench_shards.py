@@ -0,0 +1,186 @@
+"""
+Paylaşımlı toplama ("worker" modu) için yerel davranış testi.
+
+Yerel feed sunucusu (corpus.FeedStandIn) ve geçici bir news.db ile birden
+çok işçi süreci başlatılır (kısa kalp atışı / kira süreleriyle). Kontroller:
+  - her kaynak tam olarak bir canlı işçide kiralı, her işçinin payı var
+  - tüm haberler tek kez kaydedilir
+  - bir işçi SIGKILL ile öldürülünce (leave çalışmaz) kiralar süresi dolunca
+    diğerlerine geçer; sadece ölen işçinin kaynakları yer değiştirir
+  - yeni bir işçi katılınca kaynakların sadece bir kısmı ona geçer
+  - düzgün kapanışta (SIGINT) işçi kayıtları silinir
+Beklenen davranış sağlanmazsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_shards.py [isci_sayisi] [kaynak_sayisi]
+"""
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from corpus import FeedStandIn, make_feeds  # noqa: E402
+
+ITEMS_PER_FEED = 20
+HEARTBEAT = 0.5  # İşçilerde SHARD_HEARTBEAT_INTERVAL
+LEASE = 2.0  # İşçilerde SHARD_LEASE_SECONDS
+POLL_INTERVAL = 2  # Sabit aralıklı mod, kaynaklar sık tekrar çekilsin
+
+
+def run_worker(worker_id: str, db_path: str, base_url: str, n_feeds: int) -> None:
+    """Alt süreç: yerel kaynaklarla paylaşımlı canlı mod."""
+    sna.DB_PATH = Path(db_path)
+    sna.RSS_FEEDS = {f"Bench {i}": f"{base_url}/feed/{i}" for i in range(n_feeds)}
+    sna.SHARD_HEARTBEAT_INTERVAL = HEARTBEAT
+    sna.SHARD_LEASE_SECONDS = LEASE
+    sna.USE_ADAPTIVE_SCHEDULER = False
+    sna.USE_METRICS_SERVER = False
+    sna.alert_dispatcher.telegram = sna.alert_dispatcher.notifications = False
+    sna.main_loop(poll_interval=POLL_INTERVAL, sharded=True, worker_id=worker_id)
+
+
+def leases(db_path: Path) -> dict[str, str]:
+    """Süresi dolmamış kiralar: kaynak -> işçi."""
+    conn = sqlite3.connect(db_path, timeout=10)
+    rows = conn.execute(
+        "SELECT feed, worker_id FROM shard_leases WHERE expires_at >= ?", (time.time(),)
+    ).fetchall()
+    conn.close()
+    return dict(rows)
+
+
+def scalar(db_path: Path, sql: str) -> int:
+    conn = sqlite3.connect(db_path, timeout=10)
+    value = conn.execute(sql).fetchone()[0]
+    conn.close()
+    return value
+
+
+def wait_until(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.2)
+    return predicate()
+
+
+def check(name: str, ok: bool, failures: list) -> None:
+    print(f"  [{'OK' if ok else 'HATA'}] {name}")
+    if not ok:
+        failures.append(name)
+
+
+def main() -> None:
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    n_feeds = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+    failures: list[str] = []
+
+    stand_in = FeedStandIn(make_feeds(n_feeds, ITEMS_PER_FEED), latency=0.05)
+    tmp = tempfile.TemporaryDirectory()
+    db_path = Path(tmp.name) / "shards.db"
+    sna.DB_PATH = db_path
+    # Göçler işçiler başlamadan bir kez uygulanır
+    sna.init_db(sna.SHARD_DB_PROFILE).close()
+
+    procs: dict[str, subprocess.Popen] = {}
+
+    def start(worker_id: str) -> None:
+        log = open(Path(tmp.name) / f"{worker_id}.log", "w")
+        procs[worker_id] = subprocess.Popen(
+            [sys.executable, __file__, "--worker", worker_id, str(db_path), stand_in.base_url, str(n_feeds)],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+    def owners() -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for worker_id in leases(db_path).values():
+            counts[worker_id] = counts.get(worker_id, 0) + 1
+        return counts
+
+    def balanced(expected: set) -> bool:
+        current = leases(db_path)
+        return len(current) == n_feeds and set(current.values()) == expected
+
+    try:
+        print(f"{n_workers} işçi, {n_feeds} kaynak, kalp atışı {HEARTBEAT}s, kira {LEASE}s")
+        start_time = time.monotonic()
+        for i in range(n_workers):
+            start(f"w{i}")
+        alive = {f"w{i}" for i in range(n_workers)}
+
+        check("tüm kaynaklar canlı işçilere dağıldı", wait_until(lambda: balanced(alive), 30), failures)
+        print(f"       dağılım: {owners()} ({time.monotonic() - start_time:.1f}s)")
+        total = n_feeds * ITEMS_PER_FEED
+        check(
+            f"tüm haberler kaydedildi ({total})",
+            wait_until(lambda: scalar(db_path, "SELECT COUNT(*) FROM articles") == total, 30),
+            failures,
+        )
+
+        # Ölen işçi: kirası süresi dolunca diğerlerine geçmeli
+        before = leases(db_path)
+        victim = "w0"
+        procs[victim].send_signal(signal.SIGKILL)
+        procs[victim].wait()
+        alive.discard(victim)
+        killed_at = time.monotonic()
+        check("ölen işçinin kaynakları devralındı", wait_until(lambda: balanced(alive), LEASE * 5), failures)
+        after = leases(db_path)
+        moved = [feed for feed in before if before[feed] != after.get(feed)]
+        print(f"       {time.monotonic() - killed_at:.1f}s içinde, yer değiştiren: {len(moved)}/{n_feeds}")
+        check("sadece ölen işçinin kaynakları yer değiştirdi", all(before[f] == victim for f in moved), failures)
+
+        # Yeni işçi: halkadaki payı kadar kaynak ona geçmeli
+        before = after
+        start("w_new")
+        alive.add("w_new")
+        check("yeni işçi pay aldı", wait_until(lambda: balanced(alive), LEASE * 5), failures)
+        after = leases(db_path)
+        moved = [feed for feed in before if before[feed] != after.get(feed)]
+        print(f"       yer değiştiren: {len(moved)}/{n_feeds}, dağılım: {owners()}")
+        check("taşınan kaynakların hepsi yeni işçiye gitti", all(after[f] == "w_new" for f in moved), failures)
+
+        check(
+            "haber tekrarı yok",
+            scalar(db_path, "SELECT COUNT(*) FROM articles")
+            == scalar(db_path, "SELECT COUNT(DISTINCT link) FROM articles")
+            == total,
+            failures,
+        )
+    finally:
+        for worker_id, proc in procs.items():
+            if proc.poll() is None:
+                proc.send_signal(signal.SIGINT)
+        for proc in procs.values():
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        stand_in.close()
+
+    # SIGKILL ile ölen işçinin kaydı kalır, düzgün kapananlarınki silinir
+    remaining = {
+        row[0] for row in sqlite3.connect(db_path).execute("SELECT worker_id FROM shard_workers")
+    }
+    check("düzgün kapanan işçiler kaydını sildi", remaining == {"w0"}, failures)
+    print(f"  feed sunucusuna istek: {stand_in.requests}")
+    tmp.cleanup()
+
+    if failures:
+        print(f"\n{len(failures)} kontrol başarısız")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        run_worker(*sys.argv[2:5], int(sys.argv[5]))
+    else:
+        main()
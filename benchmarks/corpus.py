@@ -0,0 +1,253 @@
+"""
+Benchmark'lar için çevrimdışı sentetik haber korpusu ve yerel feed sunucusu.
+
+- make_corpus: İngilizce / Türkçe (ya da karışık) sentetik haberler.
+  Metinler dolgu kelimeleri, kategori / alarm keyword'leri ve duygu
+  sözlüğü kelimelerinden seed'e bağlı olarak üretilir (tekrarlanabilir).
+- render_rss / render_atom: haber listesini RSS 2.0 ya da Atom XML'e çevirir.
+- FeedStandIn: feed'leri ETag'li (304 destekli), istenirse gecikmeli sunan
+  yerel HTTP sunucusu.
+- TelegramStandIn: Telegram sendMessage uç noktasını taklit eden yerel
+  HTTP sunucusu (gecikme, istenirse 429 retry_after ve 500 yanıtları).
+
+Diğer benchmark'lar ve run_suite.py buradan içe aktarır.
+"""
+import json
+import random
+import sys
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+
+FILLER = {
+    "en": (
+        "the a on in of to and said monday tuesday new report city people officials "
+        "local team weather match season film music week today according statement "
+        "after before during country region minister spokesman residents"
+    ).split(),
+    "tr": (
+        "bugün yeni bir ve ile için açıklama şehir halk yetkililer yerel takım hava "
+        "maç sezon film müzik hafta göre dedi sonra önce sırasında ülke bölge "
+        "sözcü vatandaşlar yapılan belirtti"
+    ).split(),
+}
+
+SOURCES = {
+    "en": ["Bench World", "Bench Wire", "Bench Times", "Bench Daily", "Bench Post"],
+    "tr": ["Bench Haber", "Bench Gündem", "Bench Dünya", "Bench Ekonomi", "Bench Ajans"],
+}
+
+
+def _split_by_language(words) -> dict[str, list[str]]:
+    # Yaklaşık ayrım: Türkçe karakter içerenler TR, gerisi EN
+    # ("oy", "sel" gibi ASCII Türkçe kelimeler EN tarafına düşer; ölçüm için önemsiz)
+    split: dict[str, list[str]] = {"en": [], "tr": []}
+    for w in sorted(set(words)):
+        split["tr" if sna._looks_turkish(w) else "en"].append(w)
+    return split
+
+
+KEYWORDS = _split_by_language(
+    [k for kws in sna.CATEGORY_KEYWORDS.values() for k in kws]
+    + [k for kws in sna.ALERT_KEYWORDS.values() for k in kws]
+)
+SENTIMENT_WORDS = _split_by_language(sna.SENTIMENT_LEXICON)
+
+
+def make_corpus(n: int, lang: str = "mixed", seed: int = 42, link_prefix: str = "http://bench.local") -> list[sna.Article]:
+    """
+    n adet sentetik haber üretir. lang: "en", "tr" ya da "mixed" (yarı yarıya).
+    Kelimelerin ~%5'i keyword, ~%5'i duygu sözlüğünden gelir.
+    """
+    rng = random.Random(seed)
+    base = datetime(2025, 11, 22, 22, 0, tzinfo=timezone.utc)
+
+    def sentence(language: str, length: int) -> str:
+        words = []
+        for _ in range(length):
+            r = rng.random()
+            if r < 0.05:
+                word = rng.choice(KEYWORDS[language] or FILLER[language])
+            elif r < 0.10:
+                word = rng.choice(SENTIMENT_WORDS[language] or FILLER[language])
+            else:
+                word = rng.choice(FILLER[language])
+            words.append(word.capitalize() if rng.random() < 0.1 else word)
+        return " ".join(words)
+
+    articles = []
+    for i in range(n):
+        language = lang if lang != "mixed" else ("en" if i % 2 == 0 else "tr")
+        articles.append(
+            sna.Article(
+                title=sentence(language, rng.randint(6, 14)),
+                summary=sentence(language, rng.randint(20, 50)),
+                link=f"{link_prefix}/{language}/{seed}/{i}",
+                published=format_datetime(base - timedelta(minutes=i)),
+                source=rng.choice(SOURCES[language]),
+            )
+        )
+    return articles
+
+
+def render_rss(articles: list[sna.Article], title: str) -> bytes:
+    items = "".join(
+        f"<item><title>{escape(a.title)}</title><link>{escape(a.link)}</link>"
+        f"<description>{escape(a.summary)}</description><pubDate>{a.published}</pubDate></item>"
+        for a in articles
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<rss version="2.0"><channel><title>{escape(title)}</title>{items}</channel></rss>'
+    ).encode("utf-8")
+
+
+def render_atom(articles: list[sna.Article], title: str) -> bytes:
+    entries = "".join(
+        f'<entry><title>{escape(a.title)}</title><link href="{escape(a.link)}"/>'
+        f"<id>{escape(a.link)}</id><summary>{escape(a.summary)}</summary>"
+        f"<updated>2025-11-22T22:00:00Z</updated></entry>"
+        for a in articles
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<feed xmlns="http://www.w3.org/2005/Atom"><title>{escape(title)}</title>{entries}</feed>'
+    ).encode("utf-8")
+
+
+def make_feeds(n_feeds: int, items_per_feed: int, seed: int = 42) -> dict[str, bytes]:
+    """
+    Yol -> XML gövdesi. Kaynaklar sırayla EN/TR ve RSS/Atom olarak dönüşümlüdür:
+    /feed/0 EN RSS, /feed/1 TR Atom, /feed/2 EN Atom, /feed/3 TR RSS, ...
+    """
+    feeds = {}
+    for i in range(n_feeds):
+        lang = "en" if i % 2 == 0 else "tr"
+        articles = make_corpus(items_per_feed, lang=lang, seed=seed * 1000 + i)
+        render = render_rss if (i // 2) % 2 == (i % 2) else render_atom
+        feeds[f"/feed/{i}"] = render(articles, f"Bench feed {i}")
+    return feeds
+
+
+class _StandInServer(ThreadingHTTPServer):
+    # Varsayılan listen kuyruğu (5) paralel indirmede taşar ve istemci
+    # SYN'i 1 saniye sonra tekrarlar; ölçüme sunucu kaynaklı gecikme karışmasın
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FeedStandIn:
+    """make_feeds çıktısını ETag'li sunan yerel HTTP sunucusu."""
+
+    def __init__(self, feeds: dict[str, bytes], latency: float = 0.0):
+        self.feeds = feeds
+        self.latency = latency
+        self.requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                body = stand_in.feeds.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{hash(body) & 0xFFFFFFFF:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                content_type = "application/atom+xml" if b"<feed" in body[:200] else "application/rss+xml"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _StandInServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.base_url = f"http://{host}:{port}"
+
+    def rss_feeds(self) -> dict[str, str]:
+        """RSS_FEEDS biçiminde kaynak adı -> url."""
+        return {f"Bench {path.rsplit('/', 1)[-1]}": self.base_url + path for path in self.feeds}
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TelegramStandIn:
+    """sendMessage taklidi; gelen mesajları ve istek sayısını tutar."""
+
+    def __init__(self, latency: float = 0.0, rate_limit_every: int = 0, error_every: int = 0):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.error_every = error_every
+        self.requests = 0
+        self.messages: list[str] = []
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(stand_in.latency)
+                with stand_in.lock:
+                    stand_in.requests += 1
+                    n = stand_in.requests
+                if stand_in.rate_limit_every and n % stand_in.rate_limit_every == 0:
+                    self._reply(429, {"ok": False, "parameters": {"retry_after": 0.2}})
+                    return
+                if stand_in.error_every and n % stand_in.error_every == 0:
+                    self._reply(500, {"ok": False})
+                    return
+                with stand_in.lock:
+                    stand_in.messages.append(json.loads(body)["text"])
+                self._reply(200, {"ok": True})
+
+            def _reply(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _StandInServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.url = f"http://{host}:{port}"
+
+    def delivered(self) -> int:
+        """Teslim edilen alarm sayısı (birleştirilmiş mesajlar boş satırla ayrılır)."""
+        with self.lock:
+            return sum(len(m.split("\n\n")) for m in self.messages)
+
+    def wait_for(self, n: int, timeout: float) -> float:
+        start = time.perf_counter()
+        while self.delivered() < n and time.perf_counter() - start < timeout:
+            time.sleep(0.01)
+        return time.perf_counter() - start
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
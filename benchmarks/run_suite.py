@@ -0,0 +1,282 @@
+"""
+Tekrarlanabilir benchmark paketi; sonuçlar JSON olarak yazılır.
+
+Sentetik EN/TR korpus (corpus.py) ile her boyut için ölçülenler:
+  - cycle          : yerel feed sunucusundan uçtan uca bir canlı mod turu
+                     (fetch_latest_articles + handle_new_articles, main_loop'un
+                     her turda yaptığı iş); ikinci tur tüm kaynaklar 304
+  - cycle_pipeline : aynı tur IngestPipeline ile (aşamalar eşzamanlı)
+  - process_articles, categorize_article, save_articles, export_to_csv
+  - load_data      : dashboard DashboardStore (soğuk, önbellekli, artımlı)
+Her ölçüm --repeat kez yapılır, medyan alınır. Ağ kullanılmaz.
+
+Kullanım:
+    python benchmarks/run_suite.py [--sizes 1000 10000] [--repeat 3] [--feed-latency 0.3] [--output sonuc.json]
+    python benchmarks/run_suite.py --compare eski.json yeni.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sei_news_analyzer as sna  # noqa: E402
+from corpus import FeedStandIn, make_corpus, make_feeds  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000]
+ITEMS_PER_FEED = 50
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+REGRESSION_THRESHOLD = 1.10  # --compare: %10'dan fazla yavaşlama işaretlenir
+MIN_COMPARE_SECONDS = 0.01  # Bundan kısa ölçümler gürültü sayılır, işaretlenmez
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def reset_state(db_path: Path) -> None:
+    """Ölçümler birbirini etkilemesin: boş veritabanı ve boş bellek içi durum."""
+    sna.DB_PATH = db_path
+    sna.seen_links.clear()
+    sna.feed_cache.clear()
+    sna.analysis_cache.detach()
+    sna.analysis_cache.clear()
+    sna.alerted_clusters.clear()
+    sna.metrics.reset()
+
+
+def timed(fn, repeat: int, setup=None) -> float:
+    """setup() her tekrardan önce ölçüm dışında çalışır; medyan süre döner."""
+    times = []
+    for _ in range(repeat):
+        # [DEBUG] / [DB] çıktıları ölçümü ve raporu boğmasın
+        with contextlib.redirect_stdout(io.StringIO()):
+            arg = setup() if setup else None
+            start = time.perf_counter()
+            fn(arg)
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_size(n: int, repeat: int, tmp: Path, feed_latency: float = 0.0) -> list[dict]:
+    results = []
+
+    def record(name: str, seconds: float, items: int, **extra) -> None:
+        results.append(
+            {"name": name, "size": n, "seconds": round(seconds, 6), "items_per_sec": round(items / seconds, 1), **extra}
+        )
+        print(f"  {name:28s} {n:>8} {seconds:>9.3f}s {items / seconds:>12,.0f}/s", file=sys.stderr)
+
+    corpus = make_corpus(n, lang="mixed")
+
+    # categorize_article (tek tek çağrı)
+    record(
+        "categorize_article",
+        timed(lambda _: [sna.categorize_article(a) for a in corpus], repeat),
+        n,
+    )
+
+    # process_articles: önbellek boş (tüm metinler analiz edilir)
+    def fresh_process(_=None):
+        reset_state(tmp / "process.db")
+        return [sna.Article(a.title, a.summary, a.link, a.published, a.source) for a in corpus]
+
+    record("process_articles", timed(sna.process_articles, repeat, setup=fresh_process), n)
+
+    # process_articles: tüm metinler önbellekte
+    with contextlib.redirect_stdout(io.StringIO()):
+        sna.process_articles(fresh_process())
+    record(
+        "process_articles_cached",
+        timed(sna.process_articles, repeat, setup=lambda: [
+            sna.Article(a.title, a.summary, a.link, a.published, a.source) for a in corpus
+        ]),
+        n,
+    )
+
+    # save_articles: her tekrar boş bir veritabanına
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzed = sna.process_articles(fresh_process())
+
+    def fresh_db():
+        reset_state(tmp / f"save-{time.perf_counter_ns()}.db")
+        return sna.init_db()
+
+    def save(conn):
+        sna.save_articles(conn, analyzed)
+        conn.close()
+
+    record("save_articles", timed(save, repeat, setup=fresh_db), n)
+
+    # export_to_csv ve load_data için dolu bir veritabanı
+    full_db = tmp / "full.db"
+    reset_state(full_db)
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = sna.init_db()
+        sna.save_articles(conn, analyzed)
+        conn.close()
+
+    record("export_to_csv", timed(lambda _: sna.export_to_csv(str(tmp / "export.csv")), repeat), n)
+
+    try:
+        import dashboard
+    except ImportError as e:
+        print(f"  [WARN] load_data atlandı (dashboard içe aktarılamadı: {e})", file=sys.stderr)
+    else:
+        limit = n
+        record(
+            "load_data_cold",
+            timed(lambda store: store.load("all", None, limit), repeat, setup=lambda: dashboard.DashboardStore(full_db)),
+            n,
+        )
+        store = dashboard.DashboardStore(full_db)
+        with contextlib.redirect_stdout(io.StringIO()):
+            store.load("all", None, limit)
+        record("load_data_cached", timed(lambda _: store.load("all", None, limit), repeat), n)
+
+        # Artımlı: her tekrarda 100 yeni satır eklenir, sadece onlar okunur
+        extra = iter(range(repeat))
+
+        def add_rows():
+            batch = sna.process_articles(make_corpus(100, seed=1000 + next(extra), link_prefix="http://bench.extra"))
+            conn = sna.init_db()
+            sna.save_articles(conn, batch)
+            conn.close()
+            return store
+
+        record(
+            "load_data_incremental",
+            timed(lambda s: s.load("all", None, limit), repeat, setup=add_rows),
+            100,
+            new_rows=100,
+        )
+
+    # Uçtan uca tur: n haber, kaynak başına ITEMS_PER_FEED
+    n_feeds = max(1, n // ITEMS_PER_FEED)
+    stand_in = FeedStandIn(make_feeds(n_feeds, ITEMS_PER_FEED), latency=feed_latency)
+    original_feeds = sna.RSS_FEEDS
+    sna.RSS_FEEDS = stand_in.rss_feeds()
+    original_alerts = sna.alert_dispatcher.telegram, sna.alert_dispatcher.notifications
+    sna.alert_dispatcher.telegram = sna.alert_dispatcher.notifications = False
+    try:
+        def cycle(conn):
+            articles = sna.fetch_latest_articles(conn=conn)
+            sna.handle_new_articles(conn, articles)
+            sna.save_feed_cache(conn)
+
+        record("cycle", timed(cycle, repeat, setup=fresh_db), n, feeds=n_feeds)
+
+        # Aynı durumla ikinci tur: tüm kaynaklar 304
+        with contextlib.redirect_stdout(io.StringIO()):
+            conn = fresh_db()
+            cycle(conn)
+        record("cycle_not_modified", timed(lambda _: cycle(conn), repeat), n, feeds=n_feeds)
+        conn.close()
+
+        pipeline = sna.IngestPipeline()
+
+        def pipeline_cycle(conn):
+            pipeline.submit(sna.RSS_FEEDS)
+            done = 0
+            while done < n_feeds:
+                done += len(pipeline.drain(conn, sna.FETCH_TIMEOUT))
+            conn.close()
+
+        try:
+            record("cycle_pipeline", timed(pipeline_cycle, repeat, setup=fresh_db), n, feeds=n_feeds)
+        finally:
+            pipeline.close()
+    finally:
+        sna.RSS_FEEDS = original_feeds
+        sna.alert_dispatcher.telegram, sna.alert_dispatcher.notifications = original_alerts
+        stand_in.close()
+
+    return results
+
+
+def compare(old_path: str, new_path: str) -> int:
+    """İki sonuç dosyasını karşılaştırır; REGRESSION_THRESHOLD'u aşan yavaşlama varsa 1 döner."""
+    old = json.loads(Path(old_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    old_by_key = {(r["name"], r["size"]): r for r in old["results"]}
+
+    print(f"{old['env']['commit']} -> {new['env']['commit']}")
+    print(f"{'ölçüm':28s} {'boyut':>8} {'eski (s)':>10} {'yeni (s)':>10} {'oran':>7}")
+    regressions = 0
+    for r in new["results"]:
+        before = old_by_key.get((r["name"], r["size"]))
+        if before is None:
+            continue
+        ratio = r["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        slow = ratio > REGRESSION_THRESHOLD and r["seconds"] >= MIN_COMPARE_SECONDS
+        flag = "  [YAVAŞLAMA]" if slow else ""
+        regressions += bool(flag)
+        print(f"{r['name']:28s} {r['size']:>8} {before['seconds']:>10.3f} {r['seconds']:>10.3f} {ratio:>6.2f}x{flag}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SEI News Analyzer benchmark paketi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--feed-latency", type=float, default=0.0, help="yerel feed sunucusunun yanıt gecikmesi (saniye)")
+    parser.add_argument("--output", help="JSON dosyası (varsayılan: benchmarks/results/<commit>-<zaman>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("ESKI", "YENI"))
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare))
+
+    original_db = sna.DB_PATH
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for n in args.sizes:
+                print(f"[boyut {n}]", file=sys.stderr)
+                results.extend(bench_size(n, args.repeat, Path(tmp), feed_latency=args.feed_latency))
+    finally:
+        sna.DB_PATH = original_db
+
+    now = datetime.now(timezone.utc)
+    report = {
+        "env": {
+            "commit": git_commit(),
+            "timestamp": now.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sentiment_backend": type(sna.get_sentiment_backend()).__name__,
+            "sqlite": sna.sqlite3.sqlite_version,
+            "repeat": args.repeat,
+            "feed_latency": args.feed_latency,
+        },
+        "results": results,
+    }
+
+    out = Path(args.output) if args.output else RESULTS_DIR / f"{report['env']['commit']}-{now:%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Sonuçlar: {out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,213 @@
+import re
 import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 
+from sei_news_analyzer import (
+    ALERT_KEYWORDS,
+    ALERT_LABEL_BITS,
+    SEARCH_COLUMNS,
+    ArticleStorage,
+    article_update_count,
+    build_fts_match,
+    build_load_data_query,
+    init_db,
+    iter_archives,
+    oldest_article_id,
+    search_articles,
+)
+
 DB_PATH = Path(__file__).parent / "news.db"
 
-ALERT_KEYWORDS = {
-    "Deprem / Earthquake": [
-        "earthquake", "aftershock", "tremor", "quake",
-        "deprem",
-    ],
-    "Savaş / War / Çatışma": [
-        "war", "invasion", "offensive", "airstrike", "air strike",
-        "missile", "rocket attack", "shelling",
-        "savaş", "çatışma",
-    ],
-    "Patlama / Bombalama": [
-        "bombing", "blast", "explosion", "suicide attack",
-        "car bomb", "roadside bomb",
-        "patlama", "bombalı saldırı", "intihar saldırısı",
-    ],
-    "Rehine / Kaçırma": [
-        "kidnapped", "abducted", "hostage", "abduction",
-        "rehine", "kaçırıldı", "kaçırılan",
-    ],
-    "Ekonomi / Economy": [
-        "inflation", "recession", "interest rate", "interest rates",
-        "stock market", "exchange rate", "currency crisis",
-        "economy", "economic crisis",
-        "enflasyon", "resesyon", "faiz", "faiz oranı",
-        "kur krizi", "döviz krizi", "döviz kuru",
-        "borsa", "dolar", "euro",
-    ],
+# Her alarm etiketi için tek bir derlenmiş alternation regex'i.
+# Pandas Series üzerinde str.contains ile tüm satırlar birlikte taranır.
+ALERT_PATTERNS = {
+    label: re.compile("|".join(re.escape(k.lower()) for k in keywords))
+    for label, keywords in ALERT_KEYWORDS.items()
 }
 
 
-def detect_alert_labels(title: str, summary: str) -> str:
-    text = (str(title) + " " + str(summary)).lower()
-    labels: list[str] = []
+def label_alerts(df: pd.DataFrame) -> pd.Series:
+    """
+    detect_alert_labels'ın vektörize hali: satır satır fonksiyon çağırmadan
+    "etiket1, etiket2" biçiminde aynı etiketleri üretir.
 
-    for label, keywords in ALERT_KEYWORDS.items():
-        if any(k.lower() in text for k in keywords):
-            labels.append(label)
+    alert_mask kolonu doluysa (kayıt sırasında hesaplanmış) etiketler
+    bitlerden okunur; sadece maskesi olmayan satırlar metinden taranır.
+    """
+    labels = pd.Series("", index=df.index, dtype=object)
+    if df.empty:
+        return labels
 
-    return ", ".join(labels) if labels else ""
+    if "alert_mask" in df.columns:
+        masks = df["alert_mask"]
+        stored = masks.notna()
+        masks = masks.fillna(0).astype("int64")
+    else:
+        stored = pd.Series(False, index=df.index)
 
+    text = None
+    if not stored.all():
+        text = (df["title"].astype(str) + " " + df["summary"].astype(str)).str.lower()
 
-def get_connection() -> sqlite3.Connection:
-    return sqlite3.connect(DB_PATH)
+    for label, pattern in ALERT_PATTERNS.items():
+        hit = pd.Series(False, index=df.index)
+        if stored.any():
+            hit |= stored & ((masks & ALERT_LABEL_BITS[label]) != 0)
+        if text is not None:
+            hit |= ~stored & text.str.contains(pattern, na=False)
+        if not hit.any():
+            continue
+        prefixed = labels.where(labels == "", labels + ", ")
+        labels = labels.mask(hit, prefixed + label)
 
+    return labels
 
-def load_data(category: str = "all", hours: int | None = 24, limit: int = 500) -> pd.DataFrame:
-    conn = get_connection()
-    query = """
-        SELECT
-            title,
-            summary,
-            link,
-            published,
-            source,
-            sentiment,
-            category,
-            created_at
-        FROM articles
-        WHERE 1=1
-    """
 
-    params: list = []
+# Aynı filtre için bellekte tutulacak en fazla DataFrame sayısı
+MAX_CACHED_FRAMES = 32
 
-    # Kategori filtresi
-    if category != "all":
-        query += " AND category = ?"
-        params.append(category)
 
-    # Zaman filtresi (son X saat)
-    if hours is not None:
-        query += " AND created_at >= datetime('now', ?)"
-        params.append(f"-{hours} hours")
-
-    query += " ORDER BY created_at DESC LIMIT ?"
-    params.append(limit)
+class DashboardStore:
+    """
+    Streamlit rerun'ları arasında paylaşılan tek bağlantı ve sonuç önbelleği.
+
+    Her filtre kombinasyonu (kategori, saat, limit) için son DataFrame ve
+    veritabanının id filigranı (watermark) tutulur:
+      - PRAGMA data_version değişmediyse veritabanı okunmaz,
+      - değiştiyse sadece filigrandan yeni satırlar çekilip başa eklenir,
+      - zaman penceresinden çıkan ve silinmiş satırlar bellekte süzülür,
+      - var olan satırlar yerinde güncellendiyse (article_changes sayacı,
+        ör. backfill) DataFrame baştan okunur.
+    news.db'de limit'e yetecek satır yoksa pencereyle kesişen arşiv
+    bölümleri (en yeni ay önce) limit dolana kadar okunur.
+    Grafiklerin toplama sorguları ArticleStorage'ın analiz motorunda
+    (ANALYTICS_ENGINE: SQLite özet tabloları ya da DuckDB aynası) çalışır.
+    """
 
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
-    return df
+    def __init__(self, db_path: Path):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self._frames: OrderedDict = OrderedDict()
+        self.storage = ArticleStorage()
+
+    def _id_range(self) -> tuple[int, int, int]:
+        cur = self.conn.cursor()
+        # MAX/MIN(id) rowid üzerinden tek adımda okunur
+        max_id = cur.execute("SELECT MAX(id) FROM articles").fetchone()[0] or 0
+        # Arşive taşınan satırlar silinmiş sayılmasın: en küçük id arşiv dahil
+        min_id = oldest_article_id(self.conn) or 0
+        return max_id, min_id, article_update_count(self.conn)
+
+    def _fill_from_archive(
+        self, df: pd.DataFrame, query: str, params: list, hours: int | None, limit: int
+    ) -> pd.DataFrame:
+        frames = [df]
+        total = len(df)
+        for _, archive_conn in iter_archives(self.conn, hours):
+            if total >= limit:
+                break
+            archived = pd.read_sql_query(query, archive_conn, params=params)
+            frames.append(archived)
+            total += len(archived)
+        if len(frames) == 1:
+            return df
+        df = pd.concat([f for f in frames if not f.empty] or [df], ignore_index=True)
+        return df.sort_values("created_at", ascending=False, kind="stable").head(limit).reset_index(drop=True)
+
+    def load(self, category: str, hours: int | None, limit: int, only_alerts: bool = False) -> pd.DataFrame:
+        key = (category, hours, limit, only_alerts)
+        with self.lock:
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            cached = self._frames.get(key)
+
+            if cached is not None and cached["data_version"] == data_version:
+                df = cached["df"]
+            else:
+                max_id, min_id, updates = self._id_range()
+                if cached is None or max_id < cached["max_id"] or updates != cached["updates"]:
+                    query, params = build_load_data_query(
+                        category=category, hours=hours, limit=limit, only_alerts=only_alerts
+                    )
+                    df = pd.read_sql_query(query, self.conn, params=params)
+                    if len(df) < limit:
+                        df = self._fill_from_archive(df, query, params, hours, limit)
+                    df["alerts"] = label_alerts(df)
+                else:
+                    df = cached["df"]
+                    if max_id > cached["max_id"]:
+                        query, params = build_load_data_query(
+                            category=category,
+                            hours=hours,
+                            limit=limit,
+                            since_id=cached["max_id"],
+                            only_alerts=only_alerts,
+                        )
+                        new_rows = pd.read_sql_query(query, self.conn, params=params)
+                        # Etiketler sadece yeni satırlar için hesaplanır
+                        new_rows["alerts"] = label_alerts(new_rows)
+                        df = pd.concat([new_rows, df], ignore_index=True).head(limit)
+                    # Arşivlenen / silinen eski satırları at
+                    df = df[df["id"] >= min_id]
+
+                self._frames[key] = {"df": df, "max_id": max_id, "updates": updates, "data_version": data_version}
+
+            self._frames.move_to_end(key)
+            while len(self._frames) > MAX_CACHED_FRAMES:
+                self._frames.popitem(last=False)
+
+        # Zaman penceresi 'now' ile kayar; pencereden çıkanları bellekte süz
+        if hours is not None and not df.empty:
+            cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime("%Y-%m-%d %H:%M:%S")
+            df = df[df["created_at"] >= cutoff]
+
+        # main() DataFrame'e kolon ekliyor, önbellekteki kopya bozulmasın
+        return df.reset_index(drop=True).copy()
+
+    def rollup(self, category: str, hours: int | None, granularity: str, **filters) -> pd.DataFrame:
+        """
+        Grafikler için (kova, kategori) serisi; satırlar pandas'a çekilip gruplanmaz.
+        filters (min_sentiment, max_sentiment, only_alerts) sadece analiz motoru
+        destekliyorsa (supports_filters) uygulanır.
+        """
+        if not self.storage.analytics.supports_filters:
+            filters = {}
+        columns, rows = self.storage.aggregate(category=category, hours=hours, granularity=granularity, **filters)
+        df = pd.DataFrame(rows, columns=columns)
+        df["bucket"] = pd.to_datetime(df["bucket"])
+        df["sentiment"] = df["sentiment_sum"] / df["sentiment_count"].where(df["sentiment_count"] > 0)
+        return df
+
+    def search(self, text: str, category: str, limit: int, offset: int) -> pd.DataFrame:
+        """news.db ve arşivdeki tüm haberlerde FTS5 araması (alaka sırasına göre, sayfalı)."""
+        if not build_fts_match(text):
+            return pd.DataFrame()
+        with self.lock:
+            rows = search_articles(self.conn, text, limit=limit, offset=offset, category=category)
+        df = pd.DataFrame(rows, columns=SEARCH_COLUMNS)
+        df["alerts"] = label_alerts(df)
+        return df
+
+
+@st.cache_resource
+def get_store() -> DashboardStore:
+    # Şema göçlerini (ör. alert_mask kolonu) dashboard açılırken de uygula
+    init_db().close()
+    return DashboardStore(DB_PATH)
+
+
+def load_data(
+    category: str = "all",
+    hours: int | None = 24,
+    limit: int = 500,
+    only_alerts: bool = False,
+) -> pd.DataFrame:
+    return get_store().load(category=category, hours=hours, limit=limit, only_alerts=only_alerts)
 
 
 def main():
@@ -139,11 +262,14 @@ def main():
         step=0.1,
     )
 
+    # Sadece alarm tetikleyenler: veritabanında alert_mask ile süzülür
+    only_alerts = st.sidebar.checkbox("Sadece uyarı tetikleyen haberler", value=False)
+
     st.sidebar.markdown("---")
     st.sidebar.caption("Veriler: news.db")
 
     # Veriyi yükle
-    df = load_data(category=category, hours=hours, limit=limit)
+    df = load_data(category=category, hours=hours, limit=limit, only_alerts=only_alerts)
 
     if df.empty:
         st.warning("Bu filtrelere uyan haber bulunamadı.")
@@ -152,24 +278,11 @@ def main():
     # Sentiment filtrele
     df = df[(df["sentiment"] >= min_sentiment) & (df["sentiment"] <= max_sentiment)]
 
-    # ALERT etiketlerini ekle
-    df["alerts"] = df.apply(
-        lambda row: detect_alert_labels(row["title"], row["summary"]),
-        axis=1,
-    )
-
-    # Sidebar'a "sadece alert'li" filtresi
-    only_alerts = st.sidebar.checkbox("Sadece uyarı tetikleyen haberler", value=False)
-    if only_alerts:
-        df = df[df["alerts"] != ""]
+    # ALERT etiketleri load_data'da (vektörize, sadece yeni satırlar için) eklendi
 
     # ==== ÖZET ====
     st.subheader("Özet")
 
-    # Tarih (sadece gün) kolonu
-    df["date"] = pd.to_datetime(df["created_at"]).dt.date
-
-
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("Toplam haber", len(df))
@@ -179,20 +292,33 @@ def main():
         st.metric("Kategori sayısı", df["category"].nunique())
 
     # ==== ZAMAN İÇİNDE ORTALAMA DUYGU SKORU ====
-    # created_at kolonundan gün bazlı tarih çıkar
-    df["date"] = pd.to_datetime(df["created_at"]).dt.date
+    # Grafikler yüklenen satırlardan değil, saatlik / günlük özet tablolarından
+    # çizilir: seçilen aralıktaki tüm haberleri kapsar (limit uygulanmaz)
+    granularity = "hour" if hours is not None and hours <= 72 else "day"
+    store = get_store()
+    rollup = store.rollup(
+        category=category,
+        hours=hours,
+        granularity=granularity,
+        min_sentiment=min_sentiment,
+        max_sentiment=max_sentiment,
+        only_alerts=only_alerts,
+    )
 
     st.subheader("Zaman içinde ortalama duygu skoru")
+    if store.storage.analytics.supports_filters:
+        st.caption(
+            f"{'Saatlik' if granularity == 'hour' else 'Günlük'} seri ({store.storage.analytics.name}), "
+            "seçilen aralık ve filtrelere uyan tüm haberler (limit uygulanmaz)"
+        )
+    else:
+        st.caption(
+            f"{'Saatlik' if granularity == 'hour' else 'Günlük'} özet, seçilen aralıktaki tüm haberler "
+            "(limit, duygu ve uyarı filtreleri grafiklere uygulanmaz)"
+        )
 
-    sent_by_day = (
-        df.groupby(["date", "category"])["sentiment"]
-        .mean()
-        .reset_index()
-        .sort_values("date")
-    )
-
-    if not sent_by_day.empty:
-        pivot = sent_by_day.pivot(index="date", columns="category", values="sentiment")
+    if not rollup.empty:
+        pivot = rollup.pivot(index="bucket", columns="category", values="sentiment")
         st.line_chart(pivot)
     else:
         st.info("Seçilen filtrelerle zaman serisi grafiği için yeterli veri yok.")
@@ -200,7 +326,7 @@ def main():
 
     # Kategori dağılımı
     st.subheader("Kategori dağılımı")
-    cat_counts = df["category"].value_counts().rename_axis("category").reset_index(name="count")
+    cat_counts = rollup.groupby("category", as_index=False)["count"].sum()
     st.bar_chart(data=cat_counts, x="category", y="count")
 
     # Sentiment dağılımı (basit histogram)
@@ -260,12 +386,18 @@ def main():
     search_text = st.sidebar.text_input("Başlık / özet içinde ara", value="")
 
     if search_text:
-        s = search_text.lower()
-        df = df[
-            df["title"].str.lower().str.contains(s, na=False)
-            | df["summary"].str.lower().str.contains(s, na=False)
-        ]
-
+        # Arama yüklenen satırlarla sınırlı değil, news.db'deki tüm haberlerde (FTS5) yapılır
+        st.subheader(f"Arama sonuçları: {search_text}")
+        page_size = 50
+        page = st.number_input("Sayfa", min_value=1, value=1, step=1)
+        results = get_store().search(
+            search_text, category=category, limit=page_size, offset=(int(page) - 1) * page_size
+        )
+        if results.empty:
+            st.info("Aramaya uyan haber bulunamadı.")
+        else:
+            results["link"] = results["link"].apply(lambda x: f"[Aç]({x})" if isinstance(x, str) else x)
+            st.dataframe(results[columns_to_show], width="stretch")
 
 
 if __name__ == "__main__":
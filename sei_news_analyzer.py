@@ -1,7 +1,26 @@
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Iterable
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+import bisect
+import calendar
+import hashlib
+import heapq
+import queue
+import random
+import threading
+import zlib
+import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+import os
+import socket
 import ssl
 import certifi  # ssl sertifika sorun çözücü
 import sqlite3
@@ -26,6 +45,101 @@ USE_ADVANCED_SENTIMENT = False  # True yaparsan gelişmiş modeli kullanır (kur
 USE_TELEGRAM_ALERTS = False  # kullanmak istersen True yap
 TELEGRAM_BOT_TOKEN = "BURAYA_BOT_TOKEN"
 TELEGRAM_CHAT_ID = "BURAYA_CHAT_ID"
+TELEGRAM_API_URL = "https://api.telegram.org"  # Test için yerel bir sunucuya yönlendirilebilir
+
+# Alarm gönderimi arka planda, sınırlı bir kuyruktan yapılır (poll döngüsü beklemez)
+ALERT_QUEUE_SIZE = 1000  # Kuyruk doluysa yeni alarmlar düşürülür ve sayılır
+ALERT_WORKERS = 2  # Gönderici thread sayısı
+ALERT_BATCH_MAX = 10  # Tek Telegram mesajında birleştirilecek en fazla alarm
+ALERT_BATCH_WAIT = 2.0  # Birleştirmek için ilk alarmdan sonra beklenecek süre (saniye)
+ALERT_MAX_RETRIES = 5  # 429 / 5xx / bağlantı hatasında en fazla tekrar
+ALERT_RETRY_BASE = 1.0  # Üstel bekleme tabanı (saniye): 1, 2, 4, ...
+ALERT_RETRY_MAX = 60.0  # Tek bir beklemenin üst sınırı (saniye)
+TELEGRAM_MAX_MESSAGE = 4096  # Telegram mesaj uzunluğu sınırı
+
+FETCH_MAX_WORKERS = 16  # Aynı anda kaç kaynağın çekileceği
+FETCH_TIMEOUT = 10.0  # Tek bir kaynak için zaman aşımı (saniye)
+FETCH_CYCLE_DEADLINE = 45.0  # Bir döngüde tüm kaynaklar için toplam süre sınırı (saniye)
+FETCH_STATUS_TIMEOUT = -1  # Döngü süre sınırını aşan kaynağın durumu (HTTP kodu yerine; 0 = bağlantı hatası)
+USE_CONDITIONAL_GET = True  # ETag / Last-Modified ile değişmeyen kaynakları tekrar indirme
+
+# Aşama süreleri / sayaçlar; canlı modda yerel HTTP uç noktasından okunur
+USE_METRICS_SERVER = True  # http://METRICS_HOST:METRICS_PORT/metrics (Prometheus metin biçimi)
+METRICS_HOST = "127.0.0.1"  # Sadece yerel makineden erişilsin
+METRICS_PORT = 9464
+
+# Kaynak başına uyarlanan kontrol aralığı (sabit poll_interval yerine)
+USE_ADAPTIVE_SCHEDULER = True  # False yaparsan tüm kaynaklar her poll_interval'da birlikte çekilir
+SCHEDULER_MIN_INTERVAL = 15.0  # Bir kaynağın en sık kontrol aralığı (saniye)
+SCHEDULER_MAX_INTERVAL = 900.0  # Haber gelmeyen kaynakların en seyrek kontrol aralığı (saniye)
+SCHEDULER_TARGET_NEW_ITEMS = 0.5  # Kontrol başına hedeflenen yeni haber (0.5 = yayın aralığının yarısında bir kontrol)
+SCHEDULER_RATE_SMOOTHING = 0.3  # Yeni haber hızının üstel ortalama ağırlığı
+SCHEDULER_JITTER = 0.1  # Aralığa eklenecek rastgele sapma (±%10), istekler kümelenmesin
+SCHEDULER_COALESCE = 1.0  # Bu kadar saniye içinde vadesi gelen kaynaklar aynı turda çekilir
+
+# Canlı modda çekme -> analiz -> kayıt aşamaları sınırlı kuyruklarla eşzamanlı çalışır
+USE_STREAMING_PIPELINE = True  # False yaparsan her tur sırayla: hepsini çek, hepsini analiz et, kaydet
+PIPELINE_QUEUE_SIZE = 32  # Aşamalar arası kuyruk kapasitesi (kaynak partisi); dolunca önceki aşama bekler
+PIPELINE_ANALYZE_WORKERS = 1  # Analiz thread sayısı (büyük partiler yine süreç havuzuna gider)
+PIPELINE_STORE_BATCH = 500  # Kayıt aşamasında tek transaction'da birleştirilecek en fazla haber
+
+# Paylaşımlı toplama ("worker" modu): kaynaklar canlı işçiler arasında
+# kaynak adının tutarlı özetine göre bölünür, kalp atışı news.db'de tutulur
+SHARD_HEARTBEAT_INTERVAL = 10.0  # İşçinin kalp atışı ve paylaşım kontrolü aralığı (saniye)
+SHARD_LEASE_SECONDS = 30.0  # Bu süredir kalp atışı olmayan işçi ölü sayılır, kaynakları diğerlerine geçer
+SHARD_VIRTUAL_NODES = 64  # Tutarlı özet halkasında işçi başına sanal düğüm (dağılım dengesi)
+SHARD_DB_PROFILE = "wal"  # Birden çok süreç aynı news.db'ye yazar: WAL + busy_timeout
+
+# SQLite ayar profili: "default" = SQLite varsayılanı,
+# "wal" = WAL journal + synchronous=NORMAL (dashboard okurken poller yazabilir)
+DB_PRAGMA_PROFILE = "default"
+DB_PRAGMA_PROFILES: Dict[str, List[str]] = {
+    "default": [],
+    "wal": [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA busy_timeout=5000",
+    ],
+}
+
+ANALYSIS_MAX_WORKERS = min(4, os.cpu_count() or 1)  # Duygu analizi için süreç sayısı (1 = her zaman seri)
+ANALYSIS_CHUNK_SIZE = 250  # Her sürece tek seferde gönderilecek haber sayısı
+ANALYSIS_PARALLEL_MIN_BATCH = 500  # Bundan küçük partilerde havuz maliyeti baskın, seri çalış
+
+# Aynı metin (farklı linklerle) tekrar skorlanmasın diye analiz önbelleği
+ANALYZER_VERSION = 1  # Analiz mantığı değişince artır, eski önbellek geçersiz olur
+ANALYSIS_CACHE_SIZE = 50_000  # Bellekteki LRU önbelleğin en fazla girdi sayısı
+USE_PERSISTENT_ANALYSIS_CACHE = True  # Önbelleği news.db'de de tut (yeniden başlatmada kaybolmasın)
+
+USE_NEAR_DUP_CLUSTERING = True  # Aynı haberin farklı kaynaklardaki kopyalarını kümele
+NEAR_DUP_NUM_PERM = 64  # MinHash imza uzunluğu
+NEAR_DUP_BANDS = 16  # LSH bant sayısı (16 x 4 satır -> ~0.5 benzerlikte aday)
+NEAR_DUP_THRESHOLD = 0.5  # Aynı küme sayılmak için tahmini Jaccard benzerliği
+NEAR_DUP_MAX_CANDIDATES = 20  # Bant başına bakılacak en yeni aday sayısı
+NEAR_DUP_MIN_TOKENS = 4  # Bundan kısa metinler kümelenmez
+
+DEDUP_MAX_SIZE = 200_000  # Bellekte tutulacak en fazla link sayısı
+DEDUP_MAX_AGE_HOURS = 72  # Bu süredir görülmeyen linkler bellekten düşer (DB'de UNIQUE korur)
+DEDUP_HASH_LINKS = True  # Linklerin kendisi yerine 8 byte'lık özetlerini tut (RAM tasarrufu)
+
+EXPORT_BATCH_SIZE = 10_000  # Export'ta fetchmany parti boyutu (Parquet row group / Arrow batch boyutu)
+
+DB_POOL_SIZE = 4  # Okuma bağlantı havuzunun en fazla bağlantı sayısı (dashboard thread'leri, raporlar)
+ANALYTICS_ENGINE = "sqlite"  # "duckdb": rapor / dashboard toplama sorguları DuckDB aynasında (pip install duckdb)
+# DuckDB aynası yeni satırları id filigranıyla alır; yerinde güncellemeden (backfill) sonra
+# ilk sorguda baştan kurulur, aradan elle silinen satırlar için 'mirror rebuild' gerekir
+SUMMARY_TOP_K = 50  # Özet istatistiklerinde tutulan en negatif haber sayısı (report 10'unu gösterir)
+
+# Zaman bölümlü arşiv: eski aylar news.db'nin yanındaki archive/articles-YYYY-MM.db dosyalarına taşınır.
+# İsteğe bağlı ('archive' modu ya da ARCHIVE_COMPACT_INTERVAL > 0): her bölümün kendi FTS indeksi vardır
+# (search hepsini birleştirir), taşınan linkler news.db'deki archived_links'te tekrar kontrolüne girer.
+ARCHIVE_DIR_NAME = "archive"  # news.db ile aynı klasörde
+ARCHIVE_HOT_MONTHS = 3  # news.db'de kalacak ay sayısı (içinde bulunulan ay dahil), 0 = arşivleme kapalı
+ARCHIVE_RETENTION_MONTHS = 0  # Bundan eski aylar tamamen silinir (arşiv dahil), 0 = sonsuza kadar sakla
+ARCHIVE_COMPACT_INTERVAL = 0  # Canlı modda arka plan arşivleme / sıkıştırma aralığı (saniye, ör. 6 * 3600), 0 = kapalı
+ARCHIVE_BATCH_SIZE = 5000  # Taşımada tek transaction'daki satır; kayıt thread'i en fazla bir parti bekler
+ARCHIVE_VACUUM_FREE_RATIO = 0.2  # news.db'de boş sayfa oranı bunu aşınca VACUUM
+ARCHIVE_SHARD_KEY = "archive-compaction"  # Paylaşımlı modda sıkıştırmayı halkada bu anahtarın sahibi çalıştırır
 
 
 ALERT_KEYWORDS = {
@@ -57,17 +171,208 @@ ALERT_KEYWORDS = {
     ],
 }
 
-def detect_alert_labels(title: str, summary: str) -> str:
+# Kategori keyword'leri, öncelik sırasıyla (ilk eşleşen kategori kazanır)
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    # 1) Savaş / kriz / afet
+    "conflict/crisis": [
+        # EN
+        "war", "invasion", "offensive", "airstrike", "air strike",
+        "missile", "rocket attack", "shelling", "frontline",
+        "military clash", "gunmen", "mass abduction", "kidnapped",
+        "hostage", "terrorist", "suicide attack", "bombing",
+        "explosion", "blast", "attack", "conflict", "clashes",
+        "earthquake", "aftershock", "tremor", "quake",
+        "flood", "wildfire", "hurricane",
+        # TR
+        "savaş", "çatışma", "baskın", "askeri operasyon",
+        "roket", "füze", "bombalı saldırı", "bombalı",
+        "patlama", "terör", "rehine", "kaçırıldı", "kaçırılan",
+        "deprem", "artçı", "sel", "yangın", "fırtına",
+    ],
+    # 2) Siyaset
+    "politics": [
+        # EN
+        "election", "elections", "vote", "voting", "ballot",
+        "government", "minister", "prime minister",
+        "president", "parliament", "senate", "congress",
+        "coalition", "opposition", "ruling party",
+        "politician", "political",
+        # TR
+        "seçim", "oy", "sandık", "hükümet", "hükümeti",
+        "bakan", "bakanlık", "başbakan", "cumhurbaşkanı",
+        "meclis", "parlamento", "milletvekili",
+        "koalisyon", "muhalefet", "iktidar", "siyasi", "siyaset",
+    ],
+    # 3) Ekonomi
+    "economy": [
+        # EN
+        "economy", "economic", "recession", "growth",
+        "inflation", "interest rate", "interest rates",
+        "stock market", "stocks", "shares", "bond",
+        "currency", "exchange rate", "dollar", "euro",
+        "unemployment", "wage", "salary", "budget", "debt",
+        # TR
+        "ekonomi", "ekonomik", "resesyon", "büyüme",
+        "enflasyon", "faiz", "faiz oranı", "faiz oranları",
+        "borsa", "hisse", "tahvil",
+        "kur", "döviz", "dolar", "euro",
+        "işsizlik", "maaş", "ücret", "bütçe", "borç",
+        "zam", "indirim", "piyasa", "fiyat artışı",
+    ],
+    # 4) Teknoloji
+    "technology": [
+        # EN
+        "ai", "artificial intelligence", "machine learning",
+        "app", "application", "software", "hardware",
+        "social media", "platform", "startup", "tech company",
+        "cyber", "hacker", "data breach", "privacy",
+        "smartphone", "device", "robot",
+        # TR
+        "yapay zeka", "makine öğrenmesi",
+        "uygulama", "yazılım", "donanım",
+        "sosyal medya", "platform", "teknoloji", "teknolojik",
+        "siber", "siber saldırı", "veri ihlali", "gizlilik",
+        "telefon", "akıllı telefon", "cihaz", "robot",
+    ],
+    # 5) Toplum / sosyal konular
+    "society": [
+        # EN
+        "school", "university", "student", "students",
+        "teacher", "family", "families", "children", "kids",
+        "gender", "violence", "domestic violence",
+        "rights", "human rights", "protest", "demonstration",
+        "police", "crime", "murder", "shooting",
+        # TR
+        "okul", "üniversite", "öğrenci", "öğretmen",
+        "aile", "çocuk", "kadın", "erkek",
+        "şiddet", "aile içi şiddet",
+        "hak", "insan hakları", "protesto", "gösteri",
+        "polis", "suç", "cinayet", "saldırı",
+    ],
+}
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick tabanlı çoklu keyword eşleştirici.
+
+    Tüm gruplardaki keyword'ler tek bir otomatta derlenir; metin karakter
+    karakter bir kez taranır ve eşleşen tüm grup anahtarları döner.
+    Eşleştirme `k in text` ile aynıdır (alt dize, kelime sınırı yok).
+    Geçişler önceden tam DFA tablosuna açılır, tarama sırasında
+    failure zinciri yürünmez.
+    """
+
+    def __init__(self, groups: Dict[object, Iterable[str]]):
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[set] = [set()]
+
+        for key, keywords in groups.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                state = 0
+                for ch in keyword:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        goto.append({})
+                        outputs.append(set())
+                        nxt = len(goto) - 1
+                        goto[state][ch] = nxt
+                    state = nxt
+                outputs[state].add(key)
+
+        # BFS ile failure linkleri ve tam geçiş tablosu
+        transitions: List[Dict[str, int]] = [dict() for _ in goto]
+        transitions[0] = dict(goto[0])
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        i = 0
+        while i < len(queue):
+            state = queue[i]
+            i += 1
+            outputs[state] |= outputs[fail[state]]
+            table = dict(transitions[fail[state]])
+            table.update(goto[state])
+            transitions[state] = table
+            for ch, nxt in goto[state].items():
+                fail[nxt] = transitions[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+
+        self._transitions = transitions
+        self._outputs = {
+            state: frozenset(keys) for state, keys in enumerate(outputs) if keys
+        }
+
+    def match(self, text: str) -> set:
+        """Metinde (küçük harfe çevrilmiş olmalı) eşleşen grup anahtarlarını döner."""
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        hits = []
+        for ch in text:
+            state = transitions[state].get(ch, 0)
+            if state in outputs:
+                hits.append(state)
+
+        matched: set = set()
+        for state in hits:
+            matched |= outputs[state]
+        return matched
+
+
+# Kategoriler ve alarm etiketleri tek otomatta; anahtarlar (tür, isim)
+KEYWORD_MATCHER = KeywordMatcher(
+    {
+        **{("category", name): kws for name, kws in CATEGORY_KEYWORDS.items()},
+        **{("alert", label): kws for label, kws in ALERT_KEYWORDS.items()},
+    }
+)
+
+
+def match_article_text(title: str, summary: str) -> tuple[str, list[str]]:
+    """
+    Başlık + özet metnini bir kez tarar.
+    (kategori, tetiklenen alarm etiketleri) döner; kategori CATEGORY_KEYWORDS
+    öncelik sırasına, etiketler ALERT_KEYWORDS sırasına göredir.
+    """
     text = (str(title) + " " + str(summary)).lower()
-    labels: list[str] = []
+    matched = KEYWORD_MATCHER.match(text)
+
+    category = "other"
+    for name in CATEGORY_KEYWORDS:
+        if ("category", name) in matched:
+            category = name
+            break
 
-    for label, keywords in ALERT_KEYWORDS.items():
-        if any(k.lower() in text for k in keywords):
-            labels.append(label)
+    alerts = [label for label in ALERT_KEYWORDS if ("alert", label) in matched]
+    return category, alerts
 
+
+def detect_alert_labels(title: str, summary: str) -> str:
+    _, labels = match_article_text(title, summary)
     return ", ".join(labels) if labels else ""
 
 
+# articles.alert_mask için her etiketin biti (ALERT_KEYWORDS sırasıyla).
+# Yeni etiketleri sona ekle; sıra değişirse "backfill all" çalıştır.
+ALERT_LABEL_BITS: Dict[str, int] = {label: 1 << i for i, label in enumerate(ALERT_KEYWORDS)}
+
+
+def alert_mask(labels: Iterable[str]) -> int:
+    mask = 0
+    for label in labels:
+        mask |= ALERT_LABEL_BITS.get(label, 0)
+    return mask
+
+
+def alert_labels_from_mask(mask: Optional[int]) -> list[str]:
+    if not mask:
+        return []
+    return [label for label, bit in ALERT_LABEL_BITS.items() if mask & bit]
+
+
 
 @dataclass
 class Article:
@@ -78,6 +383,51 @@ class Article:
     source: str
     sentiment: Optional[float] = None
     category: Optional[str] = None
+    alerts: Optional[List[str]] = None
+    cluster_id: Optional[int] = None
+
+
+@dataclass
+class FeedCacheEntry:
+    """Bir kaynağın HTTP doğrulayıcıları (ETag / Last-Modified) ve sayaçları."""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    last_size: int = 0  # son tam indirmenin boyutu (byte)
+    last_status: int = 0
+    hits: int = 0  # 304 Not Modified sayısı
+    bytes_saved: int = 0
+    max_age: Optional[float] = None  # Cache-Control max-age / Expires (saniye), zamanlayıcı için
+
+    def apply(self, fetch: "FeedFetch") -> None:
+        """
+        download_feed sonucunu girdiye yazar. Ana thread'de, sadece sonucu
+        kullanılan indirmeler için çağrılır: döngü süresini aşıp atılan bir
+        indirmenin doğrulayıcıları yazılırsa sonraki kontrol 304 alır ve
+        o haberler hiç okunmaz.
+        """
+        self.last_status = fetch.status
+        if fetch.status <= 0:
+            return
+        self.max_age = fetch.max_age
+        if fetch.status == 304:
+            self.hits += 1
+            self.bytes_saved += self.last_size
+        elif fetch.feed is not None:
+            self.etag = fetch.etag
+            self.last_modified = fetch.last_modified
+            self.last_size = fetch.size
+
+
+@dataclass
+class FeedFetch:
+    """Bir kaynağın tek indirmesinin sonucu (download_feed)."""
+    status: int  # HTTP durum kodu, 0 = bağlantı hatası, FETCH_STATUS_TIMEOUT = süre sınırı aşıldı
+    feed: object = None  # feedparser sonucu; 304 ya da hata durumunda None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    size: int = 0  # indirilen gövde (byte)
+    max_age: Optional[float] = None
 
 
 # RSS kaynaklarını burada tanımlıyoruz
@@ -94,365 +444,3887 @@ RSS_FEEDS: Dict[str, str] = {
 
 
 
-# Aynı haberi iki kez işlememek için linkleri burada tutacağız
-seen_links: set[str] = set()
+class DedupIndex:
+    """
+    Görülen linkler için sınırlı boyutlu, zaman pencereli bellek içi indeks.
 
-DB_PATH = Path(__file__).parent / "news.db"
+    - Linkler son görülme zamanına göre sıralı tutulur (OrderedDict).
+    - max_size aşılınca ya da max_age_hours boyunca görülmeyen linkler düşer.
+    - hash_links True ise link yerine 8 byte'lık blake2b özeti saklanır.
+    - Başlangıçta articles.link kolonundan ısıtılır, böylece yeniden
+      başlatmadan sonra kayıtlı haberler tekrar analiz edilmez.
+    """
 
+    def __init__(
+        self,
+        max_size: int = DEDUP_MAX_SIZE,
+        max_age_hours: float = DEDUP_MAX_AGE_HOURS,
+        hash_links: bool = DEDUP_HASH_LINKS,
+    ):
+        self.max_size = max_size
+        self.max_age = max_age_hours * 3600
+        self.hash_links = hash_links
+        self._items: "OrderedDict[object, float]" = OrderedDict()
 
-def init_db() -> sqlite3.Connection:
-    """
-    SQLite veritabanını hazırlar ve bağlantıyı döner.
-    news.db dosyası proje klasöründe oluşur.
-    """
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(
+    def _key(self, link: str):
+        if self.hash_links:
+            return hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest()
+        return link
+
+    def __contains__(self, link: str) -> bool:
+        return self._key(link) in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def add(self, link: str, seen_at: Optional[float] = None) -> None:
+        key = self._key(link)
+        self._items[key] = time.time() if seen_at is None else seen_at
+        self._items.move_to_end(key)
+        self._evict()
+
+    def check_and_add(self, link: str) -> bool:
         """
-        CREATE TABLE IF NOT EXISTS articles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT,
-            summary TEXT,
-            link TEXT UNIQUE,
-            published TEXT,
-            source TEXT,
-            sentiment REAL,
-            category TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        Link daha önce görüldüyse True döner.
+        Her iki durumda da link'in son görülme zamanı güncellenir;
+        kaynakta durduğu sürece link bellekten düşmez.
+        """
+        key = self._key(link)
+        known = key in self._items
+        self._items[key] = time.time()
+        self._items.move_to_end(key)
+        if not known:
+            self._evict()
+        return known
+
+    def _evict(self) -> None:
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+        cutoff = time.time() - self.max_age
+        while self._items:
+            oldest_key = next(iter(self._items))
+            if self._items[oldest_key] >= cutoff:
+                break
+            del self._items[oldest_key]
+
+    def warm_from_db(self, conn: sqlite3.Connection) -> int:
+        """
+        Son kaydedilen max_size linki (created_at zamanıyla) indekse yükler.
+        Yüklenen link sayısını döner.
+        """
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT link, created_at FROM articles WHERE link IS NOT NULL ORDER BY id DESC LIMIT ?",
+            (self.max_size,),
         )
+        # En eskiden en yeniye ekle ki sıralama korunsun
+        return self.warm(reversed(cur.fetchall()))
+
+    def warm(self, rows: Iterable[tuple[str, object]]) -> int:
         """
-    )
-    conn.commit()
-    return conn
+        (anahtar, created_at) satırlarını eskiden yeniye sırayla indekse yükler;
+        görülme zamanı created_at (UTC) olur. İndeksteki anahtar sayısını döner.
+        """
+        now = time.time()
+        for link, created_at in rows:
+            try:
+                seen_at = datetime.strptime(str(created_at), "%Y-%m-%d %H:%M:%S").replace(
+                    tzinfo=timezone.utc
+                ).timestamp()
+            except ValueError:
+                seen_at = now
+            key = self._key(link)
+            self._items[key] = seen_at
+            self._items.move_to_end(key)
+
+        self._evict()
+        return len(self._items)
 
-def print_db_summary() -> None:
+
+def link_hash(link: str) -> int:
+    """archived_links anahtarı: linkin 8 baytlık blake2b özeti (işaretli tamsayı)."""
+    return int.from_bytes(hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+
+def known_links_in_db(conn: sqlite3.Connection, links: Iterable[str]) -> set[str]:
     """
-    Veritabanı hakkında basit bir özet basar:
-    - Toplam haber sayısı
-    - Farklı kaynak sayısı
-    - İlk ve son kayıt tarihi
+    Verilen linklerden veritabanında zaten kayıtlı olanları döner.
+    Bellek indeksinden düşmüş linkler için tek sorgu ile son kontrol
+    (articles.link UNIQUE indeksi kullanılır). news.db'de olmayanlar
+    arşive taşınmış olabilir: archived_links'te özetleriyle aranır.
     """
-    conn = init_db()
+    links = list(links)
+    known: set[str] = set()
     cur = conn.cursor()
+    chunk_size = 500  # SQLite parametre sınırının altında kal
+    for i in range(0, len(links), chunk_size):
+        chunk = links[i:i + chunk_size]
+        placeholders = ",".join("?" * len(chunk))
+        cur.execute(f"SELECT link FROM articles WHERE link IN ({placeholders})", chunk)
+        known.update(row[0] for row in cur.fetchall())
 
-    cur.execute("SELECT COUNT(*) FROM articles")
-    total = cur.fetchone()[0] or 0
+    hashes = {link_hash(link): link for link in links if link not in known}
+    keys = list(hashes)
+    for i in range(0, len(keys), chunk_size):
+        chunk = keys[i:i + chunk_size]
+        placeholders = ",".join("?" * len(chunk))
+        cur.execute(f"SELECT link_hash FROM archived_links WHERE link_hash IN ({placeholders})", chunk)
+        known.update(hashes[row[0]] for row in cur.fetchall())
+    return known
 
-    cur.execute("SELECT COUNT(DISTINCT source) FROM articles")
-    sources = cur.fetchone()[0] or 0
 
-    cur.execute("SELECT MIN(created_at), MAX(created_at) FROM articles")
-    earliest, latest = cur.fetchone()
+# Aynı haberi iki kez işlememek için linkleri burada tutacağız
+seen_links = DedupIndex()
+# Akış boru hattında indeksi birden çok fetch thread'i kullanır
+seen_links_lock = threading.Lock()
 
-    print("=== Veritabanı Özeti ===")
-    print(f"Toplam kayıtlı haber : {total}")
-    print(f"Farklı kaynak sayısı : {sources}")
-    print(f"İlk kayıt tarihi     : {earliest}")
-    print(f"Son kayıt tarihi     : {latest}")
-    print()
+# Koşullu GET için kaynak başına önbellek (url -> FeedCacheEntry)
+feed_cache: Dict[str, FeedCacheEntry] = {}
 
-    conn.close()
 
-def print_most_negative(limit: int = 10) -> None:
+# Histogram kova sınırları (saniye): milisaniyelik DB yazımından yavaş kaynaklara
+METRIC_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Yayından kayda gecikme dakikalar / saatler mertebesinde, ayrı kovalar
+METRIC_CUSTOM_BUCKETS = {
+    "sei_ingest_latency_seconds": (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 21600.0, 86400.0),
+}
+
+METRIC_HELP = {
+    "sei_stage_seconds": ("histogram", "Boru hattı aşaması başına süre"),
+    "sei_fetch_seconds": ("histogram", "Kaynak başına indirme süresi"),
+    "sei_fetch_total": ("counter", "Kaynak başına indirme sonucu"),
+    "sei_articles_total": ("counter", "Aşama başına haber sayısı"),
+    "sei_analysis_cache_total": ("counter", "Analiz önbelleği isabet / ıska"),
+    "sei_alerts_total": ("counter", "Alarm gönderim olayları"),
+    "sei_alert_queue_depth": ("gauge", "Alarm kuyruğundaki bekleyen alarm"),
+    "sei_pipeline_queue_depth": ("gauge", "Akış boru hattı kuyruğundaki bekleyen parti"),
+    "sei_pipeline_in_flight": ("gauge", "Boru hattında işlenmekte olan kaynak sayısı"),
+    "sei_pipeline_backpressure_seconds_total": ("counter", "Dolu kuyruk yüzünden aşamaların bekleme süresi"),
+    "sei_ingest_latency_seconds": ("histogram", "Haberin yayınından / indirilmesinden DB kaydına gecikme"),
+}
+
+
+class Metrics:
     """
-    Veritabanındaki en negatif (en düşük sentiment) haberleri listeler.
+    Thread-safe sayaç, gauge ve histogramlar (Prometheus metin biçimi).
+
+    Etiketler anahtar kelime argümanı olarak verilir:
+        metrics.inc("sei_fetch_total", feed="BBC World", status="200")
+        with metrics.timer("sei_stage_seconds", stage="db_insert"): ...
+    Histogramlar kova sayılarını, toplamı ve en büyük değeri tutar.
     """
-    conn = init_db()
-    cur = conn.cursor()
 
-    cur.execute(
-        """
-        SELECT title, source, published, sentiment, category, link
-        FROM articles
-        WHERE sentiment IS NOT NULL
-        ORDER BY sentiment ASC
-        LIMIT ?
-        """,
-        (limit,),
-    )
+    def __init__(self, buckets: tuple = METRIC_BUCKETS, custom_buckets: Optional[Dict[str, tuple]] = None):
+        self.buckets = buckets
+        self.custom_buckets = dict(METRIC_CUSTOM_BUCKETS if custom_buckets is None else custom_buckets)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, float] = {}
+        self._histograms: Dict[tuple, dict] = {}
+        self._collectors: List = []
 
-    rows = cur.fetchall()
-    if not rows:
-        print("Veritabanında kayıtlı haber yok veya sentiment verisi yok.")
-        conn.close()
-        return
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> tuple:
+        return (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
 
-    print(f"=== En negatif {len(rows)} haber ===")
-    for i, (title, source, published, sentiment, category, link) in enumerate(rows, start=1):
-        print("-" * 80)
-        print(f"#{i}")
-        print(f"Kaynak   : {source}")
-        print(f"Tarih    : {published}")
-        print(f"Kategori : {category}")
-        print(f"Duygu    : {sentiment:.3f}")
-        print(f"Başlık   : {title}")
-        print(f"Link     : {link}")
-    print()
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
 
-    conn.close()
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(name, labels)] = value
 
-def print_recent_by_category(category: str = "conflict", hours: int = 24, limit: int = 20) -> None:
-    """
-    Son X saatte eklenmiş, belirtilen kategoriye ait haberleri
-    en negatiften başlayarak listeler.
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            h = self._histograms.get(key)
+            if h is None:
+                buckets = self.custom_buckets.get(name, self.buckets)
+                h = self._histograms[key] = {
+                    "buckets": buckets, "counts": [0] * len(buckets), "count": 0, "sum": 0.0, "max": 0.0,
+                }
+            for i, bound in enumerate(h["buckets"]):
+                if seconds <= bound:
+                    h["counts"][i] += 1
+            h["count"] += 1
+            h["sum"] += seconds
+            h["max"] = max(h["max"], seconds)
 
-    category:
-      - 'conflict', 'economy', 'politics', 'technology', 'other'
-      - veya 'all' → kategori filtrelemez
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
 
-    hours:
-      - Kaç saat geriye bakılacağı (created_at alanına göre)
-    """
-    conn = init_db()
-    cur = conn.cursor()
+    def register_collector(self, collector) -> None:
+        """Okumadan hemen önce çağrılacak fonksiyon (ör. kuyruk derinliği gauge'u)."""
+        self._collectors.append(collector)
 
-    modifier = f"-{hours} hours"
+    def unregister_collector(self, collector) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
 
-    cur.execute(
-        """
-        SELECT title, source, published, sentiment, category, link, created_at
-        FROM articles
-        WHERE (? = 'all' OR category = ?)
-          AND created_at >= datetime('now', ?)
-          AND sentiment IS NOT NULL
-        ORDER BY sentiment ASC
-        LIMIT ?
-        """,
-        (category, category, modifier, limit),
-    )
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._histograms.clear()
 
-    rows = cur.fetchall()
-    if not rows:
-        print(f"Son {hours} saatte bu kritere uyan haber yok. (kategori: {category})")
-        conn.close()
-        return
+    def snapshot(self) -> dict:
+        """JSON'a çevrilebilir kopya: stats modu ve testler için."""
+        for collector in self._collectors:
+            collector(self)
+        with self._lock:
+            values = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in self._values.items()
+            ]
+            histograms = [
+                {"name": name, "labels": dict(labels), **h, "buckets": list(h["buckets"]), "counts": list(h["counts"])}
+                for (name, labels), h in self._histograms.items()
+            ]
+        return {"values": values, "histograms": histograms}
 
-    print(f"=== Son {hours} saatin en negatif {len(rows)} haberi (kategori: {category}) ===")
-    for i, (title, source, published, sentiment, cat, link, created_at) in enumerate(rows, start=1):
-        print("-" * 80)
-        print(f"#{i}")
-        print(f"Kaynak     : {source}")
-        print(f"Kategori   : {cat}")
-        print(f"Duygu      : {sentiment:.3f}")
-        print(f"Yayın tarihi : {published}")
-        print(f"Kayıt tarihi : {created_at}")
-        print(f"Başlık     : {title}")
-        print(f"Link       : {link}")
-    print()
+    @staticmethod
+    def _format_labels(labels: Dict[str, str], extra: Optional[Dict[str, str]] = None) -> str:
+        items = list(labels.items()) + list((extra or {}).items())
+        if not items:
+            return ""
+        escaped = []
+        for k, v in items:
+            v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            escaped.append(f'{k}="{v}"')
+        return "{" + ",".join(escaped) + "}"
 
-    conn.close()
+    def render(self) -> str:
+        """Prometheus text exposition biçimi."""
+        snap = self.snapshot()
+        by_name: Dict[str, List[str]] = {}
 
-def export_to_csv(filename: str = "news_export.csv") -> None:
+        for v in snap["values"]:
+            by_name.setdefault(v["name"], []).append(f"{v['name']}{self._format_labels(v['labels'])} {v['value']:g}")
+
+        for h in snap["histograms"]:
+            lines = by_name.setdefault(h["name"], [])
+            for bound, count in zip(h["buckets"], h["counts"]):
+                lines.append(f"{h['name']}_bucket{self._format_labels(h['labels'], {'le': f'{bound:g}'})} {count}")
+            lines.append(f"{h['name']}_bucket{self._format_labels(h['labels'], {'le': '+Inf'})} {h['count']}")
+            lines.append(f"{h['name']}_sum{self._format_labels(h['labels'])} {h['sum']:.6f}")
+            lines.append(f"{h['name']}_count{self._format_labels(h['labels'])} {h['count']}")
+
+        out = []
+        for name in sorted(by_name):
+            kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(by_name[name])
+        return "\n".join(out) + "\n"
+
+
+metrics = Metrics()
+
+
+def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT) -> Optional[ThreadingHTTPServer]:
     """
-    Tüm kayıtlı haberleri bir CSV dosyasına aktarır.
-    Dosya proje klasöründe oluşur.
+    /metrics (Prometheus) ve /metrics.json (stats modu) sunan arka plan
+    HTTP sunucusunu başlatır. Port doluysa uyarı basar ve None döner.
     """
-    conn = init_db()
-    cur = conn.cursor()
 
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = metrics.render().encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body = json.dumps(metrics.snapshot()).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        print(f"[WARN] Metrik sunucusu başlatılamadı ({host}:{port}): {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def histogram_quantile(q: float, buckets: List[float], counts: List[int], total: int) -> float:
+    """Kümülatif kova sayılarından q. yüzdelik için üst sınır tahmini."""
+    if not total:
+        return 0.0
+    for bound, count in zip(buckets, counts):
+        if count >= q * total:
+            return bound
+    return float("inf")
+
+
+def print_stats(snapshot: dict) -> None:
+    """Metrik anlık görüntüsünü aşama / kaynak tablosu olarak basar."""
+    histograms = sorted(
+        snapshot["histograms"],
+        key=lambda h: (h["name"], -h["sum"]),
+    )
+    print(f"{'metrik':18s} {'etiket':28s} {'adet':>7} {'ort (ms)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9} {'toplam (s)':>10}")
+    for h in histograms:
+        label = ",".join(f"{v}" for v in h["labels"].values())
+        count = h["count"]
+        p50 = histogram_quantile(0.5, h["buckets"], h["counts"], count)
+        p95 = histogram_quantile(0.95, h["buckets"], h["counts"], count)
+        print(
+            f"{h['name'].replace('sei_', '').replace('_seconds', ''):18s} {label[:28]:28s} {count:>7} "
+            f"{h['sum'] / max(count, 1) * 1000:>9.1f} {p50 * 1000:>9.0f} {p95 * 1000:>9.0f} "
+            f"{h['max'] * 1000:>9.1f} {h['sum']:>10.2f}"
+        )
+    print()
+    for v in sorted(snapshot["values"], key=lambda v: (v["name"], sorted(v["labels"].items()))):
+        label = ",".join(f"{k}={val}" for k, val in v["labels"].items())
+        print(f"{v['name']:28s} {label:40s} {v['value']:>10g}")
+
+
+def print_live_stats(host: str = METRICS_HOST, port: int = METRICS_PORT) -> None:
+    """Çalışan canlı modun metrik uç noktasından okuyup basar."""
+    url = f"http://{host}:{port}/metrics.json"
+    try:
+        snapshot = requests.get(url, timeout=5).json()
+    except Exception as e:
+        print(f"[WARN] Metrikler okunamadı ({url}): {e}")
+        print("Canlı mod çalışıyor mu? (USE_METRICS_SERVER = True olmalı)")
+        return
+    print_stats(snapshot)
+
+DB_PATH = Path(__file__).parent / "news.db"
+DUCKDB_PATH = Path(__file__).parent / "news.duckdb"  # ANALYTICS_ENGINE = "duckdb" iken analiz aynası
+
+
+def init_db(profile: Optional[str] = None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    SQLite veritabanını hazırlar ve bağlantıyı döner.
+    news.db dosyası proje klasöründe oluşur.
+    profile verilmezse DB_PRAGMA_PROFILE kullanılır.
+    check_same_thread False ise bağlantı başka thread'lerden de kullanılabilir;
+    erişimi sıraya koymak çağıranın işidir (ör. AnalysisCache kilidi).
+    """
+    conn = sqlite3.connect(DB_PATH, check_same_thread=check_same_thread)
+    cur = conn.cursor()
+    for pragma in DB_PRAGMA_PROFILES.get(profile or DB_PRAGMA_PROFILE, []):
+        cur.execute(pragma)
     cur.execute(
         """
-        SELECT title, summary, link, published, source, sentiment, category, created_at
-        FROM articles
-        ORDER BY created_at DESC
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            summary TEXT,
+            link TEXT UNIQUE,
+            published TEXT,
+            source TEXT,
+            sentiment REAL,
+            category TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS feed_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            last_size INTEGER DEFAULT 0,
+            hits INTEGER DEFAULT 0,
+            bytes_saved INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.commit()
+    migrate_db(conn)
+    return conn
+
+
+# Özet (rollup) tabloları: granülerlik -> tablo ve zaman kovası biçimi
+ROLLUP_TABLES = {"hour": "rollup_hourly", "day": "rollup_daily"}
+ROLLUP_BUCKET_FORMATS = {"hour": "%Y-%m-%d %H:00:00", "day": "%Y-%m-%d"}
+# Skaler min()/max() NULL görünce NULL döner; coalesce ile boş tarafı yok say
+ROLLUP_TRIGGER_UPSERT = """
+            INSERT INTO {table}
+                (bucket, category, source, count, sentiment_count, sentiment_sum, sentiment_min, sentiment_max)
+            VALUES (
+                strftime('{fmt}', new.created_at), coalesce(new.category, ''), coalesce(new.source, ''),
+                1, new.sentiment IS NOT NULL, coalesce(new.sentiment, 0), new.sentiment, new.sentiment
+            )
+            ON CONFLICT (bucket, category, source) DO UPDATE SET
+                count = count + 1,
+                sentiment_count = sentiment_count + excluded.sentiment_count,
+                sentiment_sum = sentiment_sum + excluded.sentiment_sum,
+                sentiment_min = min(coalesce(sentiment_min, excluded.sentiment_min),
+                                    coalesce(excluded.sentiment_min, sentiment_min)),
+                sentiment_max = max(coalesce(sentiment_max, excluded.sentiment_max),
+                                    coalesce(excluded.sentiment_max, sentiment_max))"""
+
+
+# Şema göçleri: her eleman bir sürümdür ve sırası değişmemelidir.
+# Uygulanan son sürüm PRAGMA user_version içinde tutulur.
+SCHEMA_MIGRATIONS: List[List[str]] = [
+    # v1: dashboard, rapor ve export sorguları için indeksler
+    [
+        "CREATE INDEX IF NOT EXISTS idx_articles_created_at ON articles(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_category_created_at ON articles(category, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_sentiment ON articles(sentiment)",
+        "CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)",
+    ],
+    # v2: metin özetine göre kalıcı analiz önbelleği
+    [
+        """
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            text_hash TEXT PRIMARY KEY,
+            analyzer TEXT,
+            sentiment REAL,
+            category TEXT,
+            alerts TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ],
+    # v3: alarm etiketleri bitmask olarak saklanır (NULL = henüz hesaplanmadı)
+    [
+        lambda conn: add_column_if_missing(conn, "articles", "alert_mask", "INTEGER"),
+        "CREATE INDEX IF NOT EXISTS idx_articles_alerts_created_at "
+        "ON articles(created_at) WHERE alert_mask != 0",
+        lambda conn: backfill_alert_masks(conn, commit=False),
+    ],
+    # v4: başlık/özet için FTS5 tam metin indeksi, tetikleyicilerle senkron.
+    # Türkçe için ı/İ -> i katlanır, unicode61 remove_diacritics 2 ile
+    # ş/ç/ğ/ö/ü aksansız eşleşir ("savas" -> "savaş").
+    [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, summary, tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, title, summary)
+            VALUES (new.id, replace(replace(new.title, 'ı', 'i'), 'İ', 'i'), replace(replace(new.summary, 'ı', 'i'), 'İ', 'i'));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN
+            UPDATE articles_fts
+            SET title = replace(replace(new.title, 'ı', 'i'), 'İ', 'i'), summary = replace(replace(new.summary, 'ı', 'i'), 'İ', 'i')
+            WHERE rowid = new.id;
+        END
+        """,
+        "DELETE FROM articles_fts",
+        """
+        INSERT INTO articles_fts(rowid, title, summary)
+        SELECT id, replace(replace(title, 'ı', 'i'), 'İ', 'i'), replace(replace(summary, 'ı', 'i'), 'İ', 'i') FROM articles
+        """,
+    ],
+    # v5: yakın kopya kümeleri (MinHash + LSH indeksi)
+    [
+        lambda conn: add_column_if_missing(conn, "articles", "cluster_id", "INTEGER"),
+        "CREATE INDEX IF NOT EXISTS idx_articles_cluster_id ON articles(cluster_id)",
+        """
+        CREATE TABLE IF NOT EXISTS minhash_signatures (
+            seq INTEGER PRIMARY KEY,
+            doc_key INTEGER UNIQUE,
+            cluster_id INTEGER,
+            signature BLOB
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS minhash_bands (
+            band_key INTEGER,
+            seq INTEGER,
+            PRIMARY KEY (band_key, seq)
+        ) WITHOUT ROWID
+        """,
+    ],
+    # v6: artımlı export'lar için dosya başına son aktarılan id
+    [
+        """
+        CREATE TABLE IF NOT EXISTS export_state (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER,
+            rows INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ],
+    # v7: dashboard grafikleri için saatlik / günlük (kategori, kaynak) özetleri.
+    # Tetikleyici, save_articles'ın transaction'ı içinde sadece gerçekten
+    # eklenen satırlar için çalışır (INSERT OR IGNORE ile atlananlar sayılmaz).
+    [
+        *[
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                bucket TEXT NOT NULL,
+                category TEXT NOT NULL,
+                source TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                sentiment_count INTEGER NOT NULL DEFAULT 0,
+                sentiment_sum REAL NOT NULL DEFAULT 0,
+                sentiment_min REAL,
+                sentiment_max REAL,
+                PRIMARY KEY (bucket, category, source)
+            ) WITHOUT ROWID
+            """
+            for table in ROLLUP_TABLES.values()
+        ],
+        f"""
+        CREATE TRIGGER IF NOT EXISTS articles_rollup_insert AFTER INSERT ON articles BEGIN
+            {ROLLUP_TRIGGER_UPSERT.format(table=ROLLUP_TABLES["hour"], fmt=ROLLUP_BUCKET_FORMATS["hour"])};
+            {ROLLUP_TRIGGER_UPSERT.format(table=ROLLUP_TABLES["day"], fmt=ROLLUP_BUCKET_FORMATS["day"])};
+        END
+        """,
+        lambda conn: rebuild_rollups(conn),
+    ],
+    # v8: paylaşımlı toplama için işçi kalp atışları ve kaynak kiraları (epoch saniye)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS shard_workers (
+            worker_id TEXT PRIMARY KEY,
+            host TEXT,
+            pid INTEGER,
+            started_at REAL,
+            heartbeat_at REAL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS shard_leases (
+            feed TEXT PRIMARY KEY,
+            worker_id TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_shard_leases_worker ON shard_leases(worker_id)",
+    ],
+    # v9: aylık arşiv bölümlerinin kataloğu. Rapor özeti arşiv dosyalarını
+    # açmadan buradan tamamlanır; en negatif listesi min_sentiment ile budanır.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS archive_partitions (
+            month TEXT PRIMARY KEY,
+            rows INTEGER NOT NULL DEFAULT 0,
+            min_id INTEGER,
+            max_id INTEGER,
+            min_created_at TEXT,
+            max_created_at TEXT,
+            min_sentiment REAL,
+            bytes INTEGER NOT NULL DEFAULT 0,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS archive_sources (
+            source TEXT NOT NULL,
+            month TEXT NOT NULL,
+            PRIMARY KEY (source, month)
+        ) WITHOUT ROWID
+        """,
+    ],
+    # v10: report modu için artımlı özet istatistikleri (arşiv dahil). Tetikleyici
+    # save_articles'ın transaction'ı içinde çalışır; en negatifler top_k satırlık
+    # bir yığın gibi tutulur (en büyük duygulu satır taşınca silinir). Arşive
+    # taşıma istatistikleri değiştirmez, silme (saklama süresi) baştan hesaplatır.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS summary_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total INTEGER NOT NULL DEFAULT 0,
+            sources INTEGER NOT NULL DEFAULT 0,
+            min_created_at TEXT,
+            max_created_at TEXT,
+            top_k INTEGER NOT NULL,
+            rebuilt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS summary_sources (
+            source TEXT PRIMARY KEY
+        ) WITHOUT ROWID
+        """,
+        # Kaynak sayısı da sayaç: COUNT(*) kaynak tablosunu tarardı
+        """
+        CREATE TRIGGER IF NOT EXISTS summary_sources_insert AFTER INSERT ON summary_sources BEGIN
+            UPDATE summary_stats SET sources = sources + 1 WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS summary_most_negative (
+            article_id INTEGER PRIMARY KEY,
+            title TEXT,
+            source TEXT,
+            published TEXT,
+            sentiment REAL NOT NULL,
+            category TEXT,
+            link TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_summary_most_negative_sentiment ON summary_most_negative(sentiment, article_id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS articles_summary_insert AFTER INSERT ON articles BEGIN
+            UPDATE summary_stats SET
+                total = total + 1,
+                min_created_at = min(coalesce(min_created_at, new.created_at), new.created_at),
+                max_created_at = max(coalesce(max_created_at, new.created_at), new.created_at)
+            WHERE id = 1;
+            INSERT OR IGNORE INTO summary_sources (source) SELECT new.source WHERE new.source IS NOT NULL;
+        END
+        """,
+        # Çoğu haber yığına girmez: WHEN ile gövde sadece girenler için çalışır.
+        # Eşit duyguda yeni haber girmez (sıra: duygu, sonra id).
+        """
+        CREATE TRIGGER IF NOT EXISTS articles_summary_negative AFTER INSERT ON articles
+        WHEN new.sentiment IS NOT NULL AND (
+            (SELECT COUNT(*) FROM summary_most_negative) < (SELECT top_k FROM summary_stats WHERE id = 1)
+            OR new.sentiment < (SELECT MAX(sentiment) FROM summary_most_negative)
+        )
+        BEGIN
+            INSERT INTO summary_most_negative (article_id, title, source, published, sentiment, category, link)
+            VALUES (new.id, new.title, new.source, new.published, new.sentiment, new.category, new.link);
+            DELETE FROM summary_most_negative WHERE article_id IN (
+                SELECT article_id FROM summary_most_negative
+                ORDER BY sentiment ASC, article_id ASC
+                LIMIT -1 OFFSET (SELECT top_k FROM summary_stats WHERE id = 1)
+            );
+        END
+        """,
+        lambda conn: rebuild_summary_stats(conn),
+    ],
+    # v11: articles satırlarındaki yerinde güncellemelerin sayacı (backfill ile
+    # alert_mask / cluster_id). id filigranıyla sadece yeni satırları okuyan
+    # önbellekler (dashboard) bu sayaç değişince baştan okur.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS article_changes (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            updates INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        "INSERT OR IGNORE INTO article_changes (id, updates) VALUES (1, 0)",
+        """
+        CREATE TRIGGER IF NOT EXISTS articles_update_counter AFTER UPDATE ON articles BEGIN
+            UPDATE article_changes SET updates = updates + 1 WHERE id = 1;
+        END
+        """,
+    ],
+    # v12: arşive taşınan haberlerin link özetleri (link_hash). articles.link
+    # UNIQUE kontrolü taşınan satırları görmez; known_links_in_db arşiv
+    # dosyalarını açmadan buradan kontrol eder. Var olan bölümler baştan
+    # okunur ve FTS indeksi olmadan yazılmışlarsa indeksleri kurulur.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS archived_links (
+            link_hash INTEGER PRIMARY KEY,
+            month TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_archived_links_month ON archived_links(month)",
+        lambda conn: backfill_archived_links(conn),
+    ],
+]
+
+
+def add_column_if_missing(conn: sqlite3.Connection, table: str, column: str, decl: str) -> None:
+    """ALTER TABLE ADD COLUMN'un tekrar çalıştırılabilir hali."""
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def backfill_archived_links(conn: sqlite3.Connection) -> None:
+    """Katalogdaki arşiv bölümlerinin linklerini archived_links'e yazar (commit etmez)."""
+    for month, *_ in list_archive_partitions(conn):
+        if not archive_path(month).exists():
+            continue
+        init_archive(month)
+        archive_conn = open_archive(month)
+        try:
+            rows = archive_conn.execute("SELECT link FROM articles WHERE link IS NOT NULL").fetchall()
+        finally:
+            archive_conn.close()
+        conn.executemany(
+            """
+            INSERT INTO archived_links (link_hash, month) VALUES (?, ?)
+            ON CONFLICT (link_hash) DO UPDATE SET month = max(month, excluded.month)
+            """,
+            [(link_hash(row[0]), month) for row in rows],
+        )
+
+
+def migrate_db(conn: sqlite3.Connection) -> None:
+    """
+    Uygulanmamış şema göçlerini sırayla çalıştırır.
+    Bir göç adımı SQL metni ya da conn alan bir fonksiyon olabilir;
+    adımlar yarıda kalırsa tekrar çalıştırılabilecek şekilde yazılır.
+    Her sürüm (DDL dahil) user_version ile birlikte tek transaction'da
+    commit edilir; göç fonksiyonları ara commit yapmamalıdır.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, statements in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+        with write_transaction(conn):
+            # Aynı anda açılan başka bir süreç bu sürümü uygulamış olabilir
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= target:
+                continue
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+        print(f"[DB] Şema göçü uygulandı: v{target}")
+
+
+def rollup_insert(conn: sqlite3.Connection, source_conn: Optional[sqlite3.Connection] = None) -> None:
+    """
+    Haberleri özet tablolarına ekler (var olan kovalarla birleştirir).
+    source_conn verilmezse news.db'deki articles tek INSERT ... SELECT ile,
+    verilirse (arşiv bağlantısı) oradan okunan kovalar eklenir; ATTACH
+    gerekmediği için çağıranın transaction'ı içinde çalışır.
+    """
+    for granularity, table in ROLLUP_TABLES.items():
+        select = f"""
+            SELECT strftime('{ROLLUP_BUCKET_FORMATS[granularity]}', created_at),
+                   coalesce(category, ''), coalesce(source, ''),
+                   COUNT(*), COUNT(sentiment), coalesce(SUM(sentiment), 0), MIN(sentiment), MAX(sentiment)
+            FROM articles
+            WHERE true
+            GROUP BY 1, 2, 3
+        """
+        # Aynı kova hem news.db'de hem arşivde olabilir (geç eklenen eski tarihli haber)
+        upsert = """
+            ON CONFLICT (bucket, category, source) DO UPDATE SET
+                count = count + excluded.count,
+                sentiment_count = sentiment_count + excluded.sentiment_count,
+                sentiment_sum = sentiment_sum + excluded.sentiment_sum,
+                sentiment_min = min(coalesce(sentiment_min, excluded.sentiment_min),
+                                    coalesce(excluded.sentiment_min, sentiment_min)),
+                sentiment_max = max(coalesce(sentiment_max, excluded.sentiment_max),
+                                    coalesce(excluded.sentiment_max, sentiment_max))
+        """
+        insert = f"""
+            INSERT INTO {table}
+                (bucket, category, source, count, sentiment_count, sentiment_sum, sentiment_min, sentiment_max)
+        """
+        if source_conn is None:
+            conn.execute(insert + select + upsert)
+        else:
+            conn.executemany(
+                insert + "VALUES (?, ?, ?, ?, ?, ?, ?, ?)" + upsert,
+                source_conn.execute(select),
+            )
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> int:
+    """
+    Özet tablolarını articles tablosundan baştan hesaplar (göç ve onarım için);
+    çağıranın transaction'ı içinde çalışır, ara commit yapmaz.
+    Normalde tetikleyici güncel tutar; silinen haberler özetten düşmez,
+    elle silme sonrası tutarlılık için bu fonksiyon çağrılabilir.
+    Arşiv bölümlerindeki haberler de sayılır (arşive taşınan haberler
+    grafiklerden düşmez). Yazılan saatlik kova sayısını döner.
+    """
+    for table in ROLLUP_TABLES.values():
+        conn.execute(f"DELETE FROM {table}")
+    rollup_insert(conn)
+    for _, archive_conn in iter_archives(conn):
+        rollup_insert(conn, archive_conn)
+    return conn.execute(f"SELECT COUNT(*) FROM {ROLLUP_TABLES['hour']}").fetchone()[0]
+
+
+def scan_summary_stats(conn: sqlite3.Connection, top_k: Optional[int] = None) -> tuple:
+    """
+    Rapor özetini ham satırlardan hesaplar: news.db ve her arşiv dosyası
+    taranır, özet istatistikleri kullanılmaz. (toplam, kaynak kümesi,
+    ilk kayıt, son kayıt, en negatif top_k satır) döner; en negatif
+    satırlar MOST_NEGATIVE_SQL kolonlarında (id dahil).
+    """
+    top_k = top_k or SUMMARY_TOP_K
+    total = conn.execute(SUMMARY_COUNT_SQL).fetchone()[0]
+    sources = {row[0] for row in conn.execute(SUMMARY_SOURCES_SQL)}
+    earliest, latest = conn.execute(SUMMARY_RANGE_SQL).fetchone()
+    negative = conn.execute(MOST_NEGATIVE_SQL, (top_k,)).fetchall()
+
+    for _, archive_conn in iter_archives(conn):
+        total += archive_conn.execute(SUMMARY_COUNT_SQL).fetchone()[0]
+        sources.update(row[0] for row in archive_conn.execute(SUMMARY_SOURCES_SQL))
+        first, last = archive_conn.execute(SUMMARY_RANGE_SQL).fetchone()
+        earliest = min(filter(None, [earliest, first]), default=None)
+        latest = max(filter(None, [latest, last]), default=None)
+        archived = archive_conn.execute(MOST_NEGATIVE_SQL, (top_k,)).fetchall()
+        negative = heapq.nsmallest(top_k, negative + archived, key=lambda row: (row[4], row[0]))
+    return total, sources, earliest, latest, negative
+
+
+def rebuild_summary_stats(conn: sqlite3.Connection) -> int:
+    """
+    Özet istatistiklerini (summary_stats, summary_sources,
+    summary_most_negative) ham satırlardan baştan kurar; çağıranın
+    transaction'ı içinde çalışır. Normalde tetikleyici güncel tutar;
+    haber silinince (saklama süresi) ya da SUMMARY_TOP_K değişince çağrılır.
+    Toplam haber sayısını döner.
+    """
+    total, sources, earliest, latest, negative = scan_summary_stats(conn, SUMMARY_TOP_K)
+    conn.execute("DELETE FROM summary_stats")
+    conn.execute(
+        "INSERT INTO summary_stats (id, total, min_created_at, max_created_at, top_k) VALUES (1, ?, ?, ?, ?)",
+        (total, earliest, latest, SUMMARY_TOP_K),
+    )
+    # sources sayacını summary_sources tetikleyicisi artırır
+    conn.execute("DELETE FROM summary_sources")
+    conn.executemany("INSERT INTO summary_sources (source) VALUES (?)", [(source,) for source in sources])
+    conn.execute("DELETE FROM summary_most_negative")
+    conn.executemany(
+        """
+        INSERT INTO summary_most_negative (article_id, title, source, published, sentiment, category, link)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        negative,
+    )
+    return total
+
+
+def verify_summary_stats(conn: sqlite3.Connection) -> List[tuple[str, object, object]]:
+    """
+    Özet istatistiklerini ham satırlardan yeniden hesaplananla karşılaştırır.
+    Farklı çıkan alanları (alan, özet değeri, ham değer) olarak döner.
+    """
+    total, sources, earliest, latest, top_k = conn.execute(SUMMARY_STATS_SQL).fetchone()
+    negative = conn.execute(SUMMARY_STATS_NEGATIVE_SQL, (top_k,)).fetchall()
+    raw_total, raw_sources, raw_earliest, raw_latest, raw_negative = scan_summary_stats(conn, top_k)
+    fields = [
+        ("Toplam kayıtlı haber", total, raw_total),
+        ("Farklı kaynak sayısı", sources, len(raw_sources)),
+        ("İlk kayıt tarihi", earliest, raw_earliest),
+        ("Son kayıt tarihi", latest, raw_latest),
+        # (id, duygu): eşit duygularda sıra id ile belirli, birebir karşılaştırılabilir
+        (f"En negatif {top_k} haber", [(row[0], row[4]) for row in negative], [(row[0], row[4]) for row in raw_negative]),
+    ]
+    return [field for field in fields if field[1] != field[2]]
+
+
+def backfill_alert_masks(
+    conn: sqlite3.Connection,
+    only_missing: bool = True,
+    batch_size: int = 5000,
+    commit: bool = True,
+) -> int:
+    """
+    Kayıtlı haberlerin alert_mask kolonunu hesaplar.
+    only_missing False ise tüm satırlar yeniden hesaplanır
+    (ör. ALERT_KEYWORDS değiştikten sonra). commit False ise partiler
+    çağıranın transaction'ında kalır (şema göçü yarıda commit edilmez).
+    Güncellenen satır sayısını döner.
+    """
+    cur = conn.cursor()
+    last_id = 0
+    updated = 0
+    while True:
+        cur.execute(
+            f"""
+            SELECT id, title, summary FROM articles
+            WHERE id > ? {"AND alert_mask IS NULL" if only_missing else ""}
+            ORDER BY id
+            LIMIT ?
+            """,
+            (last_id, batch_size),
+        )
+        rows = cur.fetchall()
+        if not rows:
+            break
+
+        conn.executemany(
+            "UPDATE articles SET alert_mask = ? WHERE id = ?",
+            [(alert_mask(match_article_text(title, summary)[1]), row_id) for row_id, title, summary in rows],
+        )
+        if commit:
+            conn.commit()
+        updated += len(rows)
+        last_id = rows[-1][0]
+
+    return updated
+
+
+def load_feed_cache(conn: sqlite3.Connection) -> None:
+    """
+    Kaydedilmiş ETag / Last-Modified bilgilerini feed_cache sözlüğüne yükler.
+    Böylece yeniden başlatmadan sonra da 304 alınabilir.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT url, etag, last_modified, last_size, hits, bytes_saved FROM feed_cache"
+    )
+    for url, etag, last_modified, last_size, hits, bytes_saved in cur.fetchall():
+        feed_cache[url] = FeedCacheEntry(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            last_size=last_size or 0,
+            hits=hits or 0,
+            bytes_saved=bytes_saved or 0,
+        )
+
+
+def save_feed_cache(conn: sqlite3.Connection, urls: Optional[Iterable[str]] = None) -> None:
+    """feed_cache sözlüğünü veritabanına yazar; urls verilirse sadece o kaynakları."""
+    entries = list(feed_cache.values()) if urls is None else [feed_cache[u] for u in urls if u in feed_cache]
+    if not entries:
+        return
+
+    cur = conn.cursor()
+    cur.executemany(
+        """
+        INSERT OR REPLACE INTO feed_cache
+        (url, etag, last_modified, last_size, hits, bytes_saved, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        [
+            (e.url, e.etag, e.last_modified, e.last_size, e.hits, e.bytes_saved)
+            for e in entries
+        ],
+    )
+    conn.commit()
+
+
+def print_feed_cache_stats() -> None:
+    """
+    Kaynak başına koşullu GET sayaçlarını listeler:
+    kaç kez 304 alındığı ve tahmini ne kadar veri indirilmediği.
+    """
+    conn = init_db()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT url, hits, bytes_saved, etag, last_modified
+        FROM feed_cache
+        ORDER BY bytes_saved DESC
         """
     )
+    rows = cur.fetchall()
+    conn.close()
+
+    if not rows:
+        print("Henüz koşullu GET kaydı yok.")
+        return
+
+    url_to_source = {url: name for name, url in RSS_FEEDS.items()}
+
+    print("=== Koşullu GET önbelleği ===")
+    total_hits = 0
+    total_saved = 0
+    for url, hits, bytes_saved, etag, last_modified in rows:
+        total_hits += hits or 0
+        total_saved += bytes_saved or 0
+        print("-" * 80)
+        print(f"Kaynak        : {url_to_source.get(url, url)}")
+        print(f"304 sayısı    : {hits}")
+        print(f"Tasarruf      : {(bytes_saved or 0) / 1024:.1f} KB")
+        print(f"ETag          : {etag}")
+        print(f"Last-Modified : {last_modified}")
+    print()
+    print(f"Toplam 304: {total_hits}, toplam tasarruf: {total_saved / 1024:.1f} KB")
+    print()
+
+# Rapor ve export sorguları; explain modu da aynı metinleri kullanır
+SUMMARY_COUNT_SQL = "SELECT COUNT(*) FROM articles"
+SUMMARY_SOURCES_SQL = "SELECT DISTINCT source FROM articles WHERE source IS NOT NULL"
+# MIN ve MAX ayrı alt sorgularda: ikisi aynı SELECT'te olunca SQLite indeksi kullanamaz
+SUMMARY_RANGE_SQL = """
+    SELECT (SELECT MIN(created_at) FROM articles),
+           (SELECT MAX(created_at) FROM articles)
+"""
+# Eşit duygularda eski haber önce; özet istatistiklerindeki yığınla aynı sıra
+MOST_NEGATIVE_SQL = """
+    SELECT id, title, source, published, sentiment, category, link
+    FROM articles
+    WHERE sentiment IS NOT NULL
+    ORDER BY sentiment ASC, id ASC
+    LIMIT ?
+"""
+# report modu bunları okur: tablo boyutundan bağımsız, tek satır ve en fazla top_k satır
+SUMMARY_STATS_SQL = """
+    SELECT total, sources, min_created_at, max_created_at, top_k FROM summary_stats WHERE id = 1
+"""
+SUMMARY_STATS_NEGATIVE_SQL = """
+    SELECT article_id, title, source, published, sentiment, category, link
+    FROM summary_most_negative
+    ORDER BY sentiment ASC, article_id ASC
+    LIMIT ?
+"""
+EXPORT_COLUMNS = ["title", "summary", "link", "published", "source", "sentiment", "category", "created_at"]
+
+
+def build_recent_query(category: str, hours: int, limit: int) -> tuple[str, list]:
+    """
+    print_recent_by_category sorgusunu kurar.
+    Kategori filtresi sadece gerektiğinde eklenir ki
+    (category, created_at) indeksi kullanılabilsin.
+    """
+    query = """
+        SELECT title, source, published, sentiment, category, link, created_at
+        FROM articles
+        WHERE created_at >= datetime('now', ?)
+          AND sentiment IS NOT NULL
+    """
+    params: list = [f"-{hours} hours"]
+
+    if category != "all":
+        query += " AND category = ?"
+        params.append(category)
+
+    query += " ORDER BY sentiment ASC LIMIT ?"
+    params.append(limit)
+    return query, params
+
+
+def build_export_query(
+    category: str = "all",
+    hours: Optional[int] = None,
+    since_id: Optional[int] = None,
+) -> tuple[str, list]:
+    """
+    Export sorgusunu kurar (ilk kolon her zaman id). Satırlar hem tam hem
+    artımlı export'ta id sırasıyla gelir, böylece dosyanın sonuna eklenen
+    satırlar baştan yazılmış bir dosyadakiyle aynı sırada olur.
+    since_id verilirse (artımlı export ya da saat penceresiz tam export)
+    satırlar NOT INDEXED ile rowid aralığından okunur; filtre ne olursa olsun
+    sıralama için geçici B-tree kurulmaz ve son yazılan id bir sonraki
+    export'un başlangıcı olur. Saat penceresinde created_at indeksi kullanılır.
+    """
+    if since_id is None and hours is None:
+        since_id = 0
+    query = f"""
+        SELECT id, {", ".join(EXPORT_COLUMNS)}
+        FROM articles{" NOT INDEXED" if since_id is not None else ""}
+        WHERE 1=1
+    """
+    params: list = []
+
+    if since_id is not None:
+        query += " AND id > ?"
+        params.append(since_id)
+
+    if category != "all":
+        query += " AND category = ?"
+        params.append(category)
+
+    if hours is not None:
+        query += " AND created_at >= datetime('now', ?)"
+        params.append(f"-{hours} hours")
+
+    query += " ORDER BY id"
+    return query, params
+
+
+def build_load_data_query(
+    category: str = "all",
+    hours: Optional[int] = 24,
+    limit: int = 500,
+    since_id: Optional[int] = None,
+    only_alerts: bool = False,
+) -> tuple[str, list]:
+    """
+    Dashboard'daki load_data sorgusunu kurar.
+    since_id verilirse sadece id'si bundan büyük (yeni) satırlar istenir;
+    NOT INDEXED ile SQLite rowid aralığını kullanır, böylece filtreler ne
+    olursa olsun sadece yeni satırlar okunur.
+    only_alerts True ise sadece alarm tetikleyen haberler
+    (alert_mask != 0, kısmi indeks) döner.
+    """
+    query = f"""
+        SELECT
+            id,
+            title,
+            summary,
+            link,
+            published,
+            source,
+            sentiment,
+            category,
+            created_at,
+            alert_mask
+        FROM articles{" NOT INDEXED" if since_id is not None else ""}
+        WHERE 1=1
+    """
+
+    params: list = []
+
+    if only_alerts:
+        query += " AND alert_mask != 0"
+
+    if since_id is not None:
+        query += " AND id > ?"
+        params.append(since_id)
+
+    # Kategori filtresi
+    if category != "all":
+        query += " AND category = ?"
+        params.append(category)
+
+    # Zaman filtresi (son X saat)
+    if hours is not None:
+        query += " AND created_at >= datetime('now', ?)"
+        params.append(f"-{hours} hours")
+
+    query += " ORDER BY created_at DESC LIMIT ?"
+    params.append(limit)
+    return query, params
+
+
+def build_rollup_query(category: str = "all", hours: Optional[int] = None, granularity: str = "day") -> tuple[str, list]:
+    """
+    Özet tablosundan (kova, kategori) başına sayı ve duygu toplamlarını döner.
+    Ham satırlara hiç dokunmaz; bir yıllık günlük seri birkaç bin satırdır.
+    Zaman penceresi kova başına yuvarlanır (ör. son 24 saat -> 25 saatlik kova).
+    """
+    table = ROLLUP_TABLES[granularity]
+    query = f"""
+        SELECT bucket, category,
+               SUM(count) AS count,
+               SUM(sentiment_count) AS sentiment_count,
+               SUM(sentiment_sum) AS sentiment_sum,
+               MIN(sentiment_min) AS sentiment_min,
+               MAX(sentiment_max) AS sentiment_max
+        FROM {table}
+        WHERE 1=1
+    """
+    params: list = []
+
+    if hours is not None:
+        query += f" AND bucket >= strftime('{ROLLUP_BUCKET_FORMATS[granularity]}', 'now', ?)"
+        params.append(f"-{hours} hours")
+
+    if category != "all":
+        query += " AND category = ?"
+        params.append(category)
+
+    query += " GROUP BY bucket, category ORDER BY bucket"
+    return query, params
+
+
+def fold_search_text(text: str) -> str:
+    """FTS indeksiyle aynı Türkçe katlama: ı / İ / I -> i (gerisini FTS5 küçültür)."""
+    return text.replace("ı", "i").replace("İ", "i").replace("I", "i")
+
+
+def build_fts_match(text: str) -> str:
+    """
+    Kullanıcı metnini güvenli bir FTS5 sorgusuna çevirir:
+    her kelime tırnaklı önek araması olur, kelimeler AND ile bağlanır.
+    """
+    words = re.findall(r"\w+", fold_search_text(text))
+    return " ".join('"' + w.replace('"', '""') + '"*' for w in words)
+
+
+SEARCH_COLUMNS = [
+    "id", "title", "summary", "link", "published", "source",
+    "sentiment", "category", "created_at", "alert_mask", "rank",
+]
+
+
+def build_search_query(
+    text: str,
+    limit: int = 20,
+    offset: int = 0,
+    category: str = "all",
+) -> tuple[str, list]:
+    """
+    FTS5 üzerinden sıralı (bm25, başlık 2x ağırlıklı) ve sayfalı arama sorgusu.
+    Sonuçlar articles tablosundan rowid ile birleştirilir; arşiv bölümlerinde
+    aynı isimli tablolar olduğu için sorgu orada da değiştirilmeden çalışır.
+    """
+    query = """
+        SELECT
+            a.id,
+            a.title,
+            a.summary,
+            a.link,
+            a.published,
+            a.source,
+            a.sentiment,
+            a.category,
+            a.created_at,
+            a.alert_mask,
+            bm25(articles_fts, 2.0, 1.0) AS rank
+        FROM articles_fts
+        JOIN articles a ON a.id = articles_fts.rowid
+        WHERE articles_fts MATCH ?
+    """
+    params: list = [build_fts_match(text)]
+
+    if category != "all":
+        query += " AND a.category = ?"
+        params.append(category)
+
+    query += " ORDER BY rank LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+    return query, params
+
+
+def search_articles(
+    conn: sqlite3.Connection,
+    text: str,
+    limit: int = 20,
+    offset: int = 0,
+    category: str = "all",
+) -> list[tuple]:
+    """
+    Arama sonuçlarını (SEARCH_COLUMNS sırasıyla) news.db ve arşiv bölümlerinden
+    döner. Her bölümden ilk offset + limit sonuç alınır, bm25 sırasıyla
+    birleştirilip sayfa kesilir. bm25 her indeksin kendi istatistikleriyle
+    hesaplandığı için bölümler arası sıra yaklaşıktır.
+    """
+    if not build_fts_match(text):
+        return []
+    query, params = build_search_query(text, limit=offset + limit, offset=0, category=category)
+    rows = conn.execute(query, params).fetchall()
+    rows += query_archives(conn, query, params)
+    rows.sort(key=lambda row: row[-1])
+    return rows[offset:offset + limit]
+
+
+def print_search_results(text: str, page: int = 1, page_size: int = 20) -> None:
+    """
+    Başlık/özet içinde tam metin araması yapar ve sonuçları
+    alaka sırasına göre sayfa sayfa listeler.
+    """
+    conn = init_db()
+    # Bir fazlasını iste: sonraki sayfa var mı anlamak için
+    rows = search_articles(conn, text, limit=page_size + 1, offset=(page - 1) * page_size)
+    conn.close()
+
+    if not rows:
+        print(f"'{text}' için sonuç bulunamadı.")
+        return
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    print(f"=== '{text}' arama sonuçları (sayfa {page}) ===")
+    for i, (_, title, _, link, published, source, sentiment, category, _, _, _) in enumerate(
+        rows, start=(page - 1) * page_size + 1
+    ):
+        print("-" * 80)
+        print(f"#{i}")
+        print(f"Kaynak   : {source}")
+        print(f"Tarih    : {published}")
+        print(f"Kategori : {category}")
+        print(f"Duygu    : {sentiment:.3f}" if sentiment is not None else "Duygu    : -")
+        print(f"Başlık   : {title}")
+        print(f"Link     : {link}")
+    print()
+    if has_more:
+        print(f"Sonraki sayfa için: python sei_news_analyzer.py search \"{text}\" {page + 1}")
+
+
+def builtin_queries() -> List[tuple[str, str, list]]:
+    """explain modunda planı gösterilecek (isim, sql, parametreler) listesi."""
+    return [
+        ("report: özet istatistikleri", SUMMARY_STATS_SQL, []),
+        ("report: en negatif", SUMMARY_STATS_NEGATIVE_SQL, [10]),
+        ("report --verify: toplam haber", SUMMARY_COUNT_SQL, []),
+        ("report --verify: kaynaklar", SUMMARY_SOURCES_SQL, []),
+        ("report --verify: tarih aralığı", SUMMARY_RANGE_SQL, []),
+        ("report --verify: en negatif", MOST_NEGATIVE_SQL, [SUMMARY_TOP_K]),
+        ("recent: kategori", *build_recent_query("conflict/crisis", 24, 20)),
+        ("recent: all", *build_recent_query("all", 24, 20)),
+        ("dashboard: kategori + zaman", *build_load_data_query("economy", 24, 300)),
+        ("dashboard: all + zaman", *build_load_data_query("all", 24, 300)),
+        ("dashboard: tüm kayıtlar", *build_load_data_query("all", None, 300)),
+        ("dashboard: artımlı", *build_load_data_query("economy", 24, 300, since_id=0)),
+        ("dashboard: sadece alarmlar", *build_load_data_query("all", 24, 300, only_alerts=True)),
+        ("canlı mod: alarm verilmiş kümeler", ALERTED_CLUSTERS_SQL, ["-72 hours"]),
+        ("search", *build_search_query("deprem", 20, 0)),
+        ("dashboard: saatlik özet", *build_rollup_query("economy", 24, "hour")),
+        ("dashboard: günlük özet", *build_rollup_query("all", 24 * 365, "day")),
+        ("export", *build_export_query()),
+        ("export: kategori + zaman", *build_export_query("economy", 24)),
+        ("export: artımlı", *build_export_query("economy", since_id=0)),
+    ]
+
+
+def print_query_plans() -> None:
+    """
+    Yerleşik sorguların EXPLAIN QUERY PLAN çıktısını basar.
+    İndeks kullanmadan tüm tabloyu tarayan adımlar [WARN] ile işaretlenir.
+    """
+    conn = init_db()
+    cur = conn.cursor()
+
+    full_scans = 0
+    for name, query, params in builtin_queries():
+        cur.execute("EXPLAIN QUERY PLAN " + query, params)
+        print(f"=== {name} ===")
+        for row in cur.fetchall():
+            detail = row[-1]
+            warn = (
+                detail.startswith("SCAN ")
+                and " USING " not in detail
+                and " VIRTUAL TABLE INDEX " not in detail
+                and detail != "SCAN CONSTANT ROW"
+            )
+            if warn:
+                full_scans += 1
+            print(f"  {'[WARN] ' if warn else ''}{detail}")
+        print()
+
+    conn.close()
+    if full_scans:
+        print(f"[WARN] İndekssiz tam tablo taraması: {full_scans}")
+    else:
+        print("Tüm sorgular indeks kullanıyor.")
+
+
+# Arşiv bölümlerindeki articles: news.db ile aynı kolonlar ve okuma indeksleri,
+# böylece build_*_query sorguları arşivde de değiştirilmeden çalışır.
+# link UNIQUE değil: aynı link sonradan tekrar taşınırsa kayıt kaybolmasın.
+ARCHIVE_COLUMNS = [
+    "id", "title", "summary", "link", "published", "source",
+    "sentiment", "category", "created_at", "alert_mask", "cluster_id",
+]
+ARCHIVE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        id INTEGER PRIMARY KEY,
+        title TEXT,
+        summary TEXT,
+        link TEXT,
+        published TEXT,
+        source TEXT,
+        sentiment REAL,
+        category TEXT,
+        created_at TIMESTAMP,
+        alert_mask INTEGER,
+        cluster_id INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_articles_created_at ON articles(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_category_created_at ON articles(category, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_sentiment ON articles(sentiment)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_alerts_created_at ON articles(created_at) WHERE alert_mask != 0",
+    # news.db'deki articles_fts ile aynı tokenizer ve Türkçe katlama (v4); bölüm
+    # sadece eklenerek büyüdüğü için silme / güncelleme tetikleyicisi gerekmez
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, summary, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, summary)
+        VALUES (new.id, replace(replace(new.title, 'ı', 'i'), 'İ', 'i'), replace(replace(new.summary, 'ı', 'i'), 'İ', 'i'));
+    END
+    """,
+]
+
+
+def archive_dir() -> Path:
+    """Arşiv bölümlerinin klasörü (news.db'nin yanında)."""
+    return DB_PATH.parent / ARCHIVE_DIR_NAME
+
+
+def archive_path(month: str) -> Path:
+    """Bir ayın ('YYYY-MM') arşiv veritabanı."""
+    return archive_dir() / f"articles-{month}.db"
+
+
+def current_month(now: Optional[datetime] = None) -> str:
+    """created_at ile aynı saat diliminde (UTC) 'YYYY-MM'."""
+    return (now or datetime.now(timezone.utc)).strftime("%Y-%m")
+
+
+def shift_month(month: str, n: int) -> str:
+    """'YYYY-MM' ayını n ay ileri (n < 0 ise geri) kaydırır."""
+    year, mon = map(int, month.split("-"))
+    index = year * 12 + mon - 1 + n
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def month_start(month: str) -> str:
+    """created_at ile karşılaştırılabilir ay başı: 'YYYY-MM-01 00:00:00'."""
+    return f"{month}-01 00:00:00"
+
+
+def list_archive_partitions(conn: sqlite3.Connection, hours: Optional[int] = None) -> list:
+    """
+    Arşiv bölümleri, en yeni ay önce:
+    (month, rows, min_id, max_id, min_created_at, max_created_at, min_sentiment, bytes).
+    hours verilirse sadece son hours saatle kesişen bölümler döner (bölüm budama).
+    Katalog tablosu henüz yoksa (v9 göçünden önce) boş liste.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'archive_partitions'"
+    ).fetchone()
+    if not exists:
+        return []
+
+    query = """
+        SELECT month, rows, min_id, max_id, min_created_at, max_created_at, min_sentiment, bytes
+        FROM archive_partitions
+    """
+    params: list = []
+    if hours is not None:
+        query += " WHERE max_created_at >= datetime('now', ?)"
+        params.append(f"-{hours} hours")
+    query += " ORDER BY month DESC"
+    return conn.execute(query, params).fetchall()
+
+
+def init_archive(month: str) -> None:
+    """
+    Ayın arşiv dosyasını ARCHIVE_SCHEMA ile oluşturur / günceller. FTS
+    indeksi olmadan yazılmış eski bir bölümde indeks satırlardan doldurulur.
+    """
+    path = archive_path(month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    archive_conn = sqlite3.connect(path)
+    try:
+        with archive_conn:
+            has_fts = archive_conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+            ).fetchone()
+            for statement in ARCHIVE_SCHEMA:
+                archive_conn.execute(statement)
+            if not has_fts:
+                archive_conn.execute(
+                    """
+                    INSERT INTO articles_fts(rowid, title, summary)
+                    SELECT id, replace(replace(title, 'ı', 'i'), 'İ', 'i'), replace(replace(summary, 'ı', 'i'), 'İ', 'i')
+                    FROM articles
+                    """
+                )
+    finally:
+        archive_conn.close()
+
+
+def open_archive(month: str) -> sqlite3.Connection:
+    """Arşiv bölümüne salt okunur bağlantı."""
+    return sqlite3.connect(f"{archive_path(month).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def iter_archives(conn: sqlite3.Connection, hours: Optional[int] = None):
+    """
+    hours penceresiyle kesişen arşiv bölümlerini en yeni ay önce
+    (month, salt okunur bağlantı) olarak verir; bağlantı sonraki adımda kapanır.
+    """
+    for month, *_ in list_archive_partitions(conn, hours):
+        archive_conn = open_archive(month)
+        try:
+            yield month, archive_conn
+        finally:
+            archive_conn.close()
+
+
+def query_archives(conn: sqlite3.Connection, query: str, params: list, hours: Optional[int] = None) -> list:
+    """news.db için kurulmuş sorguyu pencereyle kesişen arşiv bölümlerinde çalıştırır, satırları birleştirir."""
+    rows: list = []
+    for _, archive_conn in iter_archives(conn, hours):
+        rows.extend(archive_conn.execute(query, params).fetchall())
+    return rows
+
+
+def article_update_count(conn: sqlite3.Connection) -> int:
+    """articles'taki yerinde güncellemelerin sayacı (v11); değiştiyse önbellekler eskimiştir."""
+    row = conn.execute("SELECT updates FROM article_changes WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+def oldest_article_id(conn: sqlite3.Connection) -> Optional[int]:
+    """news.db ve arşivdeki en küçük id; bunun altındaki satırlar silinmiştir (saklama süresi)."""
+    ids = [conn.execute("SELECT MIN(id) FROM articles").fetchone()[0]]
+    ids += [row[2] for row in list_archive_partitions(conn)]
+    ids = [i for i in ids if i is not None]
+    return min(ids) if ids else None
+
+
+@contextmanager
+def write_transaction(conn: sqlite3.Connection):
+    """
+    BEGIN IMMEDIATE ile yazma kilidini baştan alan transaction. Okuyup sonra
+    yazan bir transaction, arada başka bir yazıcı (canlı modun kayıt thread'i)
+    commit ederse kilit yükseltmesinde beklemeden 'database is locked' alır;
+    baştan alınan kilit için ise busy timeout kadar sırada beklenir.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    with conn:
+        yield conn
+
+
+def archive_month(conn: sqlite3.Connection, month: str, batch_size: Optional[int] = None) -> int:
+    """
+    Bir ayın haberlerini news.db'den o ayın arşiv veritabanına taşır.
+    Arşiv dosyası ATTACH edilir; her parti tek transaction'da kopyalanır,
+    katalog güncellenir ve news.db'den silinir. Yarıda kalırsa tekrar
+    çalıştırılabilir (INSERT OR IGNORE). Taşınan satır sayısını döner.
+    Satırlar bölümün kendi FTS indeksine girer, linkleri archived_links'e
+    yazılır (tekrar kontrolü); özet tablolarında kalır.
+    """
+    batch_size = batch_size or ARCHIVE_BATCH_SIZE
+    path = archive_path(month)
+    init_archive(month)
+
+    start, end = month_start(month), month_start(shift_month(month, 1))
+    columns = ", ".join(ARCHIVE_COLUMNS)
+    conn.commit()  # ATTACH açık bir transaction içinde çalışmaz
+    conn.execute("ATTACH DATABASE ? AS archive", (str(path),))
+    moved = 0
+    try:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+        while True:
+            with write_transaction(conn):
+                conn.execute("DELETE FROM temp.archive_batch")
+                n = conn.execute(
+                    """
+                    INSERT INTO temp.archive_batch
+                    SELECT id FROM main.articles WHERE created_at >= ? AND created_at < ? LIMIT ?
+                    """,
+                    (start, end, batch_size),
+                ).rowcount
+                if not n:
+                    break
+                conn.execute(
+                    f"""
+                    INSERT OR IGNORE INTO archive.articles ({columns})
+                    SELECT {columns} FROM main.articles WHERE id IN temp.archive_batch
+                    """
+                )
+                conn.execute(
+                    """
+                    INSERT INTO main.archive_partitions
+                        (month, rows, min_id, max_id, min_created_at, max_created_at, min_sentiment)
+                    SELECT ?, COUNT(*), MIN(id), MAX(id), MIN(created_at), MAX(created_at), MIN(sentiment)
+                    FROM main.articles WHERE id IN temp.archive_batch
+                    ON CONFLICT (month) DO UPDATE SET
+                        rows = rows + excluded.rows,
+                        min_id = min(min_id, excluded.min_id),
+                        max_id = max(max_id, excluded.max_id),
+                        min_created_at = min(min_created_at, excluded.min_created_at),
+                        max_created_at = max(max_created_at, excluded.max_created_at),
+                        min_sentiment = min(coalesce(min_sentiment, excluded.min_sentiment),
+                                            coalesce(excluded.min_sentiment, min_sentiment)),
+                        archived_at = CURRENT_TIMESTAMP
+                    """,
+                    (month,),
+                )
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO main.archive_sources (source, month)
+                    SELECT DISTINCT source, ? FROM main.articles
+                    WHERE id IN temp.archive_batch AND source IS NOT NULL
+                    """,
+                    (month,),
+                )
+                # Aynı link iki ayda varsa saklama süresi yenisine göre işlesin
+                conn.executemany(
+                    """
+                    INSERT INTO main.archived_links (link_hash, month) VALUES (?, ?)
+                    ON CONFLICT (link_hash) DO UPDATE SET month = max(month, excluded.month)
+                    """,
+                    [
+                        (link_hash(row[0]), month)
+                        for row in conn.execute(
+                            "SELECT link FROM main.articles WHERE id IN temp.archive_batch AND link IS NOT NULL"
+                        ).fetchall()
+                    ],
+                )
+                conn.execute("DELETE FROM main.articles WHERE id IN temp.archive_batch")
+            moved += n
+    finally:
+        conn.execute("DETACH DATABASE archive")
+
+    metrics.inc("sei_articles_total", moved, stage="archived")
+    return moved
+
+
+def vacuum_archive(conn: sqlite3.Connection, month: str) -> int:
+    """Arşiv dosyasını VACUUM ile sıkıştırır, katalogdaki boyutu günceller; boyutu döner."""
+    path = archive_path(month)
+    archive_conn = sqlite3.connect(path)
+    archive_conn.execute("VACUUM")
+    archive_conn.close()
+    size = path.stat().st_size
+    with write_transaction(conn):
+        conn.execute("UPDATE archive_partitions SET bytes = ? WHERE month = ?", (size, month))
+    return size
+
+
+def apply_retention(
+    conn: sqlite3.Connection,
+    retention_months: Optional[int] = None,
+    now: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+) -> List[str]:
+    """
+    Saklama süresi (ARCHIVE_RETENTION_MONTHS, içinde bulunulan ay dahil)
+    dolan ayları siler: news.db'de kalan eski satırlar (partiler halinde),
+    arşiv bölümleri (katalog + dosya) ve özet tablolarındaki kovalar.
+    Bir şey silindiyse rapor özet istatistikleri baştan hesaplanır.
+    Silinen arşiv aylarını döner.
+    """
+    retention = ARCHIVE_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention <= 0:
+        return []
+    oldest = shift_month(current_month(now), -(retention - 1))
+    batch_size = batch_size or ARCHIVE_BATCH_SIZE
+
+    deleted = 0
+    while True:
+        with write_transaction(conn):
+            n = conn.execute(
+                "DELETE FROM articles WHERE id IN (SELECT id FROM articles WHERE created_at < ? LIMIT ?)",
+                (month_start(oldest), batch_size),
+            ).rowcount
+        deleted += n
+        if n < batch_size:
+            break
+
+    months = [row[0] for row in conn.execute("SELECT month FROM archive_partitions WHERE month < ?", (oldest,))]
+    with write_transaction(conn):
+        conn.execute("DELETE FROM archive_partitions WHERE month < ?", (oldest,))
+        conn.execute("DELETE FROM archive_sources WHERE month < ?", (oldest,))
+        conn.execute("DELETE FROM archived_links WHERE month < ?", (oldest,))
+        for table in ROLLUP_TABLES.values():
+            # Günlük kova 'YYYY-MM-DD', saatlik 'YYYY-MM-DD HH:00:00': ikisi de 'YYYY-MM-01' ile karşılaştırılır
+            conn.execute(f"DELETE FROM {table} WHERE bucket < ?", (f"{oldest}-01",))
+    # Katalogdan düşen ya da yarım kalmış bir turdan kalan eski dosyalar
+    for path in archive_dir().glob("articles-*.db"):
+        if path.stem.removeprefix("articles-") < oldest:
+            path.unlink(missing_ok=True)
+
+    if deleted or months:
+        with write_transaction(conn):
+            rebuild_summary_stats(conn)
+        print(f"[DB] Saklama süresi ({retention} ay) doldu: news.db'den {deleted} haber, {len(months)} arşiv ayı silindi")
+    return months
+
+
+def compact_storage(
+    conn: sqlite3.Connection,
+    hot_months: Optional[int] = None,
+    retention_months: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    Bir arşivleme / saklama / sıkıştırma turu ('archive' modu ve ArchiveCompactor):
+      1. ARCHIVE_HOT_MONTHS'tan eski aylar arşiv bölümlerine taşınır ve
+         yazılan arşiv dosyaları VACUUM edilir,
+      2. apply_retention ile saklama süresi dolan aylar silinir,
+      3. news.db'de boş sayfa oranı ARCHIVE_VACUUM_FREE_RATIO'yu aşarsa
+         news.db VACUUM edilir (sıcak veri küçük kaldığı için kısa sürer).
+    {"archived": {ay: satır}, "dropped": [ay], "vacuumed": bool} döner.
+    """
+    hot_months = ARCHIVE_HOT_MONTHS if hot_months is None else hot_months
+    archived: Dict[str, int] = {}
+    if hot_months > 0:
+        cutoff = month_start(shift_month(current_month(now), -(hot_months - 1)))
+        months = [
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT strftime('%Y-%m', created_at) FROM articles WHERE created_at < ?", (cutoff,)
+            )
+            if row[0]
+        ]
+        for month in sorted(months):
+            with metrics.timer("sei_stage_seconds", stage="archive"):
+                archived[month] = archive_month(conn, month)
+                size = vacuum_archive(conn, month)
+            print(f"[DB] Arşive taşındı: {month} ({archived[month]} haber, {size / 1024 / 1024:.1f} MB)")
+
+    dropped = apply_retention(conn, retention_months, now)
+
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    vacuumed = bool(page_count) and free_pages / page_count > ARCHIVE_VACUUM_FREE_RATIO
+    if vacuumed:
+        start = time.perf_counter()
+        with metrics.timer("sei_stage_seconds", stage="vacuum"):
+            conn.execute("VACUUM")
+        print(f"[DB] news.db sıkıştırıldı: {free_pages}/{page_count} boş sayfa ({time.perf_counter() - start:.2f}s)")
+    return {"archived": archived, "dropped": dropped, "vacuumed": vacuumed}
+
+
+class ArchiveCompactor:
+    """
+    Canlı modda compact_storage'ı arka plan thread'inde her interval
+    saniyede bir (ilki başlarken) çalıştırır. Kendi bağlantısını açar;
+    taşıma ARCHIVE_BATCH_SIZE'lık kısa transaction'larla yapıldığı için
+    kayıt thread'i en fazla bir parti kadar bekler.
+    active False iken tur atlanır (paylaşımlı modda sadece halkada
+    ARCHIVE_SHARD_KEY'in sahibi olan işçi çalıştırır).
+    """
+
+    def __init__(self, interval: Optional[float] = None, profile: Optional[str] = None):
+        self.interval = interval or ARCHIVE_COMPACT_INTERVAL
+        self.profile = profile
+        self.active = True
+        self.last_result: Optional[dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="archive-compactor", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.active:
+                self.run_once()
+            self._stop.wait(self.interval)
+
+    def run_once(self) -> Optional[dict]:
+        conn = init_db(self.profile)
+        try:
+            self.last_result = compact_storage(conn)
+        except sqlite3.Error as e:
+            # Kilit vb. hatalar canlı modu durdurmasın, sonraki turda tekrar denenir
+            print(f"[WARN] Arşiv sıkıştırması yarıda kaldı: {e}")
+        finally:
+            conn.close()
+        return self.last_result
+
+    def close(self, timeout: float = 30.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def print_archive_status() -> None:
+    """news.db'deki (sıcak) veriyi ve arşiv bölümlerini listeler."""
+    conn = init_db()
+    hot = conn.execute(SUMMARY_COUNT_SQL).fetchone()[0]
+    earliest, latest = conn.execute(SUMMARY_RANGE_SQL).fetchone()
+    partitions = list_archive_partitions(conn)
+    conn.close()
+
+    print("=== Arşiv ===")
+    print(f"news.db        : {hot} haber ({earliest} - {latest}), {DB_PATH.stat().st_size / 1024 / 1024:.1f} MB")
+    print(f"Sıcak ay sayısı: {ARCHIVE_HOT_MONTHS or 'arşivleme kapalı'}")
+    print(f"Saklama süresi : {f'{ARCHIVE_RETENTION_MONTHS} ay' if ARCHIVE_RETENTION_MONTHS else 'sınırsız'}")
+    if not partitions:
+        print("Arşiv bölümü yok.")
+        print()
+        return
+
+    print(f"{'ay':8s} {'haber':>9} {'MB':>7}  aralık")
+    for month, rows, _, _, min_created_at, max_created_at, _, size in partitions:
+        print(f"{month:8s} {rows:>9} {size / 1024 / 1024:>7.1f}  {min_created_at} - {max_created_at}")
+    print(f"Toplam: {len(partitions)} ay, {sum(row[1] for row in partitions)} haber")
+    print()
+
+
+class SQLitePool:
+    """
+    news.db (DB_PATH) için bağlantı havuzu.
+
+    - connection(): okuma bağlantısı (PRAGMA query_only), iş bitince havuza
+      döner. Boşta bağlantı yoksa size'a kadar yenisi açılır, sonra beklenir.
+    - writer(): tek yazma bağlantısı (init_db, göçler dahil), kilitle sırayla
+      kullanılır; SQLite aynı anda tek yazıcıya izin verir.
+    Bağlantılar check_same_thread=False ile açılır ama aynı anda tek
+    thread'e verilir.
+    """
+
+    def __init__(self, size: Optional[int] = None, profile: Optional[str] = None):
+        self.db_path = DB_PATH
+        self.size = size or DB_POOL_SIZE
+        self.profile = profile
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in DB_PRAGMA_PROFILES.get(self.profile or DB_PRAGMA_PROFILE, []):
+            conn.execute(pragma)
+        conn.execute("PRAGMA query_only = 1")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return self._open_reader()
+        # Havuz dolu: bir bağlantı geri gelene kadar bekle
+        with metrics.timer("sei_stage_seconds", stage="db_pool_wait"):
+            return self._idle.get()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    @contextmanager
+    def writer(self):
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = init_db(self.profile, check_same_thread=False)
+            yield self._writer
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        self._opened = 0
+
+
+class SQLiteAnalytics:
+    """Toplama sorguları doğrudan news.db'de: indeksler ve saatlik / günlük özet tabloları."""
+
+    name = "sqlite"
+    # aggregate özet tablolarından okunur, duygu / alarm filtreleri uygulanamaz
+    supports_filters = False
+
+    def __init__(self, pool: SQLitePool):
+        self.pool = pool
+
+    def summary(self) -> tuple:
+        """
+        (toplam haber, farklı kaynak, ilk kayıt, son kayıt), arşiv dahil;
+        save_articles'ın güncel tuttuğu özet istatistiklerinden okunur.
+        """
+        with self.pool.connection() as conn:
+            total, sources, earliest, latest, _ = conn.execute(SUMMARY_STATS_SQL).fetchone()
+        return total, sources, earliest, latest
+
+    def most_negative(self, limit: int = 10) -> list:
+        """
+        En düşük duygulu haberler, arşiv dahil. limit özet istatistiklerindeki
+        top_k'yı aşmıyorsa oradan okunur. Aşarsa news.db ve arşiv bölümleri
+        taranır; bölümler en düşük duygudan başlayarak açılır, bölümün
+        min_sentiment'i o ana kadarki limit'inci değerden büyükse kalanlar açılmaz.
+        """
+        with self.pool.connection() as conn:
+            top_k = conn.execute(SUMMARY_STATS_SQL).fetchone()[4]
+            if limit <= top_k:
+                return [row[1:] for row in conn.execute(SUMMARY_STATS_NEGATIVE_SQL, (limit,))]
+            rows = conn.execute(MOST_NEGATIVE_SQL, (limit,)).fetchall()
+            partitions = sorted(
+                (row for row in list_archive_partitions(conn) if row[6] is not None), key=lambda row: row[6]
+            )
+        for month, *_, min_sentiment, _ in partitions:
+            # Eşit duyguda arşivdeki (daha küçük id'li) haber öne geçer, bölüm atlanamaz
+            if len(rows) >= limit and min_sentiment > rows[-1][4]:
+                break
+            archive_conn = open_archive(month)
+            try:
+                archived = archive_conn.execute(MOST_NEGATIVE_SQL, (limit,)).fetchall()
+            finally:
+                archive_conn.close()
+            rows = heapq.nsmallest(limit, archived + rows, key=lambda row: (row[4], row[0]))
+        return [row[1:] for row in rows]
+
+    def aggregate(
+        self,
+        category: str = "all",
+        hours: Optional[int] = None,
+        granularity: str = "day",
+        **filters,
+    ) -> tuple[List[str], list]:
+        """(kova, kategori) başına sayı ve duygu toplamları: (kolonlar, satırlar)."""
+        query, params = build_rollup_query(category=category, hours=hours, granularity=granularity)
+        with self.pool.connection() as conn:
+            cur = conn.execute(query, params)
+            return [d[0] for d in cur.description], cur.fetchall()
+
+    def close(self) -> None:
+        pass
+
+
+# DuckDB aynasındaki kolonlar: toplama ve en negatif listesi için yeterli, özet metni alınmaz
+MIRROR_COLUMNS = ["id", "title", "link", "published", "source", "sentiment", "category", "alert_mask", "created_at"]
+
+
+class DuckDBAnalytics:
+    """
+    news.db'nin DuckDB aynası (DUCKDB_PATH) üzerinde toplama sorguları.
+
+    Yazma yolu SQLite'ta kalır. Ayna her sorgudan önce id filigranından
+    artımlı eşitlenir: sadece yeni satırlar kopyalanır. Var olan satırlar
+    yerinde güncellendiyse (article_changes sayacı, ör. backfill ile
+    alert_mask) filigran bunu göremez, ayna baştan kurulur. Arşiv
+    bölümlerine taşınan satırlar aynada kalır; news.db ve arşivdeki en küçük
+    id'nin altında kalan (saklama süresi dolan) satırlar aynadan da silinir.
+    Aradan tek tek silinen satırlar eşitlenmez; rebuild() aynayı baştan kurar.
+    DuckDB dosyasını aynı anda tek süreç açabilir.
+    """
+
+    name = "duckdb"
+    supports_filters = True
+
+    def __init__(self, pool: SQLitePool, path: Optional[Path] = None):
+        import duckdb
+
+        self.pool = pool
+        self.path = Path(path or DUCKDB_PATH)
+        self._conn = duckdb.connect(str(self.path))
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                id BIGINT,
+                title VARCHAR,
+                link VARCHAR,
+                published VARCHAR,
+                source VARCHAR,
+                sentiment DOUBLE,
+                category VARCHAR,
+                alert_mask INTEGER,
+                created_at TIMESTAMP
+            )
+            """
+        )
+        # Son eşitlemede görülen article_changes sayacı
+        self._conn.execute("CREATE TABLE IF NOT EXISTS mirror_state (name VARCHAR PRIMARY KEY, value BIGINT)")
+
+    def _insert(self, rows: list) -> None:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            self._conn.executemany(
+                f"INSERT INTO articles VALUES ({', '.join('?' * len(MIRROR_COLUMNS))})", rows
+            )
+            return
+        batch = pa.table({name: pa.array(values) for name, values in zip(MIRROR_COLUMNS, zip(*rows))})
+        self._conn.register("mirror_batch", batch)
+        try:
+            self._conn.execute(
+                f"INSERT INTO articles SELECT {', '.join(MIRROR_COLUMNS[:-1])}, "
+                "try_cast(created_at AS TIMESTAMP) FROM mirror_batch"
+            )
+        finally:
+            self._conn.unregister("mirror_batch")
+
+    def sync(self, batch_size: int = EXPORT_BATCH_SIZE) -> int:
+        """
+        news.db'deki ve arşiv bölümlerindeki yeni satırları aynaya kopyalar;
+        kopyalanan satır sayısını döner. Önce news.db okunur, sonra arşivler:
+        arada arşive taşınan bir satır ikinci kez kopyalanmaz. Son eşitlemeden
+        sonra yerinde güncelleme olduysa ayna boşaltılıp baştan kopyalanır.
+        """
+        copied = 0
+        query = f"SELECT {', '.join(MIRROR_COLUMNS)} FROM articles WHERE id > ? ORDER BY id"
+        with self._lock, metrics.timer("sei_stage_seconds", stage="mirror_sync"):
+            with self.pool.connection() as conn:
+                updates = article_update_count(conn)
+                synced = self._conn.execute("SELECT value FROM mirror_state WHERE name = 'updates'").fetchone()
+                if synced is None or synced[0] != updates:
+                    self._conn.execute("DELETE FROM articles")
+                last_id = self._conn.execute("SELECT coalesce(max(id), 0) FROM articles").fetchone()[0]
+                for rows in iter_export_batches(conn.execute(query, (last_id,)), batch_size):
+                    self._insert(rows)
+                    copied += len(rows)
+                # Ayna geride kaldıysa son eşitlemeden sonra eklenip arşive taşınmış satırlar
+                months = [row[0] for row in list_archive_partitions(conn) if row[3] > last_id]
+                min_id = oldest_article_id(conn)
+            if months:
+                copied_ids = {
+                    row[0] for row in self._conn.execute("SELECT id FROM articles WHERE id > ?", [last_id]).fetchall()
+                }
+                for month in months:
+                    archive_conn = open_archive(month)
+                    try:
+                        for rows in iter_export_batches(archive_conn.execute(query, (last_id,)), batch_size):
+                            rows = [row for row in rows if row[0] not in copied_ids]
+                            if rows:
+                                self._insert(rows)
+                                copied += len(rows)
+                    finally:
+                        archive_conn.close()
+            self._conn.execute("DELETE FROM articles WHERE id < ?", [min_id if min_id is not None else last_id + 1])
+            self._conn.execute("INSERT OR REPLACE INTO mirror_state VALUES ('updates', ?)", [updates])
+        metrics.inc("sei_articles_total", copied, stage="mirrored")
+        return copied
+
+    def rebuild(self) -> int:
+        with self._lock:
+            self._conn.execute("DELETE FROM articles")
+        return self.sync()
+
+    def summary(self) -> tuple:
+        self.sync()
+        return self._conn.cursor().execute(
+            """
+            SELECT count(*), count(DISTINCT source),
+                   strftime(min(created_at), '%Y-%m-%d %H:%M:%S'),
+                   strftime(max(created_at), '%Y-%m-%d %H:%M:%S')
+            FROM articles
+            """
+        ).fetchone()
+
+    def most_negative(self, limit: int = 10) -> list:
+        self.sync()
+        return self._conn.cursor().execute(
+            """
+            SELECT title, source, published, sentiment, category, link
+            FROM articles
+            WHERE sentiment IS NOT NULL
+            ORDER BY sentiment ASC, id ASC
+            LIMIT ?
+            """,
+            [limit],
+        ).fetchall()
+
+    def aggregate(
+        self,
+        category: str = "all",
+        hours: Optional[int] = None,
+        granularity: str = "day",
+        min_sentiment: Optional[float] = None,
+        max_sentiment: Optional[float] = None,
+        only_alerts: bool = False,
+    ) -> tuple[List[str], list]:
+        """
+        SQLiteAnalytics.aggregate ile aynı kolonlar, ham satırlar üzerinde
+        gruplanır; bu yüzden duygu aralığı ve alarm filtresi de uygulanır.
+        Zaman penceresi özet tablolarındaki gibi kova başına yuvarlanır.
+        """
+        self.sync()
+        fmt = ROLLUP_BUCKET_FORMATS[granularity]
+        # Kova metni gruplamadan sonra üretilir: satır başına strftime pahalı
+        query = f"""
+            SELECT date_trunc('{granularity}', created_at) AS bucket, category,
+                   count(*) AS count,
+                   count(sentiment) AS sentiment_count,
+                   coalesce(sum(sentiment), 0) AS sentiment_sum,
+                   min(sentiment) AS sentiment_min,
+                   max(sentiment) AS sentiment_max
+            FROM articles
+            WHERE 1=1
+        """
+        params: list = []
+        if hours is not None:
+            start = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
+            start = start.replace(minute=0, second=0, microsecond=0)
+            if granularity == "day":
+                start = start.replace(hour=0)
+            query += " AND created_at >= ?"
+            params.append(start)
+        if category != "all":
+            query += " AND category = ?"
+            params.append(category)
+        if min_sentiment is not None:
+            query += " AND sentiment >= ?"
+            params.append(min_sentiment)
+        if max_sentiment is not None:
+            query += " AND sentiment <= ?"
+            params.append(max_sentiment)
+        if only_alerts:
+            query += " AND alert_mask != 0"
+        query += " GROUP BY ALL"
+        query = f"""
+            SELECT strftime(bucket, '{fmt}') AS bucket, category, count, sentiment_count,
+                   sentiment_sum, sentiment_min, sentiment_max
+            FROM ({query})
+            ORDER BY 1, 2
+        """
+
+        cur = self._conn.cursor()
+        cur.execute(query, params)
+        return [d[0] for d in cur.description], cur.fetchall()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_analytics(pool: SQLitePool, engine: Optional[str] = None):
+    """
+    engine (yoksa ANALYTICS_ENGINE) için analiz motorunu açar.
+    duckdb kurulu değilse ya da ayna dosyası başka süreçte açıksa uyarı
+    basar ve SQLite'a düşer.
+    """
+    engine = engine or ANALYTICS_ENGINE
+    if engine == "duckdb":
+        try:
+            return DuckDBAnalytics(pool)
+        except ImportError:
+            print("[WARN] duckdb kurulu değil (pip install duckdb), SQLite kullanılıyor")
+        except Exception as e:
+            print(f"[WARN] DuckDB aynası açılamadı ({DUCKDB_PATH}): {e}; SQLite kullanılıyor")
+    elif engine != "sqlite":
+        print(f"[WARN] Bilinmeyen analiz motoru: {engine}; SQLite kullanılıyor")
+    return SQLiteAnalytics(pool)
+
+
+class ArticleStorage:
+    """
+    Depolama katmanı: yazma ve satır okuma bağlantı havuzlu SQLite'ta,
+    toplama sorguları (özet, en negatifler, kova / kategori serileri)
+    seçilen analiz motorunda (ANALYTICS_ENGINE).
+    """
+
+    def __init__(self, engine: Optional[str] = None, pool_size: Optional[int] = None, profile: Optional[str] = None):
+        self.pool = SQLitePool(size=pool_size, profile=profile)
+        # Göçler okuma bağlantıları açılmadan uygulanır
+        with self.pool.writer():
+            pass
+        self.analytics = open_analytics(self.pool, engine)
+
+    def save_articles(self, articles: List[Article]) -> None:
+        with self.pool.writer() as conn:
+            save_articles(conn, articles)
+
+    def summary(self) -> tuple:
+        return self.analytics.summary()
+
+    def most_negative(self, limit: int = 10) -> list:
+        return self.analytics.most_negative(limit)
+
+    def aggregate(self, category: str = "all", hours: Optional[int] = None, granularity: str = "day", **filters):
+        return self.analytics.aggregate(category=category, hours=hours, granularity=granularity, **filters)
+
+    def close(self) -> None:
+        self.analytics.close()
+        self.pool.close()
+
+
+def print_db_summary(storage: Optional[ArticleStorage] = None) -> None:
+    """
+    Veritabanı hakkında basit bir özet basar:
+    - Toplam haber sayısı
+    - Farklı kaynak sayısı
+    - İlk ve son kayıt tarihi
+    storage verilmezse geçici bir ArticleStorage açılır.
+    """
+    own = storage is None
+    storage = storage or ArticleStorage()
+    total, sources, earliest, latest = storage.summary()
+
+    print("=== Veritabanı Özeti ===")
+    print(f"Toplam kayıtlı haber : {total}")
+    print(f"Farklı kaynak sayısı : {sources}")
+    print(f"İlk kayıt tarihi     : {earliest}")
+    print(f"Son kayıt tarihi     : {latest}")
+    print()
+
+    if own:
+        storage.close()
+
+def print_most_negative(limit: int = 10, storage: Optional[ArticleStorage] = None) -> None:
+    """
+    Veritabanındaki en negatif (en düşük sentiment) haberleri listeler.
+    """
+    own = storage is None
+    storage = storage or ArticleStorage()
+    rows = storage.most_negative(limit)
+    if own:
+        storage.close()
+
+    if not rows:
+        print("Veritabanında kayıtlı haber yok veya sentiment verisi yok.")
+        return
+
+    print(f"=== En negatif {len(rows)} haber ===")
+    for i, (title, source, published, sentiment, category, link) in enumerate(rows, start=1):
+        print("-" * 80)
+        print(f"#{i}")
+        print(f"Kaynak   : {source}")
+        print(f"Tarih    : {published}")
+        print(f"Kategori : {category}")
+        print(f"Duygu    : {sentiment:.3f}")
+        print(f"Başlık   : {title}")
+        print(f"Link     : {link}")
+    print()
+
+def print_summary_verification() -> bool:
+    """
+    report --verify: özet istatistiklerini ham satırlardan (news.db + arşiv)
+    yeniden hesaplayıp karşılaştırır, farkları basar. Fark yoksa True döner.
+    """
+    conn = init_db()
+    start = time.perf_counter()
+    drift = verify_summary_stats(conn)
+    seconds = time.perf_counter() - start
+    conn.close()
+
+    print("=== Özet istatistikleri doğrulaması ===")
+    print(f"Ham satırlardan yeniden hesaplandı ({seconds:.2f}s)")
+    for name, stats_value, raw_value in drift:
+        if isinstance(stats_value, list):
+            differing = len(set(stats_value) ^ set(raw_value))
+            print(f"[WARN] {name}: {differing} haber farklı (özet {len(stats_value)}, ham {len(raw_value)} satır)")
+        else:
+            print(f"[WARN] {name}: özet {stats_value}, ham {raw_value}")
+    if drift:
+        print("Düzeltmek için: python sei_news_analyzer.py backfill all")
+    else:
+        print("Fark yok.")
+    print()
+    return not drift
+
+
+def print_recent_by_category(category: str = "conflict", hours: int = 24, limit: int = 20) -> None:
+    """
+    Son X saatte eklenmiş, belirtilen kategoriye ait haberleri
+    en negatiften başlayarak listeler.
+
+    category:
+      - 'conflict', 'economy', 'politics', 'technology', 'other'
+      - veya 'all' → kategori filtrelemez
+
+    hours:
+      - Kaç saat geriye bakılacağı (created_at alanına göre);
+        pencere arşivlenmiş aylara uzanıyorsa o bölümler de okunur
+    """
+    conn = init_db()
+    cur = conn.cursor()
+
+    query, params = build_recent_query(category, hours, limit)
+    cur.execute(query, params)
+
+    rows = cur.fetchall()
+    archived = query_archives(conn, query, params, hours)
+    if archived:
+        rows = heapq.nsmallest(limit, archived + rows, key=lambda row: row[3])
+    if not rows:
+        print(f"Son {hours} saatte bu kritere uyan haber yok. (kategori: {category})")
+        conn.close()
+        return
+
+    print(f"=== Son {hours} saatin en negatif {len(rows)} haberi (kategori: {category}) ===")
+    for i, (title, source, published, sentiment, cat, link, created_at) in enumerate(rows, start=1):
+        print("-" * 80)
+        print(f"#{i}")
+        print(f"Kaynak     : {source}")
+        print(f"Kategori   : {cat}")
+        print(f"Duygu      : {sentiment:.3f}")
+        print(f"Yayın tarihi : {published}")
+        print(f"Kayıt tarihi : {created_at}")
+        print(f"Başlık     : {title}")
+        print(f"Link       : {link}")
+    print()
+
+    conn.close()
+
+def iter_export_batches(cur: sqlite3.Cursor, batch_size: int = EXPORT_BATCH_SIZE):
+    """Sorgu sonucunu fetchmany ile parça parça verir (bellek sabit kalır)."""
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def iter_spanning_batches(
+    conn: sqlite3.Connection,
+    query: str,
+    params: list,
+    hours: Optional[int] = None,
+    since_id: Optional[int] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    Export partileri id sırasıyla: news.db ve arşiv bölümleri aynı anda
+    okunur, heapq.merge ile birleştirilir (sorgu build_export_query'deki gibi
+    id sıralı olmalı). Tam export'ta pencereyle kesişen bölümler, artımlı
+    export'ta (since_id) sadece since_id'den büyük id içeren (son export'tan
+    sonra eklenip arşive taşınmış) bölümler okunur. Okurken arşive taşınan
+    bir satır iki kez verilmez.
+    """
+    months = [row[0] for row in list_archive_partitions(conn, hours) if since_id is None or row[3] > since_id]
+    if not months:
+        yield from iter_export_batches(conn.execute(query, params), batch_size)
+        return
+
+    archive_conns = [open_archive(month) for month in months]
+    try:
+        streams = [
+            (row for rows in iter_export_batches(source.execute(query, params), batch_size) for row in rows)
+            for source in [conn, *archive_conns]
+        ]
+        batch: list = []
+        last_id = None
+        for row in heapq.merge(*streams, key=lambda row: row[0]):
+            if row[0] == last_id:
+                continue
+            last_id = row[0]
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        for archive_conn in archive_conns:
+            archive_conn.close()
+
+
+def export_state_key(filename: str, category: str = "all", hours: Optional[int] = None) -> str:
+    """export_state anahtarı: aynı dosyaya farklı filtrelerle yapılan export'lar karışmasın."""
+    return f"{filename}|{category}|{hours if hours is not None else 'all'}"
+
+
+def load_export_state(conn: sqlite3.Connection, name: str) -> Optional[int]:
+    """Bu dosyaya (ve filtrelere) en son yazılan id; hiç export yapılmadıysa None."""
+    row = conn.execute("SELECT last_id FROM export_state WHERE name = ?", (name,)).fetchone()
+    return row[0] if row and row[0] is not None else None
+
+
+def save_export_state(conn: sqlite3.Connection, name: str, last_id: int, rows: int, append: bool = False) -> None:
+    """Tam export durumu baştan yazar, artımlı export satır sayısına ekler."""
+    with conn:
+        conn.execute(
+            f"""
+            INSERT INTO export_state (name, last_id, rows, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(name) DO UPDATE SET
+                last_id = excluded.last_id,
+                rows = {"export_state.rows + " if append else ""}excluded.rows,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (name, last_id, rows),
+        )
+
+
+def export_to_csv(
+    filename: str = "news_export.csv",
+    category: str = "all",
+    hours: Optional[int] = None,
+    incremental: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    """
+    Kayıtlı haberleri bir CSV dosyasına aktarır ve yazılan satır sayısını döner.
+    Dosya proje klasöründe oluşur. Satırlar fetchmany ile parça parça
+    yazıldığı için bellek kullanımı tablo boyutundan bağımsızdır.
+    Tam export önce .tmp dosyasına yazılır, bitince yerine taşınır ve son
+    yazılan id export_state'e (dosya + filtreler) kaydedilir.
+    incremental True ise sadece son export'tan sonra eklenen haberler
+    dosyanın sonuna eklenir; dosya ya da aynı filtrelerle yapılmış bir
+    export kaydı yoksa baştan yazılır. Satırlar iki yolda da id sırasıyla.
+    Arşiv bölümlerindeki haberler de aktarılır (iter_spanning_batches).
+    """
+    conn = init_db()
+    out_path = Path(__file__).parent / filename
+    state_key = export_state_key(filename, category, hours)
+
+    state = load_export_state(conn, state_key) if incremental else None
+    append = state is not None and out_path.exists() and out_path.stat().st_size > 0
+    since_id = state if append else None
+
+    query, params = build_export_query(category, hours, since_id)
+
+    target = out_path if append else out_path.with_name(out_path.name + ".tmp")
+    written = 0
+    last_id = since_id
+    try:
+        with target.open("a" if append else "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if not append:
+                writer.writerow(EXPORT_COLUMNS)
+            for rows in iter_spanning_batches(conn, query, params, hours, since_id, batch_size):
+                writer.writerows(row[1:] for row in rows)
+                written += len(rows)
+                last_id = rows[-1][0]
+    except BaseException:
+        if not append:
+            target.unlink(missing_ok=True)
+        conn.close()
+        raise
+
+    if not written:
+        if not append:
+            target.unlink(missing_ok=True)
+        conn.close()
+        print("Son export'tan sonra yeni haber yok." if incremental else "Veritabanında export edilecek haber yok.")
+        return 0
+
+    if not append:
+        target.replace(out_path)
+    save_export_state(conn, state_key, last_id, written, append=append)
+
+    conn.close()
+    print(f"CSV dosyası {'güncellendi' if append else 'oluşturuldu'}: {out_path} ({written} satır)")
+    return written
+
+
+# Kolonlu export dosya uzantıları -> biçim
+COLUMNAR_EXPORT_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def export_to_columnar(
+    filename: str = "news_export.parquet",
+    category: str = "all",
+    hours: Optional[int] = None,
+    incremental: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    """
+    Haberleri Parquet ya da Arrow IPC dosyasına aktarır (biçim uzantıdan seçilir).
+    Her fetchmany partisi ayrı bir row group / record batch olarak yazılır,
+    böylece bellek sabit kalır ve okuyucular dosyayı parça parça tarayabilir.
+    Son yazılan id export_state'e (dosya + filtreler) kaydedilir.
+    incremental True ise son export'tan sonraki haberler ayrı bir parça
+    dosyasına yazılır: news_export.parquet -> news_export.<önceki_son_id + 1>.parquet
+    (hepsi birlikte tek bir dataset olarak okunabilir). Aynı filtrelerle
+    yapılmış bir export kaydı yoksa ana dosya baştan yazılır; tam export
+    eski parça dosyalarını siler. Satırlar iki yolda da id sırasıyla.
+    Arşiv bölümlerindeki haberler de aktarılır (iter_spanning_batches).
+    pyarrow opsiyoneldir; kurulu değilse uyarı basılır.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("[WARN] Parquet/Arrow export için pyarrow gerekli: pip install pyarrow")
+        return 0
+
+    out_path = Path(__file__).parent / filename
+    fmt = COLUMNAR_EXPORT_FORMATS.get(out_path.suffix.lower(), "parquet")
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("title", pa.string()),
+            ("summary", pa.string()),
+            ("link", pa.string()),
+            ("published", pa.string()),
+            ("source", pa.string()),
+            ("sentiment", pa.float64()),
+            ("category", pa.string()),
+            ("created_at", pa.timestamp("s")),
+        ]
+    )
+
+    conn = init_db()
+    state_key = export_state_key(filename, category, hours)
+    since_id = load_export_state(conn, state_key) if incremental else None
+    append = since_id is not None
+    base_path = out_path
+    if append:
+        out_path = out_path.with_name(f"{out_path.stem}.{since_id + 1}{out_path.suffix}")
+
+    query, params = build_export_query(category, hours, since_id)
+
+    target = out_path.with_name(out_path.name + ".tmp")
+    writer = None
+    written = 0
+    last_id = since_id
+    try:
+        for rows in iter_spanning_batches(conn, query, params, hours, since_id, batch_size):
+            columns = list(zip(*rows))
+            arrays = [pa.array(col, type=field.type) for col, field in zip(columns[:-1], schema)]
+            # SQLite CURRENT_TIMESTAMP metni -> gerçek zaman damgası
+            arrays.append(
+                pc.strptime(
+                    pa.array(columns[-1], type=pa.string()),
+                    format="%Y-%m-%d %H:%M:%S",
+                    unit="s",
+                    error_is_null=True,
+                )
+            )
+            batch = pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+            if writer is None:
+                if fmt == "parquet":
+                    writer = pq.ParquetWriter(target, schema, compression="zstd")
+                else:
+                    writer = pa.ipc.new_file(target, schema)
+            writer.write_batch(batch)
+            written += len(rows)
+            last_id = rows[-1][0]
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        target.unlink(missing_ok=True)
+        conn.close()
+        raise
+
+    if writer is None:
+        conn.close()
+        print("Son export'tan sonra yeni haber yok." if incremental else "Veritabanında export edilecek haber yok.")
+        return 0
+
+    writer.close()
+    if not append:
+        # Önceki tam export'un parçaları yeni dosyayla aynı satırları tekrar vermesin
+        part = re.compile(rf"{re.escape(base_path.stem)}\.\d+{re.escape(base_path.suffix)}")
+        for path in base_path.parent.glob(f"{base_path.stem}.*{base_path.suffix}"):
+            if part.fullmatch(path.name):
+                path.unlink()
+    target.replace(out_path)
+    save_export_state(conn, state_key, last_id, written, append=append)
+
+    conn.close()
+    print(f"{fmt.capitalize()} dosyası oluşturuldu: {out_path} ({written} satır)")
+    return written
+
+
+def export_articles(
+    filename: str = "news_export.csv",
+    category: str = "all",
+    hours: Optional[int] = None,
+    incremental: bool = False,
+) -> int:
+    """Dosya uzantısına göre CSV ya da kolonlu (Parquet / Arrow) export seçer."""
+    if Path(filename).suffix.lower() in COLUMNAR_EXPORT_FORMATS:
+        return export_to_columnar(filename, category=category, hours=hours, incremental=incremental)
+    return export_to_csv(filename, category=category, hours=hours, incremental=incremental)
+
+
+def cache_max_age(headers) -> Optional[float]:
+    """
+    Yanıtın ne kadar süre taze sayılacağını (saniye) döner:
+    önce Cache-Control max-age, yoksa Expires - Date. Bilgi yoksa None.
+    """
+    cache_control = headers.get("Cache-Control", "")
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return None
+    match = re.search(r"max-age=(\d+)", cache_control)
+    if match:
+        return float(match.group(1))
+
+    expires = headers.get("Expires")
+    if not expires:
+        return None
+    try:
+        expires_at = parsedate_to_datetime(expires)
+        date = headers.get("Date")
+        now = parsedate_to_datetime(date) if date else datetime.now(timezone.utc)
+        return max(0.0, (expires_at - now).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def download_feed(
+    url: str,
+    timeout: float = FETCH_TIMEOUT,
+    cache: Optional[FeedCacheEntry] = None,
+    name: Optional[str] = None,
+) -> FeedFetch:
+    """
+    Tek bir RSS kaynağını indirip feedparser ile parse eder.
+    feedparser.parse(url) zaman aşımı desteklemediği için indirme
+    requests ile yapılır; hata olursa feed None olur.
+
+    cache verilirse ETag / Last-Modified başlıkları gönderilir.
+    Sunucu 304 dönerse gövde indirilmez, parse edilmez ve feed None olur.
+    cache burada sadece okunur: yeni doğrulayıcılar FeedFetch ile döner,
+    çağıran sonucu kullanırsa FeedCacheEntry.apply ile yazar.
+    İndirme süresi ve sonucu name (yoksa url) etiketiyle metriklere yazılır.
+    """
+    feed_label = name or url
+    headers: Dict[str, str] = {}
+    if cache is not None:
+        if cache.etag:
+            headers["If-None-Match"] = cache.etag
+        if cache.last_modified:
+            headers["If-Modified-Since"] = cache.last_modified
+
+    start = time.perf_counter()
+    try:
+        resp = requests.get(url, timeout=timeout, headers=headers)
+        metrics.observe("sei_fetch_seconds", time.perf_counter() - start, feed=feed_label)
+        metrics.inc("sei_fetch_total", feed=feed_label, status=resp.status_code)
+        result = FeedFetch(status=resp.status_code, max_age=cache_max_age(resp.headers))
+        if resp.status_code == 304:
+            return result
+        resp.raise_for_status()
+    except Exception as e:
+        if not isinstance(e, requests.HTTPError):
+            metrics.observe("sei_fetch_seconds", time.perf_counter() - start, feed=feed_label)
+            metrics.inc("sei_fetch_total", feed=feed_label, status="error")
+            result = FeedFetch(status=0)
+        print(f"[WARN] Kaynak indirilemedi ({url}): {e}")
+        return result
+
+    result.etag = resp.headers.get("ETag")
+    result.last_modified = resp.headers.get("Last-Modified")
+    result.size = len(resp.content)
+    with metrics.timer("sei_stage_seconds", stage="parse"):
+        result.feed = feedparser.parse(resp.content, response_headers=dict(resp.headers))
+    return result
+
+
+def fetch_feeds_concurrently(
+    feeds: Dict[str, str],
+    max_workers: int = FETCH_MAX_WORKERS,
+    timeout: float = FETCH_TIMEOUT,
+    deadline: float = FETCH_CYCLE_DEADLINE,
+) -> Dict[str, FeedFetch]:
+    """
+    Kaynakları thread havuzunda paralel indirir; her kaynak için bir
+    FeedFetch döner (parse edilmiş kaynak FeedFetch.feed'de).
+    Döngü süresi kaynakların toplamına değil en yavaş kaynağa bağlıdır.
+    deadline içinde bitmeyen kaynaklar bu döngüde FETCH_STATUS_TIMEOUT
+    durumuyla atlanır; arka planda bitseler de doğrulayıcıları feed_cache'e
+    yazılmaz, sonraki döngüde baştan indirilir. Sonuç sözlüğü feeds ile
+    aynı sırada döner (deterministik birleştirme için).
+    """
+    if not feeds:
+        return {}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(feeds))))
+    futures = {}
+    for name, url in feeds.items():
+        # Önbellek girdisi burada (ana thread'de) oluşturulur ve sadece burada
+        # güncellenir; işçiler doğrulayıcıları okur
+        cache = feed_cache.setdefault(url, FeedCacheEntry(url=url)) if USE_CONDITIONAL_GET else None
+        futures[name] = executor.submit(download_feed, url, timeout, cache, name)
+    done, not_done = wait(futures.values(), timeout=deadline)
+    # Süreyi aşan indirmeleri bekleme, bir sonraki döngüde tekrar denenir
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results: Dict[str, FeedFetch] = {}
+    for name, future in futures.items():
+        if future in not_done:
+            print(f"[WARN] {name}: döngü süre sınırı ({deadline}s) aşıldı, atlandı")
+            metrics.inc("sei_fetch_total", feed=name, status="timeout")
+            results[name] = FeedFetch(status=FETCH_STATUS_TIMEOUT)
+            continue
+        results[name] = future.result()
+        if USE_CONDITIONAL_GET:
+            feed_cache[feeds[name]].apply(results[name])
+
+    return results
+
+
+def entry_published_at(entry) -> Optional[float]:
+    """feedparser'ın çözdüğü yayın (yoksa güncelleme) zamanı, epoch saniye (UTC)."""
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if not parsed:
+        return None
+    return float(calendar.timegm(parsed))
+
+
+def feed_to_articles(
+    source_name: str,
+    feed,
+    published_at: Optional[Dict[str, float]] = None,
+) -> List[Article]:
+    """
+    Parse edilmiş kaynağın daha önce görülmemiş entry'lerini Article'a çevirir.
+    published_at verilirse link -> yayın zamanı (epoch) da doldurulur.
+    """
+    articles: List[Article] = []
+    for entry in feed.entries:
+        link = getattr(entry, "link", None)
+        if not link or seen_links.check_and_add(link):
+            continue
+
+        title = getattr(entry, "title", "")
+        summary = getattr(entry, "summary", "")
+        published = str(getattr(entry, "published", ""))
+
+        articles.append(
+            Article(
+                title=title,
+                summary=summary,
+                link=link,
+                published=published,
+                source=source_name,
+            )
+        )
+        if published_at is not None:
+            ts = entry_published_at(entry)
+            if ts is not None:
+                published_at[link] = ts
+    return articles
+
+
+def fetch_latest_articles(
+    max_workers: int = FETCH_MAX_WORKERS,
+    timeout: float = FETCH_TIMEOUT,
+    deadline: float = FETCH_CYCLE_DEADLINE,
+    conn: Optional[sqlite3.Connection] = None,
+    feeds: Optional[Dict[str, str]] = None,
+    fetches: Optional[Dict[str, FeedFetch]] = None,
+) -> List[Article]:
+    """
+    RSS kaynaklarından yeni haberleri çeker.
+    conn verilirse bellek indeksinde olmayan linkler veritabanında da
+    kontrol edilir; kayıtlı haberler tekrar analiz edilmez.
+    feeds verilirse sadece o kaynaklar çekilir (zamanlayıcı vadesi
+    gelenleri verir), yoksa tüm RSS_FEEDS.
+    fetches verilirse kaynak adı -> FeedFetch (durum, max-age) ile
+    doldurulur; zamanlayıcı bunu record_cycle'a verir.
+    """
+    articles: List[Article] = []
+    if feeds is None:
+        feeds = RSS_FEEDS
+
+    results = fetch_feeds_concurrently(
+        feeds, max_workers=max_workers, timeout=timeout, deadline=deadline
+    )
+    if fetches is not None:
+        fetches.update(results)
+
+    dedup_start = time.perf_counter()
+    fetched = 0
+
+    # Sonuçlar feeds sırasıyla birleştirilir
+    for source_name, url in feeds.items():
+        print(f"\n[DEBUG] Kaynak kontrol ediliyor: {source_name} ({url})")
+        feed = results[source_name].feed
+        if feed is None:
+            if results[source_name].status == 304:
+                print("[DEBUG]  -> Değişiklik yok (304), parse atlandı")
+            continue
+
+        # Hata kontrolü
+        if getattr(feed, "bozo", 0):
+            print("[DEBUG]  -> Hata (bozo):", feed.bozo_exception)
+
+        print("[DEBUG]  -> Entry sayısı:", len(getattr(feed, "entries", [])))
+
+        fetched += len(feed.entries)
+        articles.extend(feed_to_articles(source_name, feed))
+
+    if conn is not None and articles:
+        known = known_links_in_db(conn, (a.link for a in articles))
+        if known:
+            print(f"[DEBUG] Veritabanında zaten kayıtlı, atlanan: {len(known)}")
+            articles = [a for a in articles if a.link not in known]
+
+    metrics.observe("sei_stage_seconds", time.perf_counter() - dedup_start, stage="dedup")
+    metrics.inc("sei_articles_total", fetched, stage="fetched")
+    metrics.inc("sei_articles_total", len(articles), stage="new")
+
+    if USE_CONDITIONAL_GET:
+        not_modified = sum(1 for fetch in results.values() if fetch.status == 304)
+        print(f"[DEBUG] Değişmeyen (304) kaynak sayısı: {not_modified}/{len(feeds)}")
+
+    print(f"[DEBUG] Toplam yeni article sayısı: {len(articles)}")
+    return articles
+
+@dataclass
+class FeedSchedule:
+    """Zamanlayıcıda bir kaynağın durumu."""
+    name: str
+    url: str
+    interval: float
+    next_due: float = 0.0
+    last_poll: Optional[float] = None
+    avg_new: float = 0.0  # kontrol başına yeni haber (üstel ortalama)
+    avg_gap: float = 0.0  # kontroller arası süre (üstel ortalama, saniye)
+    rate: float = 0.0  # avg_new / avg_gap: yeni haber / saniye
+    polls: int = 0
+    new_items: int = 0
+
+
+class FeedScheduler:
+    """
+    Kaynak başına bir sonraki kontrol zamanını tutan min-heap.
+
+    Her kontrolden sonra aralık, kaynağın yeni haber hızına göre yeniden
+    hesaplanır: hedef, kontrol başına ~SCHEDULER_TARGET_NEW_ITEMS yeni haber.
+    Hızlı kaynaklar sık, sessiz kaynaklar seyrek kontrol edilir.
+    Sunucu Cache-Control max-age / Expires ile tazelik süresi bildiriyorsa
+    bu süreden önce tekrar sorulmaz; hata veren kaynaklar geri çekilir.
+    Aralıklar [min_interval, max_interval] ile sınırlanır ve jitter eklenir.
+    """
+
+    def __init__(
+        self,
+        feeds: Dict[str, str],
+        initial_interval: float = 60.0,
+        min_interval: float = SCHEDULER_MIN_INTERVAL,
+        max_interval: float = SCHEDULER_MAX_INTERVAL,
+        jitter: float = SCHEDULER_JITTER,
+        clock=time.monotonic,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.clock = clock
+        self.feeds: Dict[str, FeedSchedule] = {}
+        self._heap: List[tuple[float, str]] = []
+
+        self.initial_interval = self._clamp(initial_interval)
+        # İlk turda hepsi hemen çekilir
+        self.set_feeds(feeds)
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def set_feeds(self, feeds: Dict[str, str]) -> None:
+        """
+        İzlenen kaynak kümesini değiştirir (paylaşım değişince): yeni kaynaklar
+        hemen vadeli eklenir, çıkanların heap girdileri pop_due'da atlanır.
+        """
+        now = self.clock()
+        for name in list(self.feeds):
+            if name not in feeds:
+                del self.feeds[name]
+        for name, url in feeds.items():
+            if name not in self.feeds:
+                self.feeds[name] = FeedSchedule(name=name, url=url, interval=self.initial_interval, next_due=now)
+                heapq.heappush(self._heap, (now, name))
+
+    def pop_due(self, coalesce: float = SCHEDULER_COALESCE) -> Dict[str, str]:
+        """Vadesi gelmiş (ya da coalesce saniye içinde gelecek) kaynakları heap'ten çıkarır."""
+        limit = self.clock() + coalesce
+        due: Dict[str, str] = {}
+        while self._heap and self._heap[0][0] <= limit:
+            next_due, name = heapq.heappop(self._heap)
+            state = self.feeds.get(name)
+            # Çıkarılmış kaynak ya da yeniden eklenmiş kaynağın eski girdisi
+            if state is None or state.next_due != next_due:
+                continue
+            due[name] = state.url
+        return due
+
+    def seconds_until_next(self) -> float:
+        if not self._heap:
+            return self.max_interval
+        return max(0.0, self._heap[0][0] - self.clock())
+
+    def next_interval(
+        self,
+        state: FeedSchedule,
+        new_items: int,
+        status: int = 200,
+        max_age: Optional[float] = None,
+    ) -> float:
+        now = self.clock()
+        failed = status not in (200, 304)
+        # Başarısız kontrol haber sayısı hakkında bilgi vermez ("0 yeni" değildir):
+        # hız güncellenmez, birikenler bir sonraki başarılı kontrolde tüm süreye sayılır
+        if state.last_poll is not None and not failed:
+            # Hız, sayı ve süre ortalamalarının oranı: tek tek k/süre oranlarını
+            # ortalamak boş kontrollerden sonra aralığı gereğinden fazla uzatır
+            gap = max(now - state.last_poll, 1.0)
+            if state.avg_gap == 0:
+                state.avg_new, state.avg_gap = float(new_items), gap
+            else:
+                state.avg_new += SCHEDULER_RATE_SMOOTHING * (new_items - state.avg_new)
+                state.avg_gap += SCHEDULER_RATE_SMOOTHING * (gap - state.avg_gap)
+            state.rate = state.avg_new / state.avg_gap
+
+        if failed:
+            # Hata / zaman aşımı: hızdan bağımsız olarak geri çekil
+            interval = state.interval * 2
+        elif state.last_poll is None:
+            # İlk kontrolde eldeki haberler birikmiş olabilir, hız bilinmiyor
+            interval = state.interval
+        elif state.rate > 0:
+            interval = SCHEDULER_TARGET_NEW_ITEMS / state.rate
+        else:
+            interval = self.max_interval
+
+        if max_age:
+            interval = max(interval, max_age)
+        interval = self._clamp(interval)
+
+        state.interval = interval
+        if not failed:
+            state.last_poll = now
+        state.polls += 1
+        state.new_items += new_items
+        # Jitter sadece bir sonraki vadeye uygulanır, tutulan aralığa değil
+        return self._clamp(interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def record(self, name: str, new_items: int, status: int = 200, max_age: Optional[float] = None) -> float:
+        """Kontrol sonucunu işler, kaynağı yeni vadesiyle heap'e geri koyar; vadeye kalan süreyi döner."""
+        state = self.feeds.get(name)
+        if state is None:
+            # Çekilirken paylaşımdan çıkmış kaynak
+            return 0.0
+        delay = self.next_interval(state, new_items, status=status, max_age=max_age)
+        state.next_due = self.clock() + delay
+        heapq.heappush(self._heap, (state.next_due, name))
+        return delay
+
+    def record_feed(self, name: str, new_items: int, fetch: Optional[FeedFetch]) -> float:
+        """
+        Kaynağın bu kontroldeki sonucunu (durum, max-age) record'a verir.
+        fetch None ise (çekme aşaması hata verdi) bağlantı hatası sayılır.
+        """
+        if name not in self.feeds:
+            return 0.0
+        fetch = fetch or FeedFetch(status=0)
+        delay = self.record(name, new_items, status=fetch.status, max_age=fetch.max_age)
+        print(f"[DEBUG] {name}: {new_items} yeni, durum {fetch.status}, sonraki kontrol {delay:.0f}s sonra")
+        return delay
+
+    def record_cycle(self, feeds: Dict[str, str], articles: List[Article], fetches: Dict[str, FeedFetch]) -> None:
+        """fetch_latest_articles turunun sonuçlarını (fetches: kaynak adı -> FeedFetch) kaynak başına işler."""
+        counts: Dict[str, int] = {}
+        for a in articles:
+            counts[a.source] = counts.get(a.source, 0) + 1
+        for name in feeds:
+            self.record_feed(name, counts.get(name, 0), fetches.get(name))
+
+
+class HashRing:
+    """
+    Tutarlı özet halkası: her düğüm halkaya vnodes noktayla yerleşir, bir
+    anahtar saat yönünde ilk noktanın düğümüne düşer. Düğüm eklenip
+    çıkınca sadece o düğümün payı yer değiştirir, diğer kaynaklar
+    sahiplerinde kalır (ETag önbelleği ve zamanlama durumu boşa gitmez).
+    """
+
+    def __init__(self, nodes: Iterable[str], vnodes: int = SHARD_VIRTUAL_NODES):
+        points = sorted((self._hash(f"{node}#{i}"), node) for node in set(nodes) for i in range(vnodes))
+        self._points = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    @staticmethod
+    def _hash(text: str) -> int:
+        return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        i = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._nodes[i]
+
+
+class ShardCoordinator:
+    """
+    Paylaşımlı toplamada bir işçinin news.db üzerinden koordinasyonu.
+
+    - shard_workers: işçi başına kalp atışı; lease_seconds boyunca atmayan
+      işçi ölü sayılır.
+    - shard_leases : kaynak başına kira. İşçi halkada kendine düşen
+      kaynakları kiralar, düşmeyenleri bırakır; süresi dolmamış başka bir
+      kiranın kaynağını almaz, böylece geçişte bir kaynak iki işçide çekilmez.
+    tick() her heartbeat_interval'da bir kalp atışı yazar ve paylaşımı
+    yeniden hesaplar; bir işçi ölünce ya da katılınca kaynaklar en geç
+    lease_seconds + heartbeat_interval içinde yeniden dağılır.
+    Bağlantı çağıranın (main_loop kayıt thread'i) bağlantısıdır.
+    Süreler verilmezse SHARD_HEARTBEAT_INTERVAL / SHARD_LEASE_SECONDS kullanılır.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        worker_id: Optional[str] = None,
+        heartbeat_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        clock=time.time,
+    ):
+        self.conn = conn
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.heartbeat_interval = heartbeat_interval or SHARD_HEARTBEAT_INTERVAL
+        self.lease_seconds = lease_seconds or SHARD_LEASE_SECONDS
+        self.clock = clock
+        self.started_at = clock()
+        self.owned: Dict[str, str] = {}
+        self.ring: Optional[HashRing] = None
+        self._last_beat: Optional[float] = None
+
+    def heartbeat(self) -> None:
+        now = self.clock()
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO shard_workers (worker_id, host, pid, started_at, heartbeat_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (worker_id) DO UPDATE SET
+                    host = excluded.host, pid = excluded.pid, heartbeat_at = excluded.heartbeat_at
+                """,
+                (self.worker_id, socket.gethostname(), os.getpid(), self.started_at, now),
+            )
+
+    def live_workers(self) -> List[str]:
+        cur = self.conn.execute(
+            "SELECT worker_id FROM shard_workers WHERE heartbeat_at >= ? ORDER BY worker_id",
+            (self.clock() - self.lease_seconds,),
+        )
+        return [row[0] for row in cur.fetchall()]
+
+    def claim(self, feeds: Dict[str, str]) -> Dict[str, str]:
+        """Halkada bu işçiye düşen kaynakları kiralar; kirası alınabilenleri döner."""
+        ring = self.ring = HashRing(self.live_workers())
+        mine = [name for name in feeds if ring.owner(name) == self.worker_id]
+        now = self.clock()
+
+        with self.conn:
+            # Artık bu işçiye düşmeyen kaynaklar hemen bırakılır, yeni sahibi beklemesin
+            placeholders = ",".join("?" * len(mine))
+            self.conn.execute(
+                f"DELETE FROM shard_leases WHERE worker_id = ? AND feed NOT IN ({placeholders})",
+                [self.worker_id, *mine],
+            )
+            self.conn.executemany(
+                """
+                INSERT INTO shard_leases (feed, worker_id, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (feed) DO UPDATE SET
+                    worker_id = excluded.worker_id, expires_at = excluded.expires_at
+                WHERE shard_leases.worker_id = excluded.worker_id OR shard_leases.expires_at < ?
+                """,
+                [(name, self.worker_id, now + self.lease_seconds, now) for name in mine],
+            )
+            leased = {
+                row[0]
+                for row in self.conn.execute("SELECT feed FROM shard_leases WHERE worker_id = ?", (self.worker_id,))
+            }
+        return {name: feeds[name] for name in mine if name in leased}
+
+    def tick(self, feeds: Dict[str, str], force: bool = False) -> Optional[Dict[str, str]]:
+        """
+        Vakti geldiyse kalp atışı yazar ve paylaşımı yeniler.
+        Bu işçinin kaynakları değiştiyse yeni kümeyi, değişmediyse None döner.
+        """
+        now = self.clock()
+        if not force and self._last_beat is not None and now - self._last_beat < self.heartbeat_interval:
+            return None
+        self._last_beat = now
+        self.heartbeat()
+        owned = self.claim(feeds)
+        if owned == self.owned:
+            return None
+
+        added = sorted(set(owned) - set(self.owned))
+        removed = sorted(set(self.owned) - set(owned))
+        print(
+            f"[SHARD] {self.worker_id}: {len(owned)}/{len(feeds)} kaynak "
+            f"(+{len(added)} -{len(removed)}, canlı işçi: {len(self.live_workers())})"
+        )
+        self.owned = owned
+        return owned
+
+    def owns(self, key: str) -> bool:
+        """Son paylaşımda key bu işçiye mi düştü (tek işçide çalışması gereken işler için)."""
+        return self.ring is not None and self.ring.owner(key) == self.worker_id
+
+    def seconds_until_heartbeat(self) -> float:
+        if self._last_beat is None:
+            return 0.0
+        return max(0.0, self._last_beat + self.heartbeat_interval - self.clock())
+
+    def leave(self) -> None:
+        """Düzgün kapanışta kiraları ve kaydı siler; kaynaklar lease süresini beklemeden dağılır."""
+        with self.conn:
+            self.conn.execute("DELETE FROM shard_leases WHERE worker_id = ?", (self.worker_id,))
+            self.conn.execute("DELETE FROM shard_workers WHERE worker_id = ?", (self.worker_id,))
+
+
+def print_shard_status() -> None:
+    """İşçileri (canlı / ölü, son kalp atışı) ve kaynak kiralarını yazdırır."""
+    conn = init_db()
+    now = time.time()
+    workers = conn.execute(
+        "SELECT worker_id, host, pid, heartbeat_at FROM shard_workers ORDER BY worker_id"
+    ).fetchall()
+    if not workers:
+        print("Kayıtlı işçi yok. ('worker' moduyla başlatılır)")
+        conn.close()
+        return
+
+    leases: Dict[str, List[str]] = {}
+    for feed, worker_id, expires_at in conn.execute(
+        "SELECT feed, worker_id, expires_at FROM shard_leases ORDER BY feed"
+    ):
+        if expires_at >= now:
+            leases.setdefault(worker_id, []).append(feed)
+
+    print(f"{'işçi':32s} {'durum':>6} {'son atış (s)':>13} {'kaynak':>7}")
+    for worker_id, host, pid, heartbeat_at in workers:
+        age = now - (heartbeat_at or 0)
+        state = "canlı" if age <= SHARD_LEASE_SECONDS else "ölü"
+        print(f"{worker_id:32s} {state:>6} {age:>13.1f} {len(leases.get(worker_id, [])):>7}")
+
+    leased = sum(len(v) for v in leases.values())
+    unowned = [name for name in RSS_FEEDS if not any(name in v for v in leases.values())]
+    print(f"\nKiralı kaynak: {leased}/{len(RSS_FEEDS)}")
+    if unowned:
+        print(f"Sahipsiz: {', '.join(unowned[:10])}{' ...' if len(unowned) > 10 else ''}")
+    conn.close()
+
+
+# Lexicon backend için polarite sözlüğü (-1 çok negatif, +1 çok pozitif).
+# Girdiler tam kelime olarak eşleşir; kök gibi kullanılanlar SENTIMENT_LEXICON_STEMS'te.
+SENTIMENT_LEXICON: Dict[str, float] = {
+    # EN - negatif
+    "war": -0.6, "kill": -0.8, "killed": -0.8, "dead": -0.7, "death": -0.7,
+    "deaths": -0.7, "die": -0.6, "died": -0.6, "murder": -0.9, "attack": -0.6,
+    "bomb": -0.8, "blast": -0.6, "explosion": -0.6, "crash": -0.6, "crisis": -0.6,
+    "disaster": -0.8, "earthquake": -0.6, "flood": -0.5, "fire": -0.4,
+    "injur": -0.6, "wound": -0.6, "victim": -0.6, "violence": -0.7, "violent": -0.7,
+    "terror": -0.9, "hostage": -0.7, "kidnap": -0.8, "abduct": -0.8, "arrest": -0.4,
+    "accus": -0.4, "fraud": -0.6, "corrupt": -0.6, "scandal": -0.5, "protest": -0.3,
+    "clash": -0.5, "threat": -0.5, "fear": -0.5, "risk": -0.3, "warn": -0.3,
+    "fail": -0.5, "failure": -0.5, "loss": -0.4, "lose": -0.4, "lost": -0.4,
+    "decline": -0.4, "drop": -0.3, "fall": -0.3, "recession": -0.6, "inflation": -0.3,
+    "poverty": -0.6, "hunger": -0.6, "famine": -0.8, "sick": -0.5, "disease": -0.5,
+    "outbreak": -0.6, "bad": -0.6, "worse": -0.7, "worst": -0.9, "terrible": -0.9,
+    "horrible": -0.9, "tragic": -0.8, "tragedy": -0.8, "sad": -0.5, "angry": -0.5,
+    "condemn": -0.5, "ban": -0.3, "sanction": -0.4, "collapse": -0.7, "destroy": -0.7,
+    "damage": -0.5, "hopeless": -0.7, "unemployment": -0.5, "shooting": -0.7,
+    "deadly": -0.8,
+    # EN - pozitif
+    "peace": 0.6, "ceasefire": 0.4, "agreement": 0.4, "deal": 0.3, "win": 0.6,
+    "won": 0.6, "victory": 0.6, "success": 0.7, "succeed": 0.6, "rescue": 0.5,
+    "recover": 0.4, "growth": 0.4, "gain": 0.4, "rise": 0.2, "improve": 0.5,
+    "boost": 0.4, "support": 0.3, "help": 0.3, "hope": 0.4, "celebrat": 0.6,
+    "award": 0.5, "good": 0.6, "great": 0.7, "best": 0.8, "better": 0.5,
+    "happy": 0.7, "positive": 0.5, "safe": 0.4, "free": 0.3, "release": 0.3,
+    "launch": 0.2, "innovat": 0.4, "record": 0.2, "welcome": 0.4, "praise": 0.5,
+    # TR - negatif
+    "savaş": -0.6, "öldü": -0.8, "öldür": -0.8, "ölüm": -0.7, "ölü": -0.7,
+    "hayatını kaybet": -0.7, "cinayet": -0.9, "saldırı": -0.6, "bomba": -0.8,
+    "patlama": -0.6, "kaza": -0.6, "kazada": -0.6, "kazası": -0.6, "kazasında": -0.6,
+    "kazalar": -0.6, "kriz": -0.6, "felaket": -0.8, "afet": -0.7,
+    "deprem": -0.6, "yangın": -0.4, "yaralı": -0.6, "yaralan": -0.6, "kurban": -0.6,
+    "şiddet": -0.7, "terör": -0.9, "rehine": -0.7, "kaçırıl": -0.8, "gözaltı": -0.4,
+    "tutukla": -0.4, "suçla": -0.4, "dolandırıcı": -0.6, "yolsuzluk": -0.6,
+    "skandal": -0.5, "protesto": -0.3, "çatışma": -0.5, "tehdit": -0.5, "korku": -0.5,
+    "endişe": -0.4, "uyarı": -0.3, "başarısız": -0.5, "kayıp": -0.4, "düşüş": -0.4,
+    "geriledi": -0.4, "resesyon": -0.6, "enflasyon": -0.3, "yoksul": -0.6,
+    "açlık": -0.6, "kıtlık": -0.8, "hastalık": -0.5, "salgın": -0.6, "kötü": -0.6,
+    "berbat": -0.9, "trajik": -0.8, "üzücü": -0.5, "öfke": -0.5, "kınadı": -0.5,
+    "kınama": -0.5, "yasak": -0.3, "yaptırım": -0.4, "çöktü": -0.7, "çöküş": -0.7,
+    "yıkım": -0.7, "hasar": -0.5, "işsizlik": -0.5, "acı": -0.5,
+    # TR - pozitif
+    "barış": 0.6, "ateşkes": 0.4, "anlaşma": 0.4, "uzlaş": 0.4, "kazandı": 0.6,
+    "zafer": 0.6, "başarı": 0.7, "kurtarıl": 0.5, "kurtardı": 0.5, "toparlan": 0.4,
+    "büyüme": 0.4, "kazanç": 0.4, "artış": 0.2, "iyileş": 0.5, "destek": 0.3,
+    "yardım": 0.3, "umut": 0.4, "umutsuz": -0.6, "kutla": 0.6, "ödül": 0.5, "iyi": 0.6,
+    "harika": 0.7, "güzel": 0.6, "mutlu": 0.7, "olumlu": 0.5, "güvenli": 0.4,
+    "serbest": 0.3, "rekor": 0.2, "memnun": 0.5, "övgü": 0.5, "sevindir": 0.6,
+}
+# Önek olarak da eşleşen girdiler: "öldür" -> "öldürüldü", "kill" -> "killing".
+# Listede olmayanlar yalnızca tam eşleşir; "kaza" -> "kazanmak", "dead" -> "deadline"
+# gibi başka kelimelerin başı olan girdileri buraya ekleme.
+SENTIMENT_LEXICON_STEMS = frozenset({
+    # EN
+    "kill", "murder", "attack", "bomb", "blast", "explosion", "crash", "disaster",
+    "earthquake", "flood", "injur", "wound", "victim", "terror", "hostage", "kidnap",
+    "abduct", "arrest", "accus", "fraud", "corrupt", "scandal", "protest", "clash",
+    "threat", "warn", "fail", "decline", "recession", "disease", "outbreak", "condemn",
+    "sanction", "collapse", "destroy", "damage", "peace", "agreement", "success",
+    "succeed", "rescue", "recover", "gain", "improve", "boost", "support", "celebrat",
+    "award", "release", "launch", "innovat", "welcome", "praise",
+    # TR
+    "savaş", "öldür", "ölüm", "hayatını kaybet", "cinayet", "saldırı", "bomba",
+    "patlama", "kriz", "felaket", "afet", "deprem", "yangın", "yaralı", "yaralan",
+    "kurban", "şiddet", "terör", "rehine", "kaçırıl", "gözaltı", "tutukla", "suçla",
+    "dolandırıcı", "yolsuzluk", "skandal", "protesto", "çatışma", "tehdit", "korku",
+    "endişe", "uyarı", "başarısız", "kayıp", "düşüş", "resesyon", "enflasyon",
+    "yoksul", "açlık", "kıtlık", "hastalık", "salgın", "kötü", "trajik", "öfke",
+    "yasak", "yaptırım", "çöküş", "yıkım", "hasar", "işsizlik", "barış", "ateşkes",
+    "anlaşma", "uzlaş", "zafer", "başarı", "kurtarıl", "toparlan", "büyüme", "kazanç",
+    "artış", "iyileş", "destek", "yardım", "umut", "kutla", "ödül", "mutlu", "olumlu",
+    "güvenli", "rekor", "memnun", "övgü", "sevindir",
+})
+LEXICON_MIN_STEM = 4  # Kök eşleşmesi için en kısa önek
+
+try:
+    import numpy as np  # Lexicon backend ve MinHash imzalarını vektörize eder (opsiyonel)
+except ImportError:  # numpy yoksa saf Python toplama kullanılır
+    np = None
+
+
+class SentimentBackend(ABC):
+    """
+    Toplu duygu analizi arayüzü: metin listesi alır, aynı sırada
+    -1.0 ile +1.0 arası skor listesi döner.
+
+    Yeni bir model eklemek için alt sınıf yazıp SENTIMENT_BACKENDS'e kaydet.
+    Örn. transformers tabanlı çok dilli bir model:
+        from transformers import pipeline
+        model = pipeline("sentiment-analysis", model="...çok dilli model...")
+        results = model([t[:512] for t in texts], batch_size=self.batch_size)
+        ... sonuçları -1/+1'e ölçeklersin.
+    """
+
+    name = "base"
+    version = "1"
+    batch_size = 256
+
+    @abstractmethod
+    def score_batch(self, texts: List[str]) -> List[float]:
+        """Metinleri aynı sırada -1.0 ile +1.0 arası skorlara çevirir."""
+
+    def tune_batch_size(
+        self,
+        sample: List[str],
+        candidates: Iterable[int] = (64, 256, 1024, 4096),
+    ) -> int:
+        """
+        Örnek metinler üzerinde aday parti boyutlarını dener,
+        metin başına en hızlı olanı batch_size olarak ayarlar.
+        """
+        best_size, best_rate = self.batch_size, 0.0
+        for size in candidates:
+            self.batch_size = size
+            start = time.perf_counter()
+            self.score_batch(sample)
+            elapsed = time.perf_counter() - start
+            rate = len(sample) / elapsed if elapsed > 0 else float("inf")
+            if rate > best_rate:
+                best_size, best_rate = size, rate
+        self.batch_size = best_size
+        return best_size
+
+
+class TextBlobBackend(SentimentBackend):
+    """TextBlob (PatternAnalyzer) polaritesi; İngilizce metinde en iyisi."""
+
+    name = "textblob"
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        return [float(TextBlob(t).sentiment.polarity) if t else 0.0 for t in texts]
+
+
+class LexiconBackend(SentimentBackend):
+    """
+    Sözlük tabanlı, vektörize duygu analizi (İngilizce + Türkçe).
+
+    Her metin kelime torbasına çevrilir; skor, sözlükte bulunan
+    kelimelerin polarite ortalamasıdır (sparse BoW · polarite vektörü).
+    Parti içindeki tüm eşleşmeler tek düz dizide toplanır ve numpy
+    bincount ile metin başına indirgenir. Çok kelimeli girdiler
+    ("hayatını kaybet") ikili kelime (bigram) olarak aranır. Önek
+    eşleşmesi yalnızca stems kümesindeki girdilere uygulanır.
+    """
+
+    name = "lexicon"
+    batch_size = 1024
+
+    def __init__(
+        self,
+        lexicon: Optional[Dict[str, float]] = None,
+        stems: Optional[Iterable[str]] = None,
+    ):
+        self.lexicon = dict(SENTIMENT_LEXICON if lexicon is None else lexicon)
+        stems = SENTIMENT_LEXICON_STEMS if stems is None else stems
+        self.stems = frozenset(t for t in stems if t in self.lexicon)
+        terms = sorted(self.lexicon)
+        self._index = {term: i for i, term in enumerate(terms)}
+        # Önek olarak aranabilecek girdiler (bigram'da son kelime en az LEXICON_MIN_STEM harf)
+        self._stem_index = {
+            t: self._index[t] for t in self.stems if len(t.rsplit(" ", 1)[-1]) >= LEXICON_MIN_STEM
+        }
+        self._polarity = [self.lexicon[t] for t in terms]
+        self._polarity_array = np.array(self._polarity, dtype=float) if np is not None else None
+        self._bigram_heads = {t.split(" ", 1)[0] for t in terms if " " in t}
+        # Kelime -> sözlük indeksi (-1 = yok); kök aramalarını tekrarlamamak için
+        self._token_ids: Dict[str, int] = {}
+        digest = json.dumps([self.lexicon, sorted(self.stems)], ensure_ascii=False, sort_keys=True)
+        self.version = hashlib.blake2b(digest.encode("utf-8"), digest_size=4).hexdigest()
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        # Türkçe büyük İ/I harfleri doğru küçülsün
+        text = text.replace("İ", "i").replace("I", "ı") if _looks_turkish(text) else text
+        return re.findall(r"\w+", text.lower())
+
+    def _token_id(self, token: str) -> int:
+        cached = self._token_ids.get(token)
+        if cached is not None:
+            return cached
+
+        idx = self._index.get(token, -1)
+        if idx < 0:
+            for end in range(len(token) - 1, LEXICON_MIN_STEM - 1, -1):
+                idx = self._stem_index.get(token[:end], -1)
+                if idx >= 0:
+                    break
+        self._token_ids[token] = idx
+        return idx
+
+    def _bigram_id(self, head: str, nxt: str) -> int:
+        # "hayatını kaybetti" -> "hayatını kaybet"
+        idx = self._index.get(head + " " + nxt, -1)
+        if idx >= 0:
+            return idx
+        for end in range(len(nxt) - 1, LEXICON_MIN_STEM - 1, -1):
+            idx = self._stem_index.get(head + " " + nxt[:end], -1)
+            if idx >= 0:
+                return idx
+        return -1
+
+    def _match_ids(self, text: str) -> List[int]:
+        tokens = self.tokenize(text)
+        ids = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token in self._bigram_heads and i + 1 < len(tokens):
+                idx = self._bigram_id(token, tokens[i + 1])
+                if idx >= 0:
+                    ids.append(idx)
+                    i += 2
+                    continue
+            idx = self._token_id(token)
+            if idx >= 0:
+                ids.append(idx)
+            i += 1
+        return ids
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        scores: List[float] = []
+        for start in range(0, len(texts), self.batch_size):
+            scores.extend(self._score_chunk(texts[start:start + self.batch_size]))
+        return scores
+
+    def _score_chunk(self, texts: List[str]) -> List[float]:
+        matches = [self._match_ids(t) if t else [] for t in texts]
+
+        if np is None:
+            return [
+                sum(self._polarity[i] for i in ids) / len(ids) if ids else 0.0
+                for ids in matches
+            ]
+
+        lengths = np.fromiter((len(ids) for ids in matches), dtype=np.int64, count=len(matches))
+        flat = np.fromiter(
+            (i for ids in matches for i in ids), dtype=np.int64, count=int(lengths.sum())
+        )
+        doc = np.repeat(np.arange(len(matches)), lengths)
+        totals = np.bincount(doc, weights=self._polarity_array[flat], minlength=len(matches))
+        means = np.divide(totals, lengths, out=np.zeros(len(matches)), where=lengths > 0)
+        return [float(x) for x in np.clip(means, -1.0, 1.0)]
+
+
+def _looks_turkish(text: str) -> bool:
+    return any(ch in text for ch in "çğışöüÇĞİŞÖÜ")
+
+
+SENTIMENT_BACKENDS: Dict[str, type] = {
+    "textblob": TextBlobBackend,
+    "lexicon": LexiconBackend,
+}
+ADVANCED_SENTIMENT_BACKEND = "lexicon"  # USE_ADVANCED_SENTIMENT True iken kullanılacak backend
+
+_sentiment_backends: Dict[str, SentimentBackend] = {}
+
+
+def get_sentiment_backend() -> SentimentBackend:
+    """
+    Aktif backend'i döner (süreç başına bir örnek).
+    USE_ADVANCED_SENTIMENT False ise TextBlob, True ise ADVANCED_SENTIMENT_BACKEND.
+    """
+    name = ADVANCED_SENTIMENT_BACKEND if USE_ADVANCED_SENTIMENT else "textblob"
+    backend = _sentiment_backends.get(name)
+    if backend is None:
+        backend = SENTIMENT_BACKENDS[name]()
+        _sentiment_backends[name] = backend
+    return backend
+
+
+def analyze_sentiment(text: str) -> float:
+    """
+    -1.0 (çok negatif) ile +1.0 (çok pozitif) arası skor.
+    USE_ADVANCED_SENTIMENT True ise ADVANCED_SENTIMENT_BACKEND kullanılır,
+    varsayılan TextBlob. Çok sayıda metin için analyze_texts tercih et.
+    """
+    if not text:
+        return 0.0
+
+    return get_sentiment_backend().score_batch([text])[0]
+
+
+def categorize_article(article: Article) -> str:
+    """
+    İngilizce + Türkçe keyword'lere göre haber kategorisi.
+    Öncelik sırası:
+      1) conflict/crisis
+      2) politics
+      3) economy
+      4) technology
+      5) society
+      6) other
+    Keyword listeleri CATEGORY_KEYWORDS içinde, eşleştirme tek geçişte
+    KEYWORD_MATCHER ile yapılır.
+    """
+    category, _ = match_article_text(article.title, article.summary)
+    return category
+
+
+def analyze_texts(items: List[tuple[str, str]]) -> List[tuple[float, str, list[str]]]:
+    """
+    (başlık, özet) çiftleri için (duygu, kategori, alarm etiketleri) döner.
+    Hem seri yol hem de süreç havuzundaki işçiler bunu kullanır,
+    böylece iki yolun çıktısı birebir aynıdır.
+    """
+    return analyze_texts_timed(items)[0]
+
+
+def analyze_texts_timed(items: List[tuple[str, str]]) -> tuple[list, float, float]:
+    """
+    analyze_texts ile aynı, ek olarak duygu ve kategori sürelerini döner.
+    Süreç havuzundaki işçilerin metrikleri ana sürece ulaşmadığı için
+    süreler sonuçla birlikte taşınır ve ana süreçte kaydedilir.
+    """
+    start = time.perf_counter()
+    # Tüm parti backend'e tek çağrıda gider
+    sentiments = get_sentiment_backend().score_batch(
+        [title + " " + summary for title, summary in items]
+    )
+    sentiment_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = []
+    for (title, summary), sentiment in zip(items, sentiments):
+        # Kategori ve alarm etiketleri tek taramada
+        category, alerts = match_article_text(title, summary)
+        results.append((sentiment, category, alerts))
+    return results, sentiment_time, time.perf_counter() - start
+
+
+def analyzer_tag() -> str:
+    """
+    Analiz sonucunu belirleyen her şeyin kısa etiketi:
+    ANALYZER_VERSION, aktif duygu backend'i (USE_ADVANCED_SENTIMENT) ve
+    keyword listelerinin özeti. Etiket değişince önbellekteki eski sonuçlar
+    kullanılmaz.
+    """
+    keywords = json.dumps([CATEGORY_KEYWORDS, ALERT_KEYWORDS], ensure_ascii=False)
+    digest = hashlib.blake2b(keywords.encode("utf-8"), digest_size=4).hexdigest()
+    backend = get_sentiment_backend()
+    return f"v{ANALYZER_VERSION}-{backend.name}.{backend.version}-{digest}"
+
+
+class AnalysisCache:
+    """
+    Normalize edilmiş metnin özetine göre (duygu, kategori, etiketler) önbelleği.
+
+    - Bellekte LRU (OrderedDict), en fazla max_size girdi.
+    - attach(conn) ile news.db'deki analysis_cache tablosu ikinci katman olur.
+    - Anahtar analyzer_tag() içerir; mod ya da sürüm değişince eski girdiler
+      eşleşmez, kalıcı tablodaki eski girdiler attach sırasında silinir.
+    Metinler boşlukları sadeleştirilerek karşılaştırılır.
+    Erişim kilitlidir: akış boru hattında birden çok analiz thread'i aynı
+    önbelleği (ve check_same_thread=False ile açılmış bağlantıyı) kullanır.
+    """
+
+    def __init__(self, max_size: int = ANALYSIS_CACHE_SIZE):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, tuple[float, str, list[str]]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.lookups = 0
+        self.cycle_hits = 0
+        self.cycle_lookups = 0
+
+    def attach(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._conn = conn
+            with conn:
+                conn.execute("DELETE FROM analysis_cache WHERE analyzer != ?", (analyzer_tag(),))
+
+    def detach(self) -> Optional[sqlite3.Connection]:
+        """Kalıcı katmanı ayırır ve bağlı bağlantıyı döner (kapatmak çağıranın işi)."""
+        with self._lock:
+            conn, self._conn = self._conn, None
+        return conn
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    @staticmethod
+    def make_key(tag: str, title: str, summary: str) -> str:
+        text = " ".join(str(title).split()) + "\x00" + " ".join(str(summary).split())
+        return hashlib.blake2b((tag + "\x00" + text).encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, tuple[float, str, list[str]]]:
+        """Bellekte, yoksa kalıcı tabloda bulunan anahtarları döner."""
+        with self._lock:
+            return self._get_many(keys)
+
+    def _get_many(self, keys: List[str]) -> Dict[str, tuple[float, str, list[str]]]:
+        found: Dict[str, tuple[float, str, list[str]]] = {}
+        missing: List[str] = []
+        for key in keys:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                found[key] = value
+            else:
+                missing.append(key)
+
+        if missing and self._conn is not None:
+            cur = self._conn.cursor()
+            chunk_size = 500
+            for i in range(0, len(missing), chunk_size):
+                chunk = missing[i:i + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                cur.execute(
+                    f"SELECT text_hash, sentiment, category, alerts FROM analysis_cache "
+                    f"WHERE text_hash IN ({placeholders})",
+                    chunk,
+                )
+                for key, sentiment, category, alerts in cur.fetchall():
+                    value = (sentiment, category, json.loads(alerts or "[]"))
+                    found[key] = value
+                    self._remember(key, value)
+
+        return found
+
+    def put_many(self, tag: str, entries: Dict[str, tuple[float, str, list[str]]]) -> None:
+        with self._lock:
+            for key, value in entries.items():
+                self._remember(key, value)
+
+            if entries and self._conn is not None:
+                with self._conn:
+                    self._conn.executemany(
+                        """
+                        INSERT OR REPLACE INTO analysis_cache
+                        (text_hash, analyzer, sentiment, category, alerts)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        [
+                            (key, tag, sentiment, category, json.dumps(alerts, ensure_ascii=False))
+                            for key, (sentiment, category, alerts) in entries.items()
+                        ],
+                    )
+
+    def _remember(self, key: str, value: tuple[float, str, list[str]]) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def record(self, hits: int, lookups: int) -> None:
+        with self._lock:
+            self.cycle_hits = hits
+            self.cycle_lookups = lookups
+            self.hits += hits
+            self.lookups += lookups
+
+    def hit_rate(self, cycle: bool = True) -> float:
+        hits, lookups = (self.cycle_hits, self.cycle_lookups) if cycle else (self.hits, self.lookups)
+        return hits / lookups if lookups else 0.0
+
+
+analysis_cache = AnalysisCache()
+
+
+# Süreç havuzu ilk büyük partide açılır ve döngüler arasında yeniden kullanılır
+_analysis_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_analysis_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _analysis_pool
+    if _analysis_pool is None:
+        _analysis_pool = ProcessPoolExecutor(max_workers=max_workers)
+    return _analysis_pool
+
+
+def shutdown_analysis_pool() -> None:
+    global _analysis_pool
+    if _analysis_pool is not None:
+        _analysis_pool.shutdown()
+        _analysis_pool = None
+
+
+def process_articles(
+    articles: List[Article],
+    max_workers: int = ANALYSIS_MAX_WORKERS,
+    chunk_size: int = ANALYSIS_CHUNK_SIZE,
+) -> List[Article]:
+    """
+    Her habere duygu skoru ve kategori ekler.
+    Aynı metin daha önce (ya da bu partide) analiz edildiyse analysis_cache'ten
+    alınır; sadece yeni metinler analiz edilir.
+    Büyük partiler (ANALYSIS_PARALLEL_MIN_BATCH ve üstü) parçalara bölünüp
+    süreç havuzunda işlenir; küçük partiler ve havuz hatası durumunda seri.
+    """
+    tag = analyzer_tag()
+    keys = [AnalysisCache.make_key(tag, a.title, a.summary) for a in articles]
+    cached = analysis_cache.get_many(keys)
+
+    # Önbellekte olmayan her farklı metin bir kez analiz edilir
+    pending: Dict[str, tuple[str, str]] = {}
+    for key, a in zip(keys, articles):
+        if key not in cached and key not in pending:
+            pending[key] = (a.title, a.summary)
+    items = list(pending.values())
+
+    results = None
+    if max_workers > 1 and len(items) >= ANALYSIS_PARALLEL_MIN_BATCH:
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        try:
+            pool = get_analysis_pool(max_workers)
+            results = []
+            for chunk_results, sentiment_time, categorize_time in pool.map(analyze_texts_timed, chunks):
+                results.extend(chunk_results)
+                metrics.observe("sei_stage_seconds", sentiment_time, stage="sentiment")
+                metrics.observe("sei_stage_seconds", categorize_time, stage="categorize")
+        except Exception as e:
+            print(f"[WARN] Paralel analiz başarısız, seri devam ediliyor: {e}")
+            shutdown_analysis_pool()
+            results = None
+
+    if results is None and items:
+        results, sentiment_time, categorize_time = analyze_texts_timed(items)
+        metrics.observe("sei_stage_seconds", sentiment_time, stage="sentiment")
+        metrics.observe("sei_stage_seconds", categorize_time, stage="categorize")
+
+    fresh = dict(zip(pending.keys(), results or []))
+    analysis_cache.put_many(tag, fresh)
+    analysis_cache.record(hits=len(articles) - len(fresh), lookups=len(articles))
+    metrics.inc("sei_analysis_cache_total", len(articles) - len(fresh), result="hit")
+    metrics.inc("sei_analysis_cache_total", len(fresh), result="miss")
+
+    for key, article in zip(keys, articles):
+        sentiment, category, alerts = cached.get(key) or fresh[key]
+        article.sentiment = sentiment
+        article.category = category
+        article.alerts = list(alerts)
+    return articles
+
+class NearDupIndex:
+    """
+    MinHash imzaları + LSH ile yakın kopya haber kümeleme.
+
+    Aynı haber farklı kaynaklardan farklı linklerle gelir; metnin kelime
+    ikilileri (shingle) üzerinden MinHash imzası çıkarılır ve imza
+    NEAR_DUP_BANDS banda bölünür. Bir bandı aynı olan eski haberler aday
+    olur, imza benzerliği NEAR_DUP_THRESHOLD'u geçen ilk adayın kümesine
+    katılır; yoksa yeni küme açılır.
+
+    İndeks news.db'de tutulur (minhash_signatures + minhash_bands), bant
+    başına en yeni NEAR_DUP_MAX_CANDIDATES aday okunur; böylece indeks
+    milyonlarca imzaya büyüse de her haber sabit sayıda indeks araması yapar.
+    """
 
-    rows = cur.fetchall()
-    if not rows:
-        print("Veritabanında export edilecek haber yok.")
-        conn.close()
-        return
+    # (a * x + b) mod P; P = 2^31 - 1 olduğu için çarpım uint64'e sığar
+    PRIME = (1 << 31) - 1
 
-    out_path = Path(__file__).parent / filename
+    def __init__(
+        self,
+        num_perm: int = NEAR_DUP_NUM_PERM,
+        bands: int = NEAR_DUP_BANDS,
+        threshold: float = NEAR_DUP_THRESHOLD,
+        max_candidates: int = NEAR_DUP_MAX_CANDIDATES,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm, bands'e tam bölünmeli")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_candidates = max_candidates
 
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            ["title", "summary", "link", "published", "source", "sentiment", "category", "created_at"]
-        )
-        writer.writerows(rows)
+        rng = random.Random(1)  # imzalar çalıştırmalar arasında aynı kalmalı
+        self._a = [rng.randrange(1, self.PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, self.PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._a_np = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_np = np.array(self._b, dtype=np.uint64)[:, None]
 
-    conn.close()
-    print(f"CSV dosyası oluşturuldu: {out_path}")
+    @staticmethod
+    def shingles(text: str) -> set[int]:
+        tokens = re.findall(r"\w+", fold_search_text(text).lower())
+        if len(tokens) < NEAR_DUP_MIN_TOKENS:
+            return set()
+        return {
+            zlib.crc32(f"{tokens[i]} {tokens[i + 1]}".encode("utf-8"))
+            for i in range(len(tokens) - 1)
+        }
 
+    def signature(self, text: str) -> Optional[List[int]]:
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
 
-def fetch_latest_articles() -> List[Article]:
-    """RSS kaynaklarından yeni haberleri çeker."""
-    articles: List[Article] = []
+        if np is not None:
+            x = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))[None, :]
+            hashed = (self._a_np * x + self._b_np) % self.PRIME
+            return [int(v) for v in hashed.min(axis=1)]
 
-    for source_name, url in RSS_FEEDS.items():
-        print(f"\n[DEBUG] Kaynak kontrol ediliyor: {source_name} ({url})")
-        feed = feedparser.parse(url)
+        return [
+            min((a * x + b) % self.PRIME for x in shingles)
+            for a, b in zip(self._a, self._b)
+        ]
 
-        # Hata kontrolü
-        if getattr(feed, "bozo", 0):
-            print("[DEBUG]  -> Hata (bozo):", feed.bozo_exception)
+    def band_keys(self, signature: List[int]) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            raw = band.to_bytes(2, "little") + b"".join(v.to_bytes(4, "little") for v in chunk)
+            digest = hashlib.blake2b(raw, digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
 
-        print("[DEBUG]  -> Entry sayısı:", len(getattr(feed, "entries", [])))
+    @staticmethod
+    def pack(signature: List[int]) -> bytes:
+        return b"".join(v.to_bytes(4, "little") for v in signature)
 
-        for entry in feed.entries:
-            link = getattr(entry, "link", None)
-            if not link or link in seen_links:
-                continue
+    @staticmethod
+    def unpack(blob: bytes) -> List[int]:
+        return [int.from_bytes(blob[i:i + 4], "little") for i in range(0, len(blob), 4)]
+
+    def assign(self, conn: sqlite3.Connection, link: str, text: str) -> tuple[Optional[int], bool]:
+        """
+        Haberi indekse ekler, (küme id'si, mevcut kümeye katıldı mı) döner.
+        Commit etmez. Metin kümelemeye yetmeyecek kadar kısaysa id None olur.
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None, False
 
-            seen_links.add(link)
+        doc_key = link_hash(link)
+        existing = conn.execute(
+            "SELECT cluster_id FROM minhash_signatures WHERE doc_key = ?", (doc_key,)
+        ).fetchone()
+        if existing:
+            return existing[0], False
 
-            title = getattr(entry, "title", "")
-            summary = getattr(entry, "summary", "")
-            published = str(getattr(entry, "published", ""))
+        band_keys = self.band_keys(signature)
+        candidates: set[int] = set()
+        for key in band_keys:
+            rows = conn.execute(
+                "SELECT seq FROM minhash_bands WHERE band_key = ? ORDER BY seq DESC LIMIT ?",
+                (key, self.max_candidates),
+            ).fetchall()
+            candidates.update(row[0] for row in rows)
 
-            articles.append(
-                Article(
-                    title=title,
-                    summary=summary,
-                    link=link,
-                    published=published,
-                    source=source_name,
-                )
-            )
+        cluster_id = None
+        if candidates:
+            placeholders = ",".join("?" * len(candidates))
+            best = 0.0
+            for seq, cand_cluster, blob in conn.execute(
+                f"SELECT seq, cluster_id, signature FROM minhash_signatures WHERE seq IN ({placeholders})",
+                list(candidates),
+            ):
+                other = self.unpack(blob)
+                similarity = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+                if similarity >= self.threshold and similarity > best:
+                    best, cluster_id = similarity, cand_cluster
 
-    print(f"[DEBUG] Toplam yeni article sayısı: {len(articles)}")
-    return articles
+        cur = conn.execute(
+            "INSERT INTO minhash_signatures (doc_key, cluster_id, signature) VALUES (?, ?, ?)",
+            (doc_key, cluster_id, self.pack(signature)),
+        )
+        seq = cur.lastrowid
+        joined = cluster_id is not None
+        if cluster_id is None:
+            # Yeni küme: id, kümeyi açan imzanın sırası
+            cluster_id = seq
+            conn.execute("UPDATE minhash_signatures SET cluster_id = ? WHERE seq = ?", (seq, seq))
 
-def analyze_sentiment(text: str) -> float:
-    """
-    -1.0 (çok negatif) ile +1.0 (çok pozitif) arası skor.
-    USE_ADVANCED_SENTIMENT True ise gelişmiş modeli kullanmaya hazırlanmış yapı.
-    Şimdilik TextBlob varsayılan.
-    """
-    if not text:
-        return 0.0
+        conn.executemany(
+            "INSERT OR IGNORE INTO minhash_bands (band_key, seq) VALUES (?, ?)",
+            [(key, seq) for key in band_keys],
+        )
+        return cluster_id, joined
 
-    if not USE_ADVANCED_SENTIMENT:
-        blob = TextBlob(text)
-        return float(blob.sentiment.polarity)
 
-    # Buraya istersen ileride transformers tabanlı bir model entegre edebilirsin.
-    # Örn:
-    # from transformers import pipeline
-    # sentiment_model = pipeline("sentiment-analysis", model="...çok dilli model...")
-    # result = sentiment_model(text[:512])[0]
-    # ... sonucu -1/+1'e ölçeklersin.
-    # Şimdilik TextBlob'a fallback yapalım:
-    blob = TextBlob(text)
-    return float(blob.sentiment.polarity)
+near_dup_index = NearDupIndex()
 
 
-def categorize_article(article: Article) -> str:
+def assign_clusters(conn: sqlite3.Connection, articles: List[Article]) -> int:
     """
-    İngilizce + Türkçe keyword'lere göre haber kategorisi.
-    Öncelik sırası:
-      1) conflict/crisis
-      2) politics
-      3) economy
-      4) technology
-      5) society
-      6) other
+    Haberlere yakın kopya küme id'si atar (Article.cluster_id).
+    Parti içindeki kopyalar da birbirini bulur, çünkü her haber
+    eklendiği anda indekste görünür. Commit etmez: imzalar haberlerle
+    aynı transaction'da yazılmalı (save_articles cluster=True), yoksa
+    kaydedilemeyen haberlerin imzaları indekste kalır. Mevcut bir
+    kümeye katılan haber sayısını döner.
     """
-    text = (article.title + " " + article.summary).lower()
+    if not USE_NEAR_DUP_CLUSTERING or not articles:
+        return 0
 
-    # 1) Savaş / kriz / afet
-    conflict_keywords = [
-        # EN
-        "war", "invasion", "offensive", "airstrike", "air strike",
-        "missile", "rocket attack", "shelling", "frontline",
-        "military clash", "gunmen", "mass abduction", "kidnapped",
-        "hostage", "terrorist", "suicide attack", "bombing",
-        "explosion", "blast", "attack", "conflict", "clashes",
-        "earthquake", "aftershock", "tremor", "quake",
-        "flood", "wildfire", "hurricane",
-        # TR
-        "savaş", "çatışma", "baskın", "askeri operasyon",
-        "roket", "füze", "bombalı saldırı", "bombalı",
-        "patlama", "terör", "rehine", "kaçırıldı", "kaçırılan",
-        "deprem", "artçı", "sel", "yangın", "fırtına",
-    ]
-    if any(k in text for k in conflict_keywords):
-        return "conflict/crisis"
+    joined = 0
+    with metrics.timer("sei_stage_seconds", stage="cluster"):
+        for a in articles:
+            a.cluster_id, was_joined = near_dup_index.assign(conn, a.link, a.title + " " + a.summary)
+            joined += was_joined
+    return joined
 
-    # 2) Siyaset
-    politics_keywords = [
-        # EN
-        "election", "elections", "vote", "voting", "ballot",
-        "government", "minister", "prime minister",
-        "president", "parliament", "senate", "congress",
-        "coalition", "opposition", "ruling party",
-        "politician", "political",
-        # TR
-        "seçim", "oy", "sandık", "hükümet", "hükümeti",
-        "bakan", "bakanlık", "başbakan", "cumhurbaşkanı",
-        "meclis", "parlamento", "milletvekili",
-        "koalisyon", "muhalefet", "iktidar", "siyasi", "siyaset",
-    ]
-    if any(k in text for k in politics_keywords):
-        return "politics"
 
-    # 3) Ekonomi
-    economy_keywords = [
-        # EN
-        "economy", "economic", "recession", "growth",
-        "inflation", "interest rate", "interest rates",
-        "stock market", "stocks", "shares", "bond",
-        "currency", "exchange rate", "dollar", "euro",
-        "unemployment", "wage", "salary", "budget", "debt",
-        # TR
-        "ekonomi", "ekonomik", "resesyon", "büyüme",
-        "enflasyon", "faiz", "faiz oranı", "faiz oranları",
-        "borsa", "hisse", "tahvil",
-        "kur", "döviz", "dolar", "euro",
-        "işsizlik", "maaş", "ücret", "bütçe", "borç",
-        "zam", "indirim", "piyasa", "fiyat artışı",
-    ]
-    if any(k in text for k in economy_keywords):
-        return "economy"
+def backfill_clusters(conn: sqlite3.Connection, batch_size: int = 2000) -> int:
+    """Küme id'si olmayan kayıtlı haberleri id sırasıyla kümeler."""
+    cur = conn.cursor()
+    last_id = 0
+    updated = 0
+    while True:
+        cur.execute(
+            """
+            SELECT id, link, title, summary FROM articles
+            WHERE id > ? AND cluster_id IS NULL
+            ORDER BY id
+            LIMIT ?
+            """,
+            (last_id, batch_size),
+        )
+        rows = cur.fetchall()
+        if not rows:
+            break
 
-    # 4) Teknoloji
-    tech_keywords = [
-        # EN
-        "ai", "artificial intelligence", "machine learning",
-        "app", "application", "software", "hardware",
-        "social media", "platform", "startup", "tech company",
-        "cyber", "hacker", "data breach", "privacy",
-        "smartphone", "device", "robot",
-        # TR
-        "yapay zeka", "makine öğrenmesi",
-        "uygulama", "yazılım", "donanım",
-        "sosyal medya", "platform", "teknoloji", "teknolojik",
-        "siber", "siber saldırı", "veri ihlali", "gizlilik",
-        "telefon", "akıllı telefon", "cihaz", "robot",
-    ]
-    if any(k in text for k in tech_keywords):
-        return "technology"
+        with conn:
+            updates = []
+            for row_id, link, title, summary in rows:
+                cluster_id, _ = near_dup_index.assign(conn, link or str(row_id), f"{title} {summary}")
+                if cluster_id is not None:
+                    updates.append((cluster_id, row_id))
+            conn.executemany("UPDATE articles SET cluster_id = ? WHERE id = ?", updates)
+        updated += len(updates)
+        last_id = rows[-1][0]
 
-    # 5) Toplum / sosyal konular
-    society_keywords = [
-        # EN
-        "school", "university", "student", "students",
-        "teacher", "family", "families", "children", "kids",
-        "gender", "violence", "domestic violence",
-        "rights", "human rights", "protest", "demonstration",
-        "police", "crime", "murder", "shooting",
-        # TR
-        "okul", "üniversite", "öğrenci", "öğretmen",
-        "aile", "çocuk", "kadın", "erkek",
-        "şiddet", "aile içi şiddet",
-        "hak", "insan hakları", "protesto", "gösteri",
-        "polis", "suç", "cinayet", "saldırı",
-    ]
-    if any(k in text for k in society_keywords):
-        return "society"
+    return updated
 
-    return "other"
 
+# Alarmı gönderilmiş kümeler; aynı haber başka kaynaktan gelince tekrar alarm verilmez
+alerted_clusters = DedupIndex(max_size=50_000, max_age_hours=72, hash_links=False)
+
+# Son saatlerde alarm vermiş kümeler: alarmlı (alert_mask != 0), filtreye
+# uyan (negatif) ve kümesi olan haberler, eskiden yeniye (kısmi alarm indeksi
+# zaman sırasını verir; aynı kümenin son satırı son görülme zamanı olur)
+ALERTED_CLUSTERS_SQL = """
+    SELECT cluster_id, created_at
+    FROM articles
+    WHERE alert_mask != 0
+      AND created_at >= datetime('now', ?)
+      AND sentiment < 0
+      AND cluster_id IS NOT NULL
+    ORDER BY created_at
+"""
+
+
+def warm_alerted_clusters(conn: sqlite3.Connection) -> int:
+    """
+    alerted_clusters'ı son max_age saatte alarm veren kümelerle doldurur,
+    böylece yeniden başlatmadan sonra aynı kümeye katılan haber tekrar
+    alarm vermez. Yüklenen küme sayısını döner.
+    """
+    hours = int(alerted_clusters.max_age // 3600)
+    rows = conn.execute(ALERTED_CLUSTERS_SQL, (f"-{hours} hours",))
+    return alerted_clusters.warm((str(cluster_id), created_at) for cluster_id, created_at in rows)
 
-def process_articles(articles: List[Article]) -> List[Article]:
-    """Her habere duygu skoru ve kategori ekler."""
-    for article in articles:
-        text = article.title + " " + article.summary
-        article.sentiment = analyze_sentiment(text)
-        article.category = categorize_article(article)
-    return articles
 
 def filter_articles(articles: List[Article]) -> List[Article]:
     """
@@ -476,22 +4348,21 @@ def check_alerts(article: Article) -> list[str]:
     """
     Haberin başlık + özet metninde ALERT_KEYWORDS'teki
     anahtar kelimelerden hangileri geçiyor, onları döndürür.
+    process_articles etiketleri zaten hesapladıysa tekrar taranmaz.
     """
-    text = (article.title + " " + article.summary).lower()
-    triggered: list[str] = []
-
-    for label, keywords in ALERT_KEYWORDS.items():
-        if any(k.lower() in text for k in keywords):
-            triggered.append(label)
+    if article.alerts is not None:
+        return list(article.alerts)
 
+    _, triggered = match_article_text(article.title, article.summary)
     return triggered
 
-def send_macos_notification(title: str, message: str) -> None:
+def send_macos_notification(title: str, message: str, enabled: Optional[bool] = None) -> None:
     """
     macOS Bildirim Merkezi'ne uyarı yollar.
-    USE_MACOS_NOTIFICATIONS = True olursa aktif olur.
+    enabled verilmezse USE_MACOS_NOTIFICATIONS = True olursa aktif olur;
+    AlertDispatcher kendi kararını (notifications) enabled ile geçirir.
     """
-    if not USE_MACOS_NOTIFICATIONS:
+    if not (USE_MACOS_NOTIFICATIONS if enabled is None else enabled):
         return
 
     try:
@@ -513,68 +4384,359 @@ def send_telegram_alert(text: str) -> None:
         return
 
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+        url = f"{TELEGRAM_API_URL}/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
         payload = {"chat_id": TELEGRAM_CHAT_ID, "text": text}
         requests.post(url, json=payload, timeout=5)
     except Exception as e:
         print(f"[WARN] Telegram alert failed: {e}")
 
 
-def save_articles(conn: sqlite3.Connection, articles: List[Article]) -> None:
+@dataclass
+class AlertMessage:
+    """Kuyruktaki tek bir alarm (Telegram satırı + masaüstü bildirimi)."""
+    text: str
+    title: str
+    message: str
+    queued_at: float = 0.0
+
+
+class AlertDispatcher:
+    """
+    Alarmları arka planda gönderen sınırlı kuyruk.
+
+    print_report submit() ile alarmı kuyruğa bırakıp hemen devam eder.
+    İşçi thread'ler ALERT_BATCH_WAIT süresince gelen alarmları (en fazla
+    ALERT_BATCH_MAX) tek bir Telegram mesajında ve tek bir bildirimde
+    birleştirir. HTTP bağlantıları tek bir requests.Session havuzundan gelir.
+    429 yanıtında Telegram'ın retry_after değeri, 5xx ve bağlantı
+    hatalarında üstel bekleme (jitter'lı) ile tekrar denenir.
+    Kuyruk doluysa alarm düşürülür; sayaçlar stats() ile okunur.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        max_queue: int = ALERT_QUEUE_SIZE,
+        workers: int = ALERT_WORKERS,
+        batch_max: int = ALERT_BATCH_MAX,
+        batch_wait: float = ALERT_BATCH_WAIT,
+        max_retries: int = ALERT_MAX_RETRIES,
+        retry_base: float = ALERT_RETRY_BASE,
+        api_url: Optional[str] = None,
+        telegram: Optional[bool] = None,
+        notifications: Optional[bool] = None,
+    ):
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self.workers = workers
+        self.batch_max = batch_max
+        self.batch_wait = batch_wait
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.api_url = api_url
+        # None -> USE_TELEGRAM_ALERTS / USE_MACOS_NOTIFICATIONS o anki değeri
+        self.telegram = telegram
+        self.notifications = notifications
+        self._threads: List[threading.Thread] = []
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+        self.counters: Dict[str, int] = dict.fromkeys(
+            [
+                "queued", "dropped", "sent_alerts", "sent_messages", "coalesced",
+                "retries", "rate_limited", "failed_alerts", "notifications",
+            ],
+            0,
+        )
+        self.max_latency = 0.0  # kuyruğa girişten gönderime en uzun süre (saniye)
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+        metrics.inc("sei_alerts_total", n, event=name)
+
+    def _telegram_enabled(self) -> bool:
+        enabled = USE_TELEGRAM_ALERTS if self.telegram is None else self.telegram
+        return enabled and bool(TELEGRAM_BOT_TOKEN) and bool(TELEGRAM_CHAT_ID)
+
+    def _notifications_enabled(self) -> bool:
+        return USE_MACOS_NOTIFICATIONS if self.notifications is None else self.notifications
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._abort.clear()
+            self._session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"alert-dispatch-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for t in self._threads:
+                t.start()
+
+    def submit(self, text: str, title: str = "SEI News Alert", message: str = "") -> bool:
+        """Alarmı kuyruğa bırakır, beklemez. Kanal kapalıysa ya da kuyruk doluysa False döner."""
+        if not (self._telegram_enabled() or self._notifications_enabled()):
+            return False
+        self._start()
+        try:
+            self.queue.put_nowait(AlertMessage(text, title, message or text, time.monotonic()))
+        except queue.Full:
+            self._count("dropped")
+            dropped = self.counters["dropped"]
+            if dropped == 1 or dropped % 100 == 0:
+                print(f"[WARN] Alarm kuyruğu dolu, düşürülen alarm sayısı: {dropped}")
+            return False
+        self._count("queued")
+        return True
+
+    def _worker(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is self._STOP:
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_max:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is self._STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            try:
+                with metrics.timer("sei_stage_seconds", stage="alert_dispatch"):
+                    self._dispatch(batch)
+            except Exception as e:
+                self._count("failed_alerts", len(batch))
+                print(f"[WARN] Alarm gönderimi başarısız: {e}")
+            if stop:
+                return
+
+    def _dispatch(self, batch: List[AlertMessage]) -> None:
+        # Aynı metin aynı partide bir kez gönderilir
+        unique = list(OrderedDict((a.text, a) for a in batch).values())
+        self._count("coalesced", len(batch) - len(unique))
+
+        if self._notifications_enabled():
+            if len(unique) == 1:
+                send_macos_notification(title=unique[0].title, message=unique[0].message, enabled=True)
+            else:
+                send_macos_notification(
+                    title=f"SEI News: {len(unique)} alarm",
+                    message="; ".join(a.message for a in unique)[:200],
+                    enabled=True,
+                )
+            self._count("notifications")
+
+        if self._telegram_enabled():
+            for chunk in self._split_messages(unique):
+                if self._post_telegram("\n\n".join(a.text for a in chunk)):
+                    self._count("sent_alerts", len(chunk))
+                    self._count("sent_messages")
+                else:
+                    self._count("failed_alerts", len(chunk))
+
+        latency = time.monotonic() - min(a.queued_at for a in batch)
+        with self._lock:
+            self.max_latency = max(self.max_latency, latency)
+
+    @staticmethod
+    def _split_messages(alerts: List[AlertMessage]) -> List[List[AlertMessage]]:
+        """Birleştirilen mesaj TELEGRAM_MAX_MESSAGE'ı aşmasın diye parçalar."""
+        chunks: List[List[AlertMessage]] = []
+        size = 0
+        for a in alerts:
+            length = min(len(a.text), TELEGRAM_MAX_MESSAGE) + 2
+            if chunks and size + length <= TELEGRAM_MAX_MESSAGE:
+                chunks[-1].append(a)
+                size += length
+            else:
+                chunks.append([a])
+                size = length
+        return chunks
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            try:
+                retry_after = response.json().get("parameters", {}).get("retry_after", retry_after)
+            except ValueError:
+                pass
+            try:
+                return min(float(retry_after), ALERT_RETRY_MAX)
+            except (TypeError, ValueError):
+                pass
+        delay = min(self.retry_base * (2 ** attempt), ALERT_RETRY_MAX)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _post_telegram(self, text: str) -> bool:
+        url = f"{self.api_url or TELEGRAM_API_URL}/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+        payload = {"chat_id": TELEGRAM_CHAT_ID, "text": text[:TELEGRAM_MAX_MESSAGE]}
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self._session.post(url, json=payload, timeout=5)
+                if response.ok:
+                    return True
+                if response.status_code == 429:
+                    self._count("rate_limited")
+                elif response.status_code < 500:
+                    print(f"[WARN] Telegram alarmı reddedildi: HTTP {response.status_code}")
+                    return False
+            except requests.RequestException as e:
+                print(f"[WARN] Telegram alarmı gönderilemedi: {e}")
+
+            if attempt == self.max_retries:
+                break
+            self._count("retries")
+            # close() süresi dolduysa beklemeyi bırak
+            if self._abort.wait(self._retry_delay(attempt, response)):
+                break
+        return False
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Kuyruktaki alarmları göndermeye çalışır, timeout sonunda bekleyen tekrarları keser."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+        deadline = time.monotonic() + timeout
+        for _ in threads:
+            try:
+                self.queue.put(self._STOP, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                break
+        for t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+        if any(t.is_alive() for t in threads):
+            self._abort.set()
+            for t in threads:
+                t.join(1.0)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats: Dict[str, float] = dict(self.counters)
+            stats["max_latency"] = round(self.max_latency, 3)
+        stats["queue_depth"] = self.queue.qsize()
+        return stats
+
+
+alert_dispatcher = AlertDispatcher()
+metrics.register_collector(lambda m: m.set_gauge("sei_alert_queue_depth", alert_dispatcher.queue.qsize()))
+
+
+ARTICLE_INSERT_SQL = """
+    INSERT OR IGNORE INTO articles
+    (title, summary, link, published, source, sentiment, category, alert_mask, cluster_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def article_row(a: Article) -> tuple:
+    """ARTICLE_INSERT_SQL parametreleri; alarm etiketleri bitmask olarak yazılır."""
+    return (
+        a.title,
+        a.summary,
+        a.link,
+        a.published,
+        a.source,
+        a.sentiment,
+        a.category,
+        alert_mask(check_alerts(a)),
+        a.cluster_id,
+    )
+
+
+def save_articles(conn: sqlite3.Connection, articles: List[Article], cluster: bool = False) -> int:
     """
     Haber listesini veritabanına kaydeder.
     Aynı link'e sahip haberler (UNIQUE) tekrar eklenmez.
+
+    Tüm liste tek transaction içinde executemany ile yazılır; saatlik /
+    günlük özet tabloları da aynı transaction'da tetikleyiciyle güncellenir.
+    cluster True ise yakın kopya kümeleri (assign_clusters) de aynı
+    transaction'da atanır; kayıt geri alınırsa imzalar da geri alınır.
+    Toplu yazma başarısız olursa geri alınır ve haberler tek tek (her biri
+    kendi savepoint'inde) denenir, böylece sadece hatalı kayıtlar atlanır.
+    Mevcut bir kümeye katılan haber sayısını döner.
     """
     if not articles:
-        return
+        return 0
 
-    cur = conn.cursor()
-    for a in articles:
+    with metrics.timer("sei_stage_seconds", stage="db_insert"):
         try:
-            cur.execute(
-                """
-                INSERT OR IGNORE INTO articles
-                (title, summary, link, published, source, sentiment, category)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    a.title,
-                    a.summary,
-                    a.link,
-                    a.published,
-                    a.source,
-                    a.sentiment,
-                    a.category,
-                ),
-            )
+            with conn:
+                joined = assign_clusters(conn, articles) if cluster else 0
+                cur = conn.executemany(ARTICLE_INSERT_SQL, [article_row(a) for a in articles])
+            metrics.inc("sei_articles_total", max(cur.rowcount, 0), stage="saved")
+            return joined
         except Exception as e:
-            # Basit log, istersen kaldırabilirsin
-            print(f"[DB] Kaydetme hatası ({a.link}): {e}")
+            print(f"[DB] Toplu kayıt başarısız, tek tek deneniyor: {e}")
 
-    conn.commit()
+        cur = conn.cursor()
+        saved = joined = 0
+        conn.execute("BEGIN")
+        for a in articles:
+            cur.execute("SAVEPOINT article")
+            try:
+                # Geri alınan toplu denemedeki küme id'leri geçersiz, yeniden atanır
+                was_joined = assign_clusters(conn, [a]) if cluster else 0
+                cur.execute(ARTICLE_INSERT_SQL, article_row(a))
+                saved += max(cur.rowcount, 0)
+                joined += was_joined
+            except Exception as e:
+                cur.execute("ROLLBACK TO article")
+                # Basit log, istersen kaldırabilirsin
+                print(f"[DB] Kaydetme hatası ({a.link}): {e}")
+            cur.execute("RELEASE article")
+
+        conn.commit()
+        metrics.inc("sei_articles_total", saved, stage="saved")
+        return joined
 
 
 
 def print_report(articles: List[Article]) -> None:
-    """Haberleri konsola okunaklı bir şekilde yazdırır."""
+    """
+    Haberleri konsola okunaklı bir şekilde yazdırır.
+    Aynı yakın kopya kümesindeki haberler için alarm (bildirim/Telegram)
+    sadece bir kez gönderilir. Gönderim alert_dispatcher ile arka planda
+    yapılır, bu fonksiyon ağ ya da osascript için beklemez.
+    """
     for a in articles:
         alerts = check_alerts(a)
 
         print("-" * 80)
         if alerts:
             alert_text = "; ".join(alerts)
-            print(f"!!! ALERT !!! [{alert_text}]")
+            cluster_key = str(a.cluster_id) if a.cluster_id is not None else None
 
-            msg = f"{alert_text}: {a.title} ({a.source})"
+            if cluster_key is not None and alerted_clusters.check_and_add(cluster_key):
+                print(f"(ALERT [{alert_text}] bu haber kümesi için zaten gönderildi, küme #{a.cluster_id})")
+            else:
+                print(f"!!! ALERT !!! [{alert_text}]")
 
-            # macOS bildirimi (isteğe bağlı)
-            send_macos_notification(
-                title="SEI News Alert",
-                message=f"{alert_text}: {a.title[:80]}",
-            )
-            
-            # Telegram bildirimi
-            send_telegram_alert(msg)
+                # macOS bildirimi ve Telegram arka planda (kuyruk üzerinden) gönderilir
+                alert_dispatcher.submit(
+                    f"{alert_text}: {a.title} ({a.source})",
+                    title="SEI News Alert",
+                    message=f"{alert_text}: {a.title[:80]}",
+                )
 
         print(f"Kaynak   : {a.source}")
         print(f"Başlık   : {a.title}")
@@ -587,39 +4749,345 @@ def print_report(articles: List[Article]) -> None:
 
 
 
-def main_loop(poll_interval: int = 60):
+def handle_new_articles(conn: sqlite3.Connection, new_articles: List[Article]) -> None:
+    """Bir turda gelen yeni haberleri analiz eder, kümeler, kaydeder ve raporlar."""
+    if not new_articles:
+        return
+
+    processed = process_articles(new_articles)
+    print(
+        f"[DEBUG] Analiz önbelleği isabet oranı: {analysis_cache.hit_rate():.1%} "
+        f"({analysis_cache.cycle_hits}/{analysis_cache.cycle_lookups})"
+    )
+    store_and_report(conn, processed)
+
+
+def store_and_report(conn: sqlite3.Connection, processed: List[Article]) -> None:
+    """Analiz edilmiş haberleri kümeler, kaydeder, filtreye uyanları raporlar."""
+    # 1) TÜM haberleri DB'ye kaydet (küme imzalarıyla aynı transaction'da)
+    joined = save_articles(conn, processed, cluster=True)
+    if joined:
+        print(f"[DEBUG] Mevcut bir haber kümesine katılan: {joined}")
+    print(f"[DB] Kaydedilen (toplam) haber sayısı: {len(processed)}")
+
+    # 2) Sadece filtreye uyanları ekrana ve alarma ver
+    filtered = filter_articles(processed)
+
+    if filtered:
+        print_report(filtered)
+    else:
+        print("Filtreye uyan yeni haber yok.")
+
+
+@dataclass
+class FeedBatch:
+    """Akış boru hattında bir kaynağın tek kontrolünün sonucu."""
+    name: str
+    url: str
+    fetched_at: float  # indirme bitişi (epoch)
+    articles: List[Article] = field(default_factory=list)
+    published_at: Dict[str, float] = field(default_factory=dict)  # link -> yayın zamanı (epoch)
+    fetch: Optional[FeedFetch] = None  # kayıttan sonra feed_cache'e yazılır
+
+
+class IngestPipeline:
+    """
+    Çekme -> analiz -> kayıt aşamalarını sınırlı kuyruklarla bağlayan akış boru hattı.
+
+    - fetch  : fetch_workers thread; kaynağı indirir, parse eder, bellekteki
+               dedup'tan geçirir ve partiyi analiz kuyruğuna koyar.
+    - analyze: analyze_workers thread; process_articles (büyük partiler
+               yine süreç havuzunda).
+    - store  : sqlite bağlantısının sahibi olan thread drain() ile kayıt
+               kuyruğunu boşaltır: DB dedup, kümeleme, kayıt, rapor.
+               Bağlantı başka thread'e geçmez.
+    Kuyruklar doluysa önceki aşama bekler (backpressure): analiz ya da kayıt
+    yetişemezse indirme yavaşlar, bellek sınırsız büyümez. Her kaynak
+    bittiği anda analiz edilir ve kaydedilir, yavaş kaynakları beklemez.
+    Kuyruk derinliği ve yayından kayda gecikme metriklere yazılır.
+    """
+
+    def __init__(
+        self,
+        fetch_workers: int = FETCH_MAX_WORKERS,
+        analyze_workers: int = PIPELINE_ANALYZE_WORKERS,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        store_batch: int = PIPELINE_STORE_BATCH,
+        timeout: float = FETCH_TIMEOUT,
+    ):
+        # Kaynak tamamlanmadan tekrar eklenmediği için en fazla kaynak sayısı kadar dolar
+        self.feed_queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self.analyze_queue: "queue.Queue[FeedBatch]" = queue.Queue(maxsize=queue_size)
+        self.store_queue: "queue.Queue[FeedBatch]" = queue.Queue(maxsize=queue_size)
+        self.store_batch = store_batch
+        self.timeout = timeout
+        self.in_flight: set = set()
+        self._stop = threading.Event()
+        self._fetchers = [
+            threading.Thread(target=self._fetch_worker, name=f"pipeline-fetch-{i}", daemon=True)
+            for i in range(max(1, fetch_workers))
+        ]
+        self._analyzers = [
+            threading.Thread(target=self._analyze_worker, name=f"pipeline-analyze-{i}", daemon=True)
+            for i in range(max(1, analyze_workers))
+        ]
+        for t in self._fetchers + self._analyzers:
+            t.start()
+        metrics.register_collector(self._collect)
+
+    def _collect(self, m: "Metrics") -> None:
+        m.set_gauge("sei_pipeline_queue_depth", self.feed_queue.qsize(), queue="fetch")
+        m.set_gauge("sei_pipeline_queue_depth", self.analyze_queue.qsize(), queue="analyze")
+        m.set_gauge("sei_pipeline_queue_depth", self.store_queue.qsize(), queue="store")
+        m.set_gauge("sei_pipeline_in_flight", len(self.in_flight))
+
+    def submit(self, feeds: Dict[str, str]) -> int:
+        """Kaynakları çekme kuyruğuna ekler; hâlâ işlenmekte olanları atlar. Eklenen sayıyı döner."""
+        added = 0
+        for name, url in feeds.items():
+            if name in self.in_flight:
+                continue
+            # Önbellek girdisi burada oluşturulur; işçiler sadece okur, drain günceller
+            cache = feed_cache.setdefault(url, FeedCacheEntry(url=url)) if USE_CONDITIONAL_GET else None
+            self.in_flight.add(name)
+            self.feed_queue.put((name, url, cache))
+            added += 1
+        return added
+
+    def _put(self, q: queue.Queue, item, stage: str) -> bool:
+        """Kuyruk doluysa yer açılana kadar bekler (backpressure); durdurulursa False."""
+        start = None
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                if start is None:
+                    start = time.perf_counter()
+        else:
+            return False
+        if start is not None:
+            metrics.inc("sei_pipeline_backpressure_seconds_total", time.perf_counter() - start, stage=stage)
+        return True
+
+    def _get(self, q: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return None
+
+    def _fetch_worker(self) -> None:
+        while True:
+            item = self._get(self.feed_queue)
+            if item is None:
+                return
+            name, url, cache = item
+            batch = FeedBatch(name=name, url=url, fetched_at=time.time())
+            try:
+                batch.fetch = download_feed(url, self.timeout, cache, name)
+                batch.fetched_at = time.time()
+                feed = batch.fetch.feed
+                if feed is not None:
+                    if getattr(feed, "bozo", 0):
+                        print(f"[DEBUG] {name} -> Hata (bozo):", feed.bozo_exception)
+                    with metrics.timer("sei_stage_seconds", stage="dedup"), seen_links_lock:
+                        batch.articles = feed_to_articles(name, feed, batch.published_at)
+                    metrics.inc("sei_articles_total", len(feed.entries), stage="fetched")
+            except Exception as e:
+                print(f"[WARN] {name}: çekme aşaması hatası: {e}")
+            # Boş partiler de iletilir: kayıt aşaması kaynağı tamamlandı sayar
+            if not self._put(self.analyze_queue, batch, "fetch"):
+                return
+
+    def _analyze_worker(self) -> None:
+        while True:
+            batch = self._get(self.analyze_queue)
+            if batch is None:
+                return
+            if batch.articles:
+                try:
+                    process_articles(batch.articles)
+                except Exception as e:
+                    print(f"[WARN] {batch.name}: analiz hatası, parti atlandı: {e}")
+                    batch.articles = []
+            if not self._put(self.store_queue, batch, "analyze"):
+                return
+
+    def drain(self, conn: sqlite3.Connection, timeout: float) -> List[FeedBatch]:
+        """
+        Kayıt aşaması (conn'un sahibi olan thread'de çağrılır).
+        İlk parti için en fazla timeout saniye bekler, sonra hazır olan
+        partileri (en fazla store_batch haber) birleştirip tek transaction'da
+        kaydeder. İşlenen partileri döner; articles sadece yeni kaydedilenler.
+        """
+        try:
+            batches = [self.store_queue.get(timeout=max(timeout, 0.0))]
+        except queue.Empty:
+            return []
+        total = len(batches[0].articles)
+        while total < self.store_batch:
+            try:
+                batch = self.store_queue.get_nowait()
+            except queue.Empty:
+                break
+            batches.append(batch)
+            total += len(batch.articles)
+
+        with metrics.timer("sei_stage_seconds", stage="store"):
+            # Bellek indeksinden düşmüş ama kayıtlı linkler burada elenir
+            known = known_links_in_db(conn, (a.link for b in batches for a in b.articles))
+            if known:
+                print(f"[DEBUG] Veritabanında zaten kayıtlı, atlanan: {len(known)}")
+                for b in batches:
+                    b.articles = [a for a in b.articles if a.link not in known]
+
+            articles = [a for b in batches for a in b.articles]
+            metrics.inc("sei_articles_total", len(articles), stage="new")
+            if articles:
+                store_and_report(conn, articles)
+                now = time.time()
+                for b in batches:
+                    for a in b.articles:
+                        metrics.observe("sei_ingest_latency_seconds", max(0.0, now - b.fetched_at), since="fetched")
+                        published = b.published_at.get(a.link)
+                        if published is not None:
+                            metrics.observe("sei_ingest_latency_seconds", max(0.0, now - published), since="published")
+            # Doğrulayıcılar haberler kaydedildikten sonra yazılır
+            for b in batches:
+                if b.fetch is not None and b.url in feed_cache:
+                    feed_cache[b.url].apply(b.fetch)
+            save_feed_cache(conn, urls=[b.url for b in batches])
+
+        for b in batches:
+            self.in_flight.discard(b.name)
+        return batches
+
+    def close(self, timeout: float = 5.0) -> None:
+        """İşçileri durdurur; kuyruklarda kalan, henüz kaydedilmemiş partiler atılır."""
+        self._stop.set()
+        for t in self._fetchers + self._analyzers:
+            t.join(timeout)
+        metrics.unregister_collector(self._collect)
+
+
+def main_loop(poll_interval: int = 60, sharded: bool = False, worker_id: Optional[str] = None):
     """
     poll_interval: Kaç saniyede bir yeni haber kontrol edileceği.
+    USE_ADAPTIVE_SCHEDULER True ise bu sadece başlangıç aralığıdır;
+    her kaynağın aralığı FeedScheduler ile ayrı ayrı uyarlanır.
+    USE_STREAMING_PIPELINE True ise kaynaklar IngestPipeline'a verilir ve
+    ana thread kayıt aşamasını çalıştırır; değilse her tur sırayla işlenir.
+    sharded True ise RSS_FEEDS'in sadece bu işçiye düşen payı çekilir
+    (ShardCoordinator); aynı news.db'ye bağlı diğer işçiler kalanı çeker.
+    ARCHIVE_COMPACT_INTERVAL > 0 ise arşivleme / sıkıştırma arka planda
+    çalışır (ArchiveCompactor; paylaşımlı modda tek işçide).
     """
     print("Gerçek zamanlı haber analizatörü başlıyor...\n")
 
     # Veritabanını hazırla
-    conn = init_db()
+    profile = SHARD_DB_PROFILE if sharded else None
+    conn = init_db(profile)
+    load_feed_cache(conn)
     print(f"[DB] Veritabanı: {DB_PATH}")
+    print(f"[DB] Dedup indeksi ısıtıldı: {seen_links.warm_from_db(conn)} link")
+    print(f"[DB] Alarm verilmiş küme: {warm_alerted_clusters(conn)}")
+    pipeline = IngestPipeline() if USE_STREAMING_PIPELINE else None
+    if USE_PERSISTENT_ANALYSIS_CACHE:
+        # Boru hattında önbelleği analiz thread'leri kullanır, ayrı bağlantı açılır;
+        # conn sadece bu (kayıt) thread'inde kalır
+        analysis_cache.attach(init_db(profile, check_same_thread=False) if pipeline is not None else conn)
 
-    try:
-        while True:
-            new_articles = fetch_latest_articles()
-            if new_articles:
-                processed = process_articles(new_articles)
+    feeds = RSS_FEEDS
+    shard = ShardCoordinator(conn, worker_id) if sharded else None
+    if shard is not None:
+        shard.tick(RSS_FEEDS, force=True)
+        feeds = shard.owned
 
-                # 1) TÜM haberleri DB'ye kaydet
-                save_articles(conn, processed)
-                print(f"[DB] Kaydedilen (toplam) haber sayısı: {len(processed)}")
+    scheduler = FeedScheduler(feeds, initial_interval=poll_interval) if USE_ADAPTIVE_SCHEDULER else None
+    compactor = ArchiveCompactor(profile=profile) if ARCHIVE_COMPACT_INTERVAL > 0 else None
+    if compactor is not None:
+        if shard is not None:
+            compactor.active = shard.owns(ARCHIVE_SHARD_KEY)
+        compactor.start()
+    metrics_server = start_metrics_server() if USE_METRICS_SERVER else None
+    if metrics_server is not None:
+        host, port = metrics_server.server_address[:2]
+        print(f"[DEBUG] Metrikler: http://{host}:{port}/metrics")
 
-                # 2) Sadece filtreye uyanları ekrana ve alarma ver
-                filtered = filter_articles(processed)
+    next_poll = time.monotonic()
+    try:
+        while True:
+            # Paylaşımlı modda bekleme kalp atışını geciktirmesin
+            max_wait = float("inf")
+            if shard is not None:
+                changed = shard.tick(RSS_FEEDS)
+                if changed is not None:
+                    feeds = changed
+                    if scheduler is not None:
+                        scheduler.set_feeds(feeds)
+                if compactor is not None:
+                    compactor.active = shard.owns(ARCHIVE_SHARD_KEY)
+                max_wait = shard.seconds_until_heartbeat()
 
-                if filtered:
-                    print_report(filtered)
+            if pipeline is not None:
+                if scheduler is None:
+                    if time.monotonic() >= next_poll:
+                        pipeline.submit(feeds)
+                        next_poll = time.monotonic() + poll_interval
+                    wait_for = next_poll - time.monotonic()
                 else:
-                    print("Filtreye uyan yeni haber yok.")
+                    pipeline.submit(scheduler.pop_due())
+                    wait_for = scheduler.seconds_until_next()
+                for batch in pipeline.drain(conn, timeout=min(wait_for, max_wait)):
+                    if scheduler is not None:
+                        scheduler.record_feed(batch.name, len(batch.articles), batch.fetch)
+                continue
+
+            if scheduler is None:
+                if time.monotonic() < next_poll:
+                    time.sleep(min(next_poll - time.monotonic(), max_wait))
+                    continue
+                with metrics.timer("sei_stage_seconds", stage="cycle"):
+                    new_articles = fetch_latest_articles(conn=conn, feeds=feeds)
+                    handle_new_articles(conn, new_articles)
+                    # Doğrulayıcılar haberler kaydedildikten sonra yazılır
+                    save_feed_cache(conn, urls=feeds.values())
+                next_poll = time.monotonic() + poll_interval
+                continue
 
+            due = scheduler.pop_due()
+            if not due:
+                time.sleep(min(scheduler.seconds_until_next(), max_wait))
+                continue
 
-            time.sleep(poll_interval)
+            with metrics.timer("sei_stage_seconds", stage="cycle"):
+                fetches: Dict[str, FeedFetch] = {}
+                new_articles = fetch_latest_articles(conn=conn, feeds=due, fetches=fetches)
+                scheduler.record_cycle(due, new_articles, fetches)
+                handle_new_articles(conn, new_articles)
+                save_feed_cache(conn, urls=due.values())
     except KeyboardInterrupt:
         print("\nProgram kullanıcı tarafından durduruldu.")
     finally:
+        if pipeline is not None:
+            pipeline.close()
+        if compactor is not None:
+            compactor.close()
+        if shard is not None:
+            shard.leave()
+        alert_dispatcher.close()
+        if alert_dispatcher.counters["queued"]:
+            print(f"[DEBUG] Alarm gönderimi: {alert_dispatcher.stats()}")
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        print("\n[DEBUG] Aşama süreleri:")
+        print_stats(metrics.snapshot())
+        shutdown_analysis_pool()
+        cache_conn = analysis_cache.detach()
+        if cache_conn is not None and cache_conn is not conn:
+            cache_conn.close()
         conn.close()
         print("[DB] Bağlantı kapatıldı.")
 
@@ -631,24 +5099,80 @@ if __name__ == "__main__":
     #   python sei_news_analyzer.py
     #       -> canlı izleme + DB'ye kaydetme
     #
-    #   python sei_news_analyzer.py report
-    #       -> veritabanı özeti + en negatif 10 haber
+    #   python sei_news_analyzer.py worker [isci_adi]
+    #       -> paylaşımlı canlı mod: RSS_FEEDS aynı news.db'yi kullanan işçiler
+    #          arasında bölünür (birden çok terminalde / makinede çalıştır)
+    #          isci_adi boşsa varsayılan: makine:pid
+    #
+    #   python sei_news_analyzer.py shards
+    #       -> işçilerin kalp atışları ve kaynak kiraları
+    #
+    #   python sei_news_analyzer.py report [--verify]
+    #       -> veritabanı özeti + en negatif 10 haber (özet istatistiklerinden, arşiv dahil)
+    #          --verify: istatistikleri ham satırlardan yeniden hesapla, fark varsa
+    #          göster (çıkış kodu 1)
     #
     #   python sei_news_analyzer.py recent [kategori] [saat]
     #       -> son X saatin en negatif haberleri
     #          kategori boşsa varsayılan: conflict
     #          saat boşsa varsayılan: 24
     #
-    #   python sei_news_analyzer.py export [dosya_adi.csv]
-    #       -> tüm haberleri CSV olarak dışa aktar
+    #   python sei_news_analyzer.py export [dosya_adi.csv|.parquet|.arrow] [kategori] [saat] [--incremental]
+    #       -> haberleri CSV ya da Parquet / Arrow IPC olarak dışa aktar (parça parça, sabit bellek)
+    #          kategori boşsa varsayılan: all, saat boşsa tüm kayıtlar
+    #          --incremental: sadece aynı dosya ve filtrelerle yapılan son export'tan sonra eklenenler
+    #          (öyle bir export yoksa dosya baştan yazılır)
+    #          (CSV'de dosya sonuna eklenir, Parquet/Arrow'da yeni parça dosyası)
+    #
+    #   python sei_news_analyzer.py mirror [rebuild]
+    #       -> DuckDB analiz aynasını (news.duckdb) eşitle; 'rebuild' ile baştan kur
+    #          (ANALYTICS_ENGINE = "duckdb" iken rapor / dashboard bunu kullanır)
+    #
+    #   python sei_news_analyzer.py archive [status]
+    #       -> ARCHIVE_HOT_MONTHS'tan eski ayları archive/articles-YYYY-MM.db bölümlerine taşı,
+    #          ARCHIVE_RETENTION_MONTHS'tan eskileri sil, news.db'yi sıkıştır
+    #          (ARCHIVE_COMPACT_INTERVAL > 0 ise canlı mod bunu o aralıkla arka planda yapar)
+    #          'status' ile sadece news.db ve arşiv bölümlerini listeler
+    #
+    #   python sei_news_analyzer.py feedcache
+    #       -> kaynak başına koşullu GET (304) sayaçları
+    #
+    #   python sei_news_analyzer.py stats [host:port]
+    #       -> çalışan canlı modun aşama süreleri ve sayaçları (metrik uç noktasından)
+    #
+    #   python sei_news_analyzer.py explain
+    #       -> rapor/dashboard sorgularının EXPLAIN QUERY PLAN çıktısı
+    #
+    #   python sei_news_analyzer.py search "aranan metin" [sayfa]
+    #       -> başlık/özet içinde tam metin araması (news.db'deki tüm haberler, alaka sırasıyla)
+    #
+    #   python sei_news_analyzer.py backfill [all]
+    #       -> kayıtlı haberlerin alarm etiketlerini (alert_mask) hesapla
+    #          'all' verilirse hepsini yeniden hesaplar (keyword değişince)
+    #          küme id'si olmayan haberleri yakın kopya kümelerine ata
+    #          'all' ile saatlik / günlük özet tabloları ve rapor istatistikleri de baştan hesaplanır
 
     if len(sys.argv) > 1:
         mode = sys.argv[1]
 
-        if mode == "report":
+        if mode == "worker":
+            worker_id = sys.argv[2] if len(sys.argv) > 2 else None
+            print(f"[MODE] Paylaşımlı canlı mod (işçi: {worker_id or 'makine:pid'})\n")
+            main_loop(poll_interval=60, sharded=True, worker_id=worker_id)
+
+        elif mode == "shards":
+            print("[MODE] Paylaşımlı toplama durumu\n")
+            print_shard_status()
+
+        elif mode == "report":
             print("[MODE] Rapor modu (veritabanındaki haberler)\n")
-            print_db_summary()
-            print_most_negative(limit=10)
+            storage = ArticleStorage()
+            print(f"[DB] Analiz motoru: {storage.analytics.name}")
+            print_db_summary(storage)
+            print_most_negative(limit=10, storage=storage)
+            storage.close()
+            if "--verify" in sys.argv[2:] and not print_summary_verification():
+                sys.exit(1)
 
         elif mode == "recent":
             category = sys.argv[2] if len(sys.argv) > 2 else "conflict"
@@ -661,9 +5185,90 @@ if __name__ == "__main__":
             print_recent_by_category(category=category, hours=hours, limit=20)
 
         elif mode == "export":
-            filename = sys.argv[2] if len(sys.argv) > 2 else "news_export.csv"
-            print(f"[MODE] Export modu (dosya: {filename})\n")
-            export_to_csv(filename)
+            args = [a for a in sys.argv[2:] if a != "--incremental"]
+            incremental = "--incremental" in sys.argv[2:]
+            filename = args[0] if len(args) > 0 else "news_export.csv"
+            category = args[1] if len(args) > 1 else "all"
+            try:
+                hours = int(args[2]) if len(args) > 2 else None
+            except ValueError:
+                hours = None
+            print(
+                f"[MODE] Export modu (dosya: {filename}, kategori: {category}, "
+                f"saat: {hours or 'tümü'}{', artımlı' if incremental else ''})\n"
+            )
+            export_articles(filename, category=category, hours=hours, incremental=incremental)
+
+        elif mode == "mirror":
+            rebuild = len(sys.argv) > 2 and sys.argv[2] == "rebuild"
+            print(f"[MODE] DuckDB aynası ({DUCKDB_PATH}{', baştan' if rebuild else ''})\n")
+            storage = ArticleStorage(engine="duckdb")
+            if isinstance(storage.analytics, DuckDBAnalytics):
+                start = time.perf_counter()
+                copied = storage.analytics.rebuild() if rebuild else storage.analytics.sync()
+                print(f"[DB] Aynaya kopyalanan satır: {copied} ({time.perf_counter() - start:.2f}s)")
+            storage.close()
+
+        elif mode == "archive":
+            if len(sys.argv) > 2 and sys.argv[2] == "status":
+                print("[MODE] Arşiv durumu\n")
+            else:
+                print(f"[MODE] Arşivleme ve sıkıştırma (sıcak: {ARCHIVE_HOT_MONTHS} ay)\n")
+                conn = init_db()
+                start = time.perf_counter()
+                result = compact_storage(conn)
+                conn.close()
+                print(
+                    f"[DB] Arşive taşınan: {sum(result['archived'].values())} haber, "
+                    f"silinen ay: {len(result['dropped'])} ({time.perf_counter() - start:.2f}s)\n"
+                )
+            print_archive_status()
+
+        elif mode == "feedcache":
+            print("[MODE] Koşullu GET önbellek istatistikleri\n")
+            print_feed_cache_stats()
+
+        elif mode == "stats":
+            host, port = METRICS_HOST, METRICS_PORT
+            if len(sys.argv) > 2:
+                host, _, port_text = sys.argv[2].rpartition(":")
+                host = host or METRICS_HOST
+                try:
+                    port = int(port_text)
+                except ValueError:
+                    port = METRICS_PORT
+            print(f"[MODE] Canlı mod metrikleri ({host}:{port})\n")
+            print_live_stats(host, port)
+
+        elif mode == "explain":
+            print("[MODE] Sorgu planları\n")
+            print_query_plans()
+
+        elif mode == "search":
+            text = sys.argv[2] if len(sys.argv) > 2 else ""
+            try:
+                page = max(1, int(sys.argv[3])) if len(sys.argv) > 3 else 1
+            except ValueError:
+                page = 1
+            print(f"[MODE] Arama: {text}\n")
+            print_search_results(text, page=page)
+
+        elif mode == "backfill":
+            only_missing = not (len(sys.argv) > 2 and sys.argv[2] == "all")
+            print(f"[MODE] Alarm etiketi backfill ({'eksikler' if only_missing else 'tümü'})\n")
+            conn = init_db()
+            updated = backfill_alert_masks(conn, only_missing=only_missing)
+            print(f"[DB] Alarm etiketi güncellenen haber sayısı: {updated}")
+            clustered = backfill_clusters(conn)
+            print(f"[DB] Kümelenen haber sayısı: {clustered}")
+            if not only_missing:
+                with conn:
+                    buckets = rebuild_rollups(conn)
+                print(f"[DB] Özet tabloları yeniden hesaplandı: {buckets} saatlik kova")
+                with conn:
+                    total = rebuild_summary_stats(conn)
+                print(f"[DB] Rapor istatistikleri yeniden hesaplandı: {total} haber")
+            conn.close()
 
         else:
             # Bilinmeyen mod → canlı moda düş